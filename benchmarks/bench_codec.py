@@ -0,0 +1,64 @@
+"""JSON codec benchmark: decode/encode time of a full cache per backend.
+
+Builds a realistic story cache (seven sections of 120 stories, shaped like
+the real API items) and times decoding and encoding it with every backend
+pyhn.codec knows, skipping those not installed.
+
+    python -m benchmarks.bench_codec [--stories 120] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import timeit
+
+from pyhn import codec
+from pyhn.hnapi import LIST_ENDPOINTS, _build_story
+
+
+def _cache(per_section: int) -> dict:
+    now = datetime.datetime.today().isoformat()
+    cache = {}
+    for s, which in enumerate(sorted(LIST_ENDPOINTS)):
+        stories = []
+        for i in range(per_section):
+            item_id = 40_000_000 + s * 1000 + i
+            story = _build_story({
+                "id": item_id, "type": "story", "by": f"user{i * 7 % 997}",
+                "time": 1_700_000_000 + i * 60,
+                "title": f"Show HN: A thing that does stuff, part {i} – “quoted”",
+                "url": f"https://www.example{i % 40}.com/posts/{item_id}?ref=hn",
+                "score": i * 13 % 900, "descendants": i * 7 % 400,
+            }, i + 1)
+            assert story is not None
+            stories.append(story.to_dict())
+        cache[which] = {"stories": stories, "date": now}
+    return cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cache = _cache(args.stories)
+    raw = codec.get_codec("json").dumps(cache)
+    print(f"{len(cache)} sections x {args.stories} stories, {len(raw) / 1024:.0f} KiB")
+    for name in codec.BACKENDS:
+        try:
+            backend = codec.get_codec(name)
+        except ImportError:
+            print(f"{name:<8} not installed")
+            continue
+        assert backend.loads(raw) == cache
+        decode = min(timeit.repeat(
+            lambda b=backend: b.loads(raw), number=1, repeat=args.repeat))
+        encode = min(timeit.repeat(
+            lambda b=backend: b.dumps(cache), number=1, repeat=args.repeat))
+        print(f"{name:<8} decode={decode * 1000:6.2f}ms  encode={encode * 1000:6.2f}ms")
+    print(f"default: {codec.CODEC.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Comment HTML-to-text benchmark: regex fast path vs HTMLParser.
+
+Converts the comment corpus used by the tests (tests/data/comment_bodies.json,
+HN-style markup: paragraphs, links, quotes, ``<pre><code>`` blocks) repeated
+up to 1000 comments, with both converters, and reports the time per thousand
+comments for each.
+
+    python -m benchmarks.bench_html [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import timeit
+from pathlib import Path
+
+from pyhn.hnapi import _html_to_text, _parse_html_to_text
+
+CORPUS = Path(__file__).resolve().parent.parent / "tests" / "data" / "comment_bodies.json"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bodies = json.loads(CORPUS.read_text(encoding="utf-8"))
+    thousand = list(itertools.islice(itertools.cycle(bodies), 1000))
+    assert [_html_to_text(b) for b in bodies] == [_parse_html_to_text(b) for b in bodies]
+
+    results = {}
+    for label, convert in (("htmlparser", _parse_html_to_text),
+                           ("fast", _html_to_text)):
+        best = min(timeit.repeat(
+            lambda convert=convert: [convert(b) for b in thousand],
+            number=1, repeat=args.repeat))
+        results[label] = best
+        print(f"{label:<12} {best * 1000:7.2f}ms per 1000 comments")
+    print(f"speed-up     {results['htmlparser'] / results['fast']:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
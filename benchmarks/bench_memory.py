@@ -0,0 +1,91 @@
+"""Story memory benchmark: bytes per story, before and after slotting.
+
+Builds N stories from synthetic API items under tracemalloc two ways:
+
+- ``dict+copy``: the previous layout, a plain class with a per-instance
+  ``__dict__`` plus the eleven fields ItemWidget used to copy per row;
+- ``slotted``: ``HackerNewsStory`` with ``__slots__``, referenced (not
+  copied) by its row.
+
+Strings come from the items themselves in both cases, so the difference is
+the per-record overhead. Reports bytes per story for each N.
+
+    python -m benchmarks.bench_memory [--sizes 500 50000]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from pyhn.hnapi import _build_story
+
+_FIELDS = (
+    "id", "number", "title", "domain", "url", "score", "submitter",
+    "submitter_url", "comment_count", "comments_url", "time")
+
+
+class _DictStory:
+    """The pre-slots HackerNewsStory layout (instance __dict__)."""
+
+
+class _RowCopy:
+    """The fields ItemWidget copied from each story before it delegated."""
+
+
+def _items(count: int) -> list[dict]:
+    return [
+        {"id": 30_000_000 + i, "type": "story", "by": f"user{i % 997}",
+         "time": 1_700_000_000 + i, "title": f"Story number {i} about things",
+         "url": f"https://example{i % 50}.com/articles/{i}",
+         "score": i % 500, "descendants": i % 300}
+        for i in range(count)]
+
+
+def _dict_layout(items: list[dict]) -> list[Any]:
+    out = []
+    for rank, item in enumerate(items, 1):
+        built = _build_story(item, rank)
+        story = _DictStory()
+        for field in _FIELDS:
+            setattr(story, field, getattr(built, field))
+        row = _RowCopy()
+        for field in _FIELDS:
+            setattr(row, field, getattr(story, field))
+        out.append((story, row))
+    return out
+
+
+def _slotted_layout(items: list[dict]) -> list[Any]:
+    return [_build_story(item, rank) for rank, item in enumerate(items, 1)]
+
+
+def _measure(build: Callable[[list[dict]], list[Any]], items: list[dict]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(items)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    per_story = (after - before) / len(items)
+    del kept
+    return per_story
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 50_000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        items = _items(size)
+        old = _measure(_dict_layout, items)
+        new = _measure(_slotted_layout, items)
+        print(f"{size:>7} stories  dict+copy={old:7.1f} B/story  "
+              f"slotted={new:7.1f} B/story  saved={1 - new / old:5.1%}")
+
+
+if __name__ == "__main__":
+    main()
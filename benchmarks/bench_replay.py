@@ -0,0 +1,154 @@
+"""Offline benchmark of the load paths, replaying a recorded API session.
+
+``record`` runs the workload against the real API once and saves every
+response (and its latency) to an archive; ``replay`` runs the same workload
+from the archive with no network, so runs are repeatable and comparable
+across machines and commits:
+
+- ``iter_stories``: a front-page section load (first chunk / total);
+- ``get_comments``: the comment trees of the first ``--stories`` stories;
+- ``load_section``: the GUI's full section load (fetch, cache write, widgets).
+
+    python -m benchmarks.bench_replay record session.json [--stories 5]
+    python -m benchmarks.bench_replay replay session.json \\
+        [--latency-ms 40] [--jitter-ms 20] [--recorded-latency] [--seed 1]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import types
+from collections.abc import Callable
+from typing import Any
+
+import urwid
+
+from pyhn.cachemanager import CacheManager
+from pyhn.gui import HNGui
+from pyhn.hnapi import HackerNewsAPI
+from pyhn.transport import RecordingTransport, ReplayTransport
+
+SECTION = "top"
+
+
+def _cache_manager(api: HackerNewsAPI, workdir: str) -> CacheManager:
+    """A CacheManager with default settings and its cache under `workdir`
+    (whatever files the configured backend keeps there)."""
+    manager = CacheManager(os.path.join(workdir, "cache.json"))
+    manager.api.close()
+    manager.api = api
+    return manager
+
+
+def _stories(api: HackerNewsAPI, extra_page: int) -> tuple[float, list[int]]:
+    """Load the section; return (seconds to first chunk, story ids)."""
+    start = time.perf_counter()
+    first = None
+    ids: list[int] = []
+    for chunk in api.iter_stories(SECTION, extra_page=extra_page):
+        if first is None:
+            first = time.perf_counter() - start
+        ids.extend(s.id for s in chunk if s.id is not None)
+    return first or 0.0, ids
+
+
+def _comments(api: HackerNewsAPI, ids: list[int], limit: int) -> int:
+    return sum(len(api.get_comments(item_id, limit)) for item_id in ids)
+
+
+def _load_section(manager: CacheManager) -> int:
+    """HNGui.load_section without a screen, as the GUI tests drive it."""
+    gui = HNGui(manager)
+    gui.already_build = True
+    gui.walker = urwid.SimpleListWalker([])
+    gui.listbox = urwid.ListBox(gui.walker)
+    gui.loop = types.SimpleNamespace(draw_screen=lambda: None)
+    gui.set_footer = lambda *a, **k: None  # type: ignore[method-assign]
+    gui.set_header = lambda *a, **k: None  # type: ignore[method-assign]
+    gui.load_section(SECTION, force=True)
+    return len(gui.walker)
+
+
+def record(path: str, stories: int) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["HOME"] = workdir  # default settings, no ~/.pyhn writes
+        recorder = RecordingTransport(HackerNewsAPI().session)
+        api = HackerNewsAPI(transport=recorder)
+        manager = _cache_manager(api, workdir)
+        _first, ids = _stories(api, manager.extra_page)
+        _comments(api, ids[:stories], manager.comments_limit)
+        _load_section(_cache_manager(
+            HackerNewsAPI(transport=recorder), workdir))
+    recorder.save(path)
+    print(f"recorded {len(recorder.entries)} responses to {path}")
+
+
+def _timed(label: str, repeat: int, run: Callable[[], Any]) -> None:
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    print(f"{label:<14} median={statistics.median(times) * 1000:8.1f}ms  "
+          f"min={min(times) * 1000:8.1f}ms  result={result}")
+
+
+def replay(path: str, args: argparse.Namespace) -> None:
+    def transport() -> ReplayTransport:
+        return ReplayTransport.load(
+            path, latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+            recorded_latency=args.recorded_latency, seed=args.seed)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["HOME"] = workdir
+        defaults = _cache_manager(HackerNewsAPI(), workdir)
+        extra_page, limit = defaults.extra_page, defaults.comments_limit
+        # A fresh client per run, so the item cache starts cold every time.
+        _first, ids = _stories(HackerNewsAPI(transport=transport()), extra_page)
+
+        def first_chunk() -> str:
+            first, _ids = _stories(
+                HackerNewsAPI(transport=transport()), extra_page)
+            return f"first_chunk={first * 1000:.1f}ms"
+
+        _timed("iter_stories", args.repeat, first_chunk)
+        _timed("get_comments", args.repeat, lambda: _comments(
+            HackerNewsAPI(transport=transport()), ids[:args.stories], limit))
+
+        def section() -> int:
+            # A cold cache too, in a fresh directory so no backend's files
+            # survive: an existing cache would make the forced load an
+            # incremental refresh.
+            with tempfile.TemporaryDirectory(dir=workdir) as cold:
+                return _load_section(_cache_manager(
+                    HackerNewsAPI(transport=transport()), cold))
+
+        _timed("load_section", args.repeat, section)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("archive")
+    parser.add_argument("--stories", type=int, default=5,
+                        help="comment trees to load (same for both modes)")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--recorded-latency", action="store_true",
+                        help="replay each response after its recorded latency")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if args.mode == "record":
+        record(args.archive, args.stories)
+    else:
+        replay(args.archive, args)
+
+
+if __name__ == "__main__":
+    main()
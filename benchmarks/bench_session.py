@@ -0,0 +1,138 @@
+"""Connection reuse benchmark: pooled session vs one connection per request.
+
+Runs a local stand-in for the HN API (plain HTTP, keep-alive) that sleeps on
+every new connection to emulate the TCP + TLS handshake round-trips of the
+real endpoint, then loads a section three ways:
+
+- ``per-request``: the old behaviour, a bare ``requests.get`` per item;
+- ``pooled``: the API client's keep-alive session;
+- ``pooled+preconnect``: the session, warmed by ``preconnect()`` first.
+
+Reports connections opened and the median time to the first chunk / whole
+section over ``--repeat`` runs of each.
+
+    python -m benchmarks.bench_session [--handshake-ms 30] [--extra-page 3] \
+        [--repeat 7]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import requests
+
+import pyhn.hnapi as hnapi
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Headers and body go out as separate writes; with Nagle on, a reused
+    # connection waits out the client's delayed ACK (~40ms) between them,
+    # a stand-in artifact that would make keep-alive look slow.
+    disable_nagle_algorithm = True
+    handshake = 0.03
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        with _StandIn.lock:
+            _StandIn.connections += 1
+        time.sleep(self.handshake)
+        super().setup()
+
+    def do_GET(self) -> None:
+        if self.path.endswith("stories.json"):
+            payload: Any = list(range(1, 501))
+        elif self.path.endswith("maxitem.json"):
+            payload = 500
+        else:
+            item_id = int(self.path.rsplit("/", 1)[1].split(".")[0])
+            payload = {"id": item_id, "type": "story", "by": "x", "score": 1,
+                       "time": 1175714200, "title": f"Story {item_id}",
+                       "url": "https://example.com", "descendants": 0}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for a full burst of fetch workers: with the default backlog of 5
+    # dropped SYNs add ~1s retransmits that swamp the handshake cost.
+    request_queue_size = 128
+
+
+class _PerRequest:
+    """Session stand-in reproducing the old module-level requests.get."""
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return requests.get(url, headers=hnapi.HEADERS, **kwargs)
+
+
+def _once(api: hnapi.HackerNewsAPI, extra_page: int,
+          preconnect: bool) -> tuple[int, float, float]:
+    """(connections opened, seconds to first chunk, seconds in total)."""
+    _StandIn.connections = 0
+    if preconnect:
+        api.preconnect()
+    start = time.perf_counter()
+    first = None
+    for _chunk in api.iter_stories("top", extra_page=extra_page):
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    api.close()
+    return _StandIn.connections, first or 0.0, total
+
+
+def _run(label: str, make_api: Callable[[], hnapi.HackerNewsAPI],
+         extra_page: int, repeat: int, preconnect: bool = False) -> None:
+    # A fresh client per run, so every run starts with an empty pool.
+    runs = [_once(make_api(), extra_page, preconnect) for _ in range(repeat)]
+    connections, first, total = (statistics.median(r) for r in zip(*runs, strict=True))
+    print(f"{label:<20} connections={connections:>6.0f}  "
+          f"first_chunk={first * 1000:7.1f}ms  total={total * 1000:7.1f}ms"
+          f"  (median of {repeat})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handshake-ms", type=float, default=30)
+    parser.add_argument("--extra-page", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    _StandIn.handshake = args.handshake_ms / 1000
+    server = _Server(("127.0.0.1", 0), _StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f"http://127.0.0.1:{server.server_port}/v0"
+
+    def unpooled() -> hnapi.HackerNewsAPI:
+        api = hnapi.HackerNewsAPI(api_base=api_base)
+        api.transport = _PerRequest()
+        return api
+
+    def pooled() -> hnapi.HackerNewsAPI:
+        return hnapi.HackerNewsAPI(api_base=api_base)
+
+    _run("per-request", unpooled, args.extra_page, args.repeat)
+    _run("pooled", pooled, args.extra_page, args.repeat)
+    _run("pooled+preconnect", pooled, args.extra_page, args.repeat,
+         preconnect=True)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Cache store benchmark: sharded JSON vs one JSON file vs SQLite.
+
+Fills each store with seven sections of 500 stories, then times what the
+GUI does: starting up (a new store showing ``top``, as another process
+would), a freshness check (``written_at``), loading one section and
+refreshing one section where a few stories changed score or rank.
+
+    python -m benchmarks.bench_store [--stories 500] [--changed 25] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import tempfile
+import timeit
+
+from benchmarks.bench_codec import _cache
+from pyhn.store import BACKENDS, Store, open_store
+
+
+def _refreshed(stories: list[dict], changed: int) -> list[dict]:
+    """The section a refresh would write: `changed` rescored stories and
+    the first two swapped."""
+    out = [dict(s) for s in stories]
+    for story in out[:changed]:
+        story["score"] = (story["score"] or 0) + 1
+    out[0], out[1] = out[1], out[0]
+    for number, story in enumerate(out, 1):
+        story["number"] = number
+    return out
+
+
+def _bench(backend: str, path: str, cache: dict, date: str,
+           changed: int, repeat: int) -> tuple[float, ...]:
+    """Best (startup, is_outdated, load, refresh) seconds for one backend."""
+    store: Store = open_store(backend, path)
+    for which, entry in cache.items():
+        store.put(which, entry["stories"], date)
+
+    def startup() -> None:
+        fresh = open_store(backend, path)
+        fresh.get("top")
+        fresh.close()
+
+    top = cache["top"]["stories"]
+    versions = [top, _refreshed(top, changed)]
+    turn = iter(range(10**9))
+
+    def refresh() -> None:
+        store.put("top", versions[next(turn) % 2], date)
+
+    check = min(timeit.repeat(
+        lambda: store.written_at("top"), number=1, repeat=repeat))
+    load = min(timeit.repeat(lambda: store.get("top"), number=1, repeat=repeat))
+    write = min(timeit.repeat(refresh, number=1, repeat=repeat))
+    cold = min(timeit.repeat(startup, number=1, repeat=repeat))
+    store.close()
+    return cold, check, load, write
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=500)
+    parser.add_argument("--changed", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cache = _cache(args.stories)
+    date = datetime.datetime.today().isoformat()
+    print(f"{len(cache)} sections x {args.stories} stories, "
+          f"{args.changed} changed per refresh")
+    with tempfile.TemporaryDirectory() as workdir:
+        for backend in BACKENDS:
+            cold, check, load, write = _bench(
+                backend, os.path.join(workdir, f"cache-{backend}"), cache,
+                date, args.changed, args.repeat)
+            print(f"{backend:<7} startup={cold * 1000:7.2f}ms  "
+                  f"is_outdated={check * 1000:7.3f}ms  "
+                  f"load={load * 1000:7.2f}ms  refresh={write * 1000:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+asyncio client for the official Hacker News API.
+
+The async counterpart of hnapi.HackerNewsAPI: every item lookup is a coroutine
+on one event loop, bounded by a semaphore, so hundreds of fetches can be in
+flight without one OS thread each. Story and comment objects are built by the
+same helpers as the threaded client, so the two return identical results.
+
+Needs the optional ``httpx`` dependency (``pip install pyhn[async]``); it is
+imported on first request so the rest of pyhn works without it.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pyhn import codec, hnapi
+from pyhn.hnapi import (
+    CommentRow,
+    HackerNewsStory,
+    HNException,
+    MoreComments,
+    _build_story,
+    _flatten_comments,
+    _list_url,
+)
+
+# In-flight request cap. Unlike MAX_WORKERS this costs no threads, so it can
+# be far higher; the real limit is what the API tolerates from one client.
+MAX_CONCURRENCY = 100
+
+
+class AsyncHackerNewsAPI:
+    """Fetches stories and comments concurrently on an asyncio event loop.
+
+    Use as ``async with AsyncHackerNewsAPI() as api:`` (or call ``aclose()``)
+    so the pooled connections are released.
+    """
+
+    def __init__(
+        self, max_concurrency: int = MAX_CONCURRENCY, api_base: str | None = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.api_base = api_base or hnapi.API_BASE
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: Any = None  # httpx.AsyncClient, created on first use
+
+    async def __aenter__(self) -> AsyncHackerNewsAPI:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            try:
+                import httpx
+            except ImportError as exc:
+                raise HNException(
+                    "The asyncio backend needs httpx: "
+                    "pip install pyhn[async]") from exc
+            self._client = httpx.AsyncClient(
+                headers=hnapi.HEADERS,
+                timeout=hnapi.REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency))
+        return self._client
+
+    async def _request(self, url: str) -> Any:
+        """GET a URL on the shared client and decode the JSON body."""
+        try:
+            r = await self._get_client().get(url)
+        except HNException:
+            raise
+        except Exception as exc:
+            raise HNException(
+                "Error getting data from " + url +
+                ". Your internet connection may have something "
+                "funny going on, or you could be behind a proxy.") from exc
+        if r.status_code >= 400:
+            raise HNException(
+                f"Empty or error response ({r.status_code}) from {url}")
+        return codec.loads(r.content)
+
+    async def fetch_json(self, url: str) -> Any:
+        """GET a URL and return the decoded JSON body (concurrency-capped)."""
+        async with self._semaphore:
+            return await self._request(url)
+
+    async def _story_ids(self, which: str) -> list[int]:
+        """Return the ordered story ids for a 'which' section."""
+        ids = await self.fetch_json(_list_url(which, self.api_base))
+        return ids or []
+
+    async def _fetch_item(self, item_id: int) -> dict | None:
+        """Fetch a single item; None if it has no body."""
+        return await self.fetch_json(f"{self.api_base}/item/{item_id}.json")
+
+    async def _fetch_items(self, ids: list[int]) -> list[dict | None]:
+        """Fetch items concurrently, results in the order of `ids`."""
+        return list(await asyncio.gather(*map(self._fetch_item, ids)))
+
+    async def iter_stories(
+        self,
+        which: str,
+        extra_page: int = 1,
+        chunk_size: int = hnapi.PAGE_SIZE,
+    ) -> AsyncIterator[list[HackerNewsStory]]:
+        """Async counterpart of HackerNewsAPI.iter_stories (same chunking)."""
+        count = hnapi.PAGE_SIZE * (extra_page + 1)
+        ids = (await self._story_ids(which))[:count]
+        rank = 1
+        for start in range(0, len(ids), chunk_size):
+            items = await self._fetch_items(ids[start:start + chunk_size])
+            chunk = []
+            for item in items:
+                story = _build_story(item, rank)
+                if story is not None:
+                    chunk.append(story)
+                    rank += 1
+            yield chunk
+
+    async def get_stories(
+        self, which: str, extra_page: int = 1,
+    ) -> list[HackerNewsStory]:
+        """Fetch a whole section in one go (every item in flight at once)."""
+        count = hnapi.PAGE_SIZE * (extra_page + 1)
+        return [
+            story
+            async for chunk in self.iter_stories(which, extra_page, count)
+            for story in chunk]
+
+    async def get_comments(
+        self, item_id: int, max_comments: int = 50,
+    ) -> list[CommentRow]:
+        """Async counterpart of HackerNewsAPI.get_comments (same BFS/order)."""
+        root = await self._fetch_item(item_id)
+        if not root:
+            return []
+        kids = root.get('kids', [])
+        return _flatten_comments(kids, await self._fetch_tree(kids, max_comments))
+
+    async def expand_comments(
+        self, more: MoreComments, max_comments: int = 50,
+    ) -> list[CommentRow]:
+        """Async counterpart of HackerNewsAPI.expand_comments."""
+        return _flatten_comments(
+            more.ids, await self._fetch_tree(more.ids, max_comments), more.depth)
+
+    async def _fetch_tree(
+        self, kid_ids: list[int], max_comments: int,
+    ) -> dict[int, dict | None]:
+        items: dict[int, dict | None] = {}
+        frontier = list(kid_ids)
+        while frontier and len(items) < max_comments:
+            batch = frontier[:max_comments - len(items)]
+            next_frontier: list[int] = []
+            for cid, item in zip(
+                    batch, await self._fetch_items(batch), strict=True):
+                items[cid] = item
+                if item:
+                    next_frontier.extend(item.get('kids', []))
+            frontier = next_frontier
+        return items
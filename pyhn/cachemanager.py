@@ -1,27 +1,54 @@
 from __future__ import annotations
 
 import datetime
-import json
-import os
+import logging
 from collections.abc import Iterator
 
 from pyhn import hnapi
+from pyhn.commentcache import CommentCache
 from pyhn.config import Config
-from pyhn.hnapi import HackerNewsAPI, HackerNewsStory
+from pyhn.hnapi import HackerNewsAPI, HackerNewsStory, HNException
+from pyhn.store import open_store
+
+log = logging.getLogger(__name__)
+
+# The updates feed only lists items changed in the last few minutes, so an
+# incremental refresh is only exact for a recently written section; older
+# ones are refetched in full.
+INCREMENTAL_MAX_AGE = 10 * 60
 
 
 class CacheManager:
-    def __init__(self, cache_path: str | None = None) -> None:
+    def __init__(
+        self, cache_path: str | None = None, backend: str | None = None,
+    ) -> None:
         self.config = Config()
         if cache_path is None:
             cache_path = self.config.parser.get('settings', 'cache')
+        if backend is None:
+            backend = self.config.parser.get('settings', 'cache_backend')
+        self.backend = backend
         self.cache_path: str = cache_path
+        self.store = open_store(backend, cache_path)
 
         self.cache_age = int(self.config.parser.get('settings', 'cache_age'))
         self.extra_page = int(self.config.parser.get('settings', 'extra_page'))
         self.comments_limit = int(
             self.config.parser.get('settings', 'comments_limit'))
-        self.api = HackerNewsAPI()
+        self.refresh_mode = self.config.parser.get('settings', 'refresh_mode')
+        self.comment_cache = self._comment_cache(cache_path)
+        self.api = HackerNewsAPI(
+            item_cache_ttl=float(
+                self.config.parser.get('settings', 'item_cache_ttl')),
+            item_cache_size=int(
+                self.config.parser.get('settings', 'item_cache_size')),
+            retries=int(self.config.parser.get('settings', 'retries')),
+            hedge_percentile=float(
+                self.config.parser.get('settings', 'hedge_percentile')),
+            rate_limit=float(
+                self.config.parser.get('settings', 'rate_limit')),
+            rate_burst=int(self.config.parser.get('settings', 'rate_burst')),
+            api_base=self.config.parser.get('settings', 'api_base'))
         # Note: construction does not fetch. Callers load lazily (the GUI
         # streams the first section once its event loop is running).
 
@@ -32,58 +59,119 @@ class CacheManager:
         """
         return hnapi.PAGE_SIZE * (self.extra_page + 1)
 
-    def _load(self) -> dict:
-        """Read the JSON cache, returning {} on missing or unreadable file.
-
-        An unreadable file includes a legacy pickle cache from older
-        versions; it is simply treated as empty and rebuilt on refresh.
-        """
-        if not os.path.exists(self.cache_path):
-            return {}
-        try:
-            with open(self.cache_path, encoding="utf-8") as f:
-                return json.load(f)
-        except (OSError, ValueError, UnicodeDecodeError):
-            return {}
+    def set_cache_path(self, cache_path: str) -> None:
+        """Switch to another cache location (reload_config)."""
+        self.store.close()
+        self.cache_path = cache_path
+        self.store = open_store(self.backend, cache_path)
+        self.comment_cache = self._comment_cache(cache_path)
+
+    def _comment_cache(self, cache_path: str) -> CommentCache | None:
+        """Comment threads kept next to the section cache, in
+        `<cache>.comments/` (None when comment_cache_ttl is 0)."""
+        ttl = float(self.config.parser.get('settings', 'comment_cache_ttl'))
+        if ttl <= 0:
+            return None
+        return CommentCache(
+            cache_path + '.comments', ttl,
+            int(self.config.parser.get('settings', 'comment_cache_size')))
+
+    @staticmethod
+    def _stories(entry: dict) -> list[HackerNewsStory]:
+        """Stories of a cached section (migrating pre-`time` entries)."""
+        written_at = datetime.datetime.fromisoformat(entry['date']).timestamp()
+        return [
+            HackerNewsStory.from_dict(d, written_at) for d in entry['stories']]
+
+    @staticmethod
+    def _age(date: str) -> float:
+        """Seconds since a section was written at `date` (ISO format)."""
+        cached_at = datetime.datetime.fromisoformat(date)
+        return (datetime.datetime.today() - cached_at).total_seconds()
 
     def is_outdated(self, which: str = "top") -> bool:
-        cache = self._load()
-        entry = cache.get(which)
-        if not entry:
+        date = self.store.written_at(which)
+        if date is None:
             return True
-
-        cached_at = datetime.datetime.fromisoformat(entry['date'])
-        cache_age = datetime.datetime.today() - cached_at
-        return cache_age.total_seconds() > self.cache_age * 60
+        return self._age(date) > self.cache_age * 60
+
+    def _store(
+        self, which: str, stories: list[HackerNewsStory],
+        date: str | None = None,
+    ) -> None:
+        """Write one section into the cache, keeping the others; `date`
+        defaults to now (the section was just fetched)."""
+        self.store.put(
+            which, [story.to_dict() for story in stories],
+            date or datetime.datetime.today().isoformat())
 
     def refresh_stream(
-        self, which: str = "top",
+        self, which: str = "top", incremental: bool | None = None,
     ) -> Iterator[list[HackerNewsStory]]:
         """Fetch a section in chunks, yielding each as it arrives.
 
-        Accumulates all chunks and writes the full section to the JSON cache
+        Accumulates all chunks and writes the full section to the cache
         once the stream is exhausted, so the on-disk cache stays a complete
         snapshot.
+
+        In incremental mode (the `refresh_mode` setting, or `incremental`) a
+        recently cached section is instead patched in place from the updates
+        feed and yielded as a single chunk; if that fails, the section is
+        fetched in full. A patched section keeps the date of its last full
+        fetch, so once that is INCREMENTAL_MAX_AGE old the next refresh is a
+        full one and picks up changes the feed's short window missed.
         """
+        if incremental is None:
+            incremental = self.refresh_mode == "incremental"
+        entry = self.store.get(which) if incremental else None
+        if entry and self._age(entry['date']) <= INCREMENTAL_MAX_AGE:
+            cached = self._stories(entry)
+            try:
+                stories = self.api.refresh_stories(
+                    which, cached, extra_page=self.extra_page)
+            except HNException:
+                log.warning("incremental refresh of %s failed, fetching in "
+                            "full", which, exc_info=True)
+            else:
+                yield stories
+                self._store(which, stories, entry['date'])
+                return
+
         collected: list[HackerNewsStory] = []
         for chunk in self.api.iter_stories(which, extra_page=self.extra_page):
             collected.extend(chunk)
             yield chunk
-
-        cache = self._load()
-        cache[which] = {
-            'stories': [story.to_dict() for story in collected],
-            'date': datetime.datetime.today().isoformat()}
-        with open(self.cache_path, "w", encoding="utf-8") as f:
-            json.dump(cache, f)
-
-    def refresh(self, which: str = "top") -> None:
-        """Fully refresh a section's cache (drains refresh_stream)."""
-        for _ in self.refresh_stream(which):
+        self._store(which, collected)
+
+    def apply_ids(
+        self, which: str, ids: list[int], changed: set[int],
+    ) -> list[HackerNewsStory] | None:
+        """Patch a cached section to a pushed id list (live mode).
+
+        Only ids new to the section or in `changed` are fetched. Returns the
+        updated stories, or None when the section is not cached yet (the
+        regular load fills it). The section keeps its write date: stories
+        that did not move were not refetched, so it still goes stale after
+        `cache_age` and the next load refreshes their scores and comments.
+        """
+        entry = self.store.get(which)
+        if not entry:
+            return None
+        cached = self._stories(entry)
+        stories = self.api.patch_stories(
+            ids[:self.expected_count()], cached, changed)
+        self._store(which, stories, entry['date'])
+        return stories
+
+    def refresh(
+        self, which: str = "top", incremental: bool | None = None,
+    ) -> None:
+        """Refresh a section's cache (drains refresh_stream)."""
+        for _ in self.refresh_stream(which, incremental):
             pass
 
     def get_stories(self, which: str = "top") -> list[HackerNewsStory]:
-        entry = self._load().get(which)
+        entry = self.store.get(which)
         if not entry:
             return []
-        return [HackerNewsStory.from_dict(d) for d in entry['stories']]
+        return self._stories(entry)
@@ -0,0 +1,103 @@
+"""JSON encoding and decoding with the fastest backend available.
+
+API bodies and the story cache are all JSON, and the stdlib decoder is one of
+the slower parts of loading a large cache. ``orjson`` or ``msgspec`` are used
+when installed (``pip install pyhn[fast]``), the stdlib ``json`` otherwise;
+every backend takes ``bytes`` or ``str`` and produces UTF-8 ``bytes``, and
+raises ValueError on malformed input.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+# Tried in this order by get_codec("auto").
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class Codec:
+    """A named pair of loads/dumps functions."""
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[bytes | str], Any],
+        dumps: Callable[[Any], bytes],
+    ) -> None:
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        return f"Codec({self.name!r})"
+
+
+def _stdlib() -> Codec:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    return Codec("json", json.loads, dumps)
+
+
+def _orjson() -> Codec:
+    import orjson
+
+    return Codec("orjson", orjson.loads, orjson.dumps)
+
+
+def _msgspec() -> Codec:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def loads(data: bytes | str) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as exc:  # not a ValueError subclass
+            raise ValueError(str(exc)) from exc
+
+    return Codec("msgspec", loads, encoder.encode)
+
+
+_FACTORIES: dict[str, Callable[[], Codec]] = {
+    "orjson": _orjson, "msgspec": _msgspec, "json": _stdlib,
+}
+
+
+def get_codec(name: str = "auto") -> Codec:
+    """Return the named backend, or with "auto" the first one installed.
+
+    Raises ValueError for an unknown name and ImportError if a named
+    backend is not installed.
+    """
+    if name == "auto":
+        for backend in BACKENDS:
+            try:
+                return _FACTORIES[backend]()
+            except ImportError:
+                continue
+    factory = _FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(
+            f"Unknown JSON backend {name!r}: one of auto, {', '.join(BACKENDS)}")
+    return factory()
+
+
+def available() -> list[str]:
+    """Names of the backends that can be imported here."""
+    names = []
+    for backend in BACKENDS:
+        try:
+            _FACTORIES[backend]()
+        except ImportError:
+            continue
+        names.append(backend)
+    return names
+
+
+# The process-wide codec used for API bodies and the cache.
+CODEC = get_codec()
+loads = CODEC.loads
+dumps = CODEC.dumps
@@ -0,0 +1,98 @@
+"""On-disk cache of comment threads.
+
+Reopening a thread used to fetch every comment item again. CommentCache
+keeps the rows a thread load produced (comments and "N more replies"
+placeholders, in display order) in one JSON file per story, so the GUI can
+show a reopened thread at once and revalidate it in the background.
+
+A thread is served for `ttl` seconds after it was written. Reading a thread
+touches its file, and past `size` threads the least recently used files are
+removed. Files are written atomically, so concurrent pyhn processes can
+share the directory.
+"""
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import time
+from collections.abc import Callable
+
+from pyhn import codec
+from pyhn.hnapi import CommentRow, HackerNewsComment, MoreComments
+from pyhn.store import write_atomic
+
+log = logging.getLogger(__name__)
+
+
+def _row(data: dict) -> CommentRow:
+    if "more" in data:
+        return MoreComments.from_dict(data)
+    return HackerNewsComment.from_dict(data)
+
+
+class CommentCache:
+    """Comment threads on disk under `directory`, one `<story id>.json` each."""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float,
+        size: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.size = size
+        self._clock = clock
+
+    def _path(self, story_id: int) -> str:
+        return os.path.join(self.directory, f"{int(story_id)}.json")
+
+    def get(self, story_id: int) -> list[CommentRow] | None:
+        """The cached thread if one is fresh, else None."""
+        path = self._path(story_id)
+        try:
+            with open(path, "rb") as f:
+                entry = codec.loads(f.read())
+            written = float(entry["written"])
+            rows = [_row(d) for d in entry["rows"]]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, UnicodeDecodeError, KeyError, TypeError):
+            log.warning("dropping unreadable comment cache %s", path)
+            self._remove(path)
+            return None
+        if self._clock() - written >= self.ttl:
+            self._remove(path)
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)  # mark as recently used for eviction
+        return rows
+
+    def put(self, story_id: int, rows: list[CommentRow]) -> None:
+        """Store a thread, then evict past `size` threads."""
+        os.makedirs(self.directory, exist_ok=True)
+        write_atomic(self._path(story_id), {
+            "written": self._clock(),
+            "rows": [row.to_dict() for row in rows]})
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            with contextlib.suppress(OSError):
+                entries.append((os.stat(path).st_mtime_ns, path))
+        if len(entries) <= self.size:
+            return
+        entries.sort()
+        for _mtime, path in entries[:len(entries) - self.size]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        with contextlib.suppress(OSError):
+            os.remove(path)
@@ -0,0 +1,96 @@
+"""Adaptive cap on in-flight API requests.
+
+A fixed worker count is wrong both ways: on a fast link it leaves throughput
+unused, on a slow or throttled one it piles up requests that each burn the
+full REQUEST_TIMEOUT. AdaptiveLimit tunes the cap AIMD-style, like TCP
+congestion control: the limit grows by about one per round of fast, successful
+requests and is cut multiplicatively when a request fails or runs slow.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+log = logging.getLogger(__name__)
+
+
+class AdaptiveLimit:
+    """Blocking semaphore whose size adapts to observed latency and errors.
+
+    Callers ``acquire()`` before a request and ``release(latency, ok)`` after
+    it. At most one decrease is applied per `target_latency` window, so a
+    burst of concurrent timeouts shrinks the limit once rather than to the
+    floor.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 64,
+        target_latency: float = 1.0,
+        backoff: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self._clock = clock
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._waiting = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """Callers blocked in acquire() for a slot (the request backlog)."""
+        return self._waiting
+
+    def acquire(self) -> None:
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._in_flight >= int(self._limit):
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+
+    def discard(self) -> None:
+        """Give a slot back without a sample (its request never ran)."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def release(self, latency: float, ok: bool = True) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            before = int(self._limit)
+            if ok and latency <= self.target_latency:
+                # +1/limit per success is ~+1 per full round of requests.
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                if int(self._limit) != before:
+                    log.debug("concurrency limit %d -> %d (latency %.3fs)",
+                              before, int(self._limit), latency)
+            else:
+                now = self._clock()
+                if now - self._last_decrease >= self.target_latency:
+                    self._last_decrease = now
+                    self._limit = max(self.minimum, self._limit * self.backoff)
+                    log.info(
+                        "concurrency limit %d -> %d (%s, latency %.3fs)",
+                        before, int(self._limit),
+                        "ok" if ok else "error", latency)
+            self._cond.notify_all()
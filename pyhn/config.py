@@ -90,6 +90,9 @@ class Config:
             self.parser.set('interface', 'show_comments', 'true')
         if not self.parser.has_option('interface', 'show_published_time'):
             self.parser.set('interface', 'show_published_time', 'false')
+        if not self.parser.has_option('interface', 'show_karma'):
+            # Submitter karma in the footer, fetched in the background.
+            self.parser.set('interface', 'show_karma', 'true')
         # Paths
         if not self.parser.has_section('settings'):
             self.parser.add_section('settings')
@@ -102,20 +105,83 @@ class Config:
                 'settings',
                 'cache',
                 os.path.join(os.environ.get('HOME', './'), '.pyhn', 'cache'))
+        if not self.parser.has_option('settings', 'cache_backend'):
+            # "sharded": one JSON file per section in `cache`.d; "json": one
+            # file at `cache`; "sqlite": a database at `cache`.db. Sharded
+            # and sqlite import the existing cache on first use.
+            self.parser.set('settings', 'cache_backend', 'sharded')
         if not self.parser.has_option('settings', 'cache_age'):
             self.parser.set('settings', 'cache_age', "5")
         if not self.parser.has_option('settings', 'browser_cmd'):
             self.parser.set('settings', 'browser_cmd', '__default__')
 
+        if not self.parser.has_option('settings', 'api_base'):
+            # Root of the Firebase API; point it at a mirror or at a local
+            # stand-in (python -m pyhn.standin) for testing.
+            self.parser.set(
+                'settings', 'api_base', 'https://hacker-news.firebaseio.com/v0')
+
         if not self.parser.has_option('settings', 'refresh_interval'):
             self.parser.set('settings', 'refresh_interval', '5')
 
         if not self.parser.has_option('settings', 'comments_limit'):
-            # Roughly a screenful: keeps the initial comment load fast (fewer
-            # API round-trips). BFS fills top-level comments first, then a few
-            # children. Raise for deeper threads at the cost of load time.
+            # Comments fetched per load: roughly a screenful keeps opening a
+            # thread fast. BFS fills top-level comments first; the rest show
+            # as "N more replies" rows, fetched in batches of this size when
+            # expanded or scrolled near.
             self.parser.set('settings', 'comments_limit', '50')
 
+        if not self.parser.has_option('settings', 'preconnect'):
+            # Open pooled API connections while the first frame is drawn, so
+            # the first section load skips most TCP/TLS handshakes.
+            self.parser.set('settings', 'preconnect', 'true')
+
+        if not self.parser.has_option('settings', 'live'):
+            # Stream the active section's id list (server-sent events) instead
+            # of polling every refresh_interval; falls back to polling.
+            self.parser.set('settings', 'live', 'false')
+
+        if not self.parser.has_option('settings', 'refresh_mode'):
+            # "incremental": refetch only items listed in the API's updates
+            # feed (or new to the list); "full": refetch the whole section.
+            self.parser.set('settings', 'refresh_mode', 'incremental')
+
+        if not self.parser.has_option('settings', 'item_cache_ttl'):
+            # Seconds a fetched item is reused across sections and refreshes
+            # (0 disables the in-memory item cache).
+            self.parser.set('settings', 'item_cache_ttl', '60')
+        if not self.parser.has_option('settings', 'item_cache_size'):
+            self.parser.set('settings', 'item_cache_size', '2000')
+
+        if not self.parser.has_option('settings', 'retries'):
+            # Extra attempts for a failed request (jittered backoff).
+            self.parser.set('settings', 'retries', '2')
+        if not self.parser.has_option('settings', 'hedge_percentile'):
+            # Re-send an item request still pending past this percentile of
+            # recent latencies and keep the first answer (0 disables).
+            self.parser.set('settings', 'hedge_percentile', '95')
+        if not self.parser.has_option('settings', 'rate_limit'):
+            # Most API requests per second across the whole app, with up to
+            # rate_burst sent back to back (0 disables the limit).
+            self.parser.set('settings', 'rate_limit', '0')
+        if not self.parser.has_option('settings', 'rate_burst'):
+            self.parser.set('settings', 'rate_burst', '20')
+
+        if not self.parser.has_option('settings', 'prefetch'):
+            # Fetch comment threads for the focused story and the next few
+            # rows in the background, so opening a thread is usually instant.
+            self.parser.set('settings', 'prefetch', 'true')
+        if not self.parser.has_option('settings', 'prefetch_budget'):
+            # Most prefetched threads kept in memory.
+            self.parser.set('settings', 'prefetch_budget', '20')
+        if not self.parser.has_option('settings', 'comment_cache_ttl'):
+            # Seconds a comment thread kept on disk is shown instantly when
+            # reopened (and refreshed in the background); 0 disables it.
+            self.parser.set('settings', 'comment_cache_ttl', '1800')
+        if not self.parser.has_option('settings', 'comment_cache_size'):
+            # Most threads kept on disk; the least recently opened go first.
+            self.parser.set('settings', 'comment_cache_size', '200')
+
         if not self.parser.has_option('settings', 'log_path'):
             self.parser.set(
                 'settings',
@@ -5,74 +5,63 @@ import os
 import subprocess
 import sys
 import threading
+from collections.abc import Iterable
+from contextlib import nullcontext
 from typing import TYPE_CHECKING, Any
-from urllib.parse import urlparse
 
 import urwid
 
 from pyhn import __version__
 from pyhn.config import TRUE_WORDS, Config
+from pyhn.hnapi import MoreComments
+from pyhn.live import LiveSection
 from pyhn.poller import Poller
 from pyhn.popup import Popup
+from pyhn.prefetch import CommentPrefetcher
+from pyhn.users import UserService
 
 if TYPE_CHECKING:
     from pyhn.cachemanager import CacheManager
-    from pyhn.hnapi import HackerNewsComment, HackerNewsStory
+    from pyhn.hnapi import CommentRow, HackerNewsComment, HackerNewsStory
 
 log = logging.getLogger(__name__)
 
 
 class ItemWidget(urwid.WidgetWrap):
-    """ Widget of listbox, represent each story """
+    """ Widget of listbox, represent each story
+
+    Reads the story's fields through `story` instead of copying them, so a
+    story is held once however many rows show it.
+    """
     def __init__(
         self,
         story: HackerNewsStory,
         show_published_time: bool,
         show_score: bool,
         show_comments: bool,
+        show_karma: bool = False,
+        karma: int | None = None,
     ) -> None:
         self.story = story
-        self.number = story.number
-        self.title = story.title
-        self.url = story.url
-        self.domain = urlparse(story.domain).netloc
-        self.submitter = story.submitter
-        self.submitter_url = story.submitter_url
-        self.comment_count = story.comment_count
-        self.comments_url = story.comments_url
-        self.score = story.score
-        self.published_time = story.published_time
         self.show_published_time = show_published_time
         self.show_score = show_score
         self.show_comments = show_comments
+        # Submitter karma column; filled in by set_karma once the profile
+        # arrives (blank until then).
+        self._karma: urwid.Text | None = None
 
-        if self.number is None:
-            number_text = '-'
-            number_align = 'center'
-            self.number = '-'
-        else:
-            number_align = 'right'
-            number_text = f'{self.number}:'
-
-        if self.submitter is None:
-            self.submitter = None
-            self.submitter_url = None
-
-        if self.score is None:
-            self.score = "-"
-
-        if self.comment_count is None:
-            comment_text = '-'
-            self.comment_count = None
-            self.comments_url = None
-        else:
-            comment_text = f'{self.comment_count}'
+        number_text = story.rank_text
+        number_align = 'center' if story.number is None else 'right'
+        score_text = "-" if story.score is None else str(story.score)
+        comment_text = (
+            '-' if story.comment_count is None else f'{story.comment_count}')
+        domain = story.netloc
 
         # Title, with the source domain appended in a dim style (HN-like),
         # except for self/text posts that just link back to the item page.
-        title_markup: list = [self.title]
-        if self.domain and self.domain != 'news.ycombinator.com':
-            title_markup.append(('domain', f'  ({self.domain})'))
+        title_markup: list = [story.title]
+        if domain and domain != 'news.ycombinator.com':
+            title_markup.append(('domain', f'  ({domain})'))
 
         self.item = [
             ('fixed', 4, urwid.Padding(urwid.AttrMap(
@@ -82,15 +71,22 @@ class ItemWidget(urwid.WidgetWrap):
                 urwid.Text(title_markup),
                 {None: 'body'}, {None: 'focus'}),
         ]
+        if show_karma:
+            self._karma = urwid.Text("", align="right")
+            self.item.append(
+                ('fixed', 7, urwid.Padding(urwid.AttrMap(
+                    self._karma, 'body', 'focus'))),
+            )
+            self.set_karma(karma)
         if self.show_published_time:
             self.item.append(
                 ('fixed', 15, urwid.Padding(urwid.AttrMap(
-                urwid.Text(str(self.published_time), align="right"), 'body', 'focus'))),
+                urwid.Text(story.published_time, align="right"), 'body', 'focus'))),
             )
         if self.show_score:
             self.item.append(
                 ('fixed', 5, urwid.Padding(urwid.AttrMap(
-                    urwid.Text(str(self.score), align="right"), 'body', 'focus'))),
+                    urwid.Text(score_text, align="right"), 'body', 'focus'))),
             )
         if self.show_comments:
             self.item.append(
@@ -101,6 +97,41 @@ class ItemWidget(urwid.WidgetWrap):
         w = urwid.Columns(self.item, focus_column=1, dividechars=1)
         super().__init__(w)
 
+    def set_karma(self, karma: int | None) -> None:
+        """Show the submitter's karma (no-op without the karma column)."""
+        if self._karma is not None:
+            self._karma.set_text("" if karma is None else str(karma))
+
+    @property
+    def title(self) -> str:
+        return self.story.title
+
+    @property
+    def url(self) -> str:
+        return self.story.url
+
+    @property
+    def submitter(self) -> str | None:
+        return self.story.submitter
+
+    @property
+    def submitter_url(self) -> str | None:
+        return self.story.submitter_url if self.story.submitter else None
+
+    @property
+    def comment_count(self) -> int | None:
+        return self.story.comment_count
+
+    @property
+    def comments_url(self) -> str | None:
+        if self.story.comment_count is None:
+            return None
+        return self.story.comments_url
+
+    @property
+    def published_time(self) -> str:
+        return self.story.published_time
+
     def selectable(self) -> bool:
         return True
 
@@ -157,6 +188,7 @@ class CommentWidget(urwid.WidgetWrap):
         # Plain body (selectable/navigable like any list row). The depth indent
         # and the left selection rule are drawn in render(), so the bar sits at
         # the comment's own left edge and moves with nesting.
+        self.comment = comment
         self._indent = 2 * comment.depth
         self._body = urwid.Padding(pile, right=1)
         super().__init__(self._body)
@@ -197,9 +229,66 @@ class CommentWidget(urwid.WidgetWrap):
         return key
 
 
+class MoreCommentsWidget(urwid.WidgetWrap):
+    """ "N more replies" row standing in for a subtree not fetched yet.
+
+    Replaced in place by the fetched rows when expanded (Enter, or when the
+    focus scrolls near it).
+    """
+
+    def __init__(self, more: MoreComments) -> None:
+        self.more = more
+        self.loading = False
+        self._text = urwid.Text("")
+        self._set_label()
+        super().__init__(urwid.Padding(
+            urwid.AttrMap(self._text, 'comment-meta', 'focus'),
+            left=2 * more.depth + 2, right=1))
+
+    def _set_label(self, note: str = "") -> None:
+        noun = "reply" if self.more.count == 1 else "replies"
+        self._text.set_text(f"▸ {self.more.count} more {noun}{note}")
+
+    def set_loading(self, loading: bool) -> None:
+        self.loading = loading
+        self._set_label(" (loading...)" if loading else "")
+
+    def selectable(self) -> bool:
+        return True
+
+    def keypress(self, size: tuple[int, int], key: str) -> str | None:
+        return key
+
+
+def _row_depth(widget: urwid.Widget) -> int:
+    if isinstance(widget, MoreCommentsWidget):
+        return widget.more.depth
+    return int(widget.comment.depth)
+
+
+def _comment_rows(comments: list[CommentRow]) -> list[urwid.Widget]:
+    return [
+        MoreCommentsWidget(c) if isinstance(c, MoreComments) else CommentWidget(c)
+        for c in comments]
+
+
+def _thread_rows(walker: urwid.SimpleListWalker) -> list[CommentRow]:
+    """The comment rows behind a comment view, in display order."""
+    return [
+        w.more if isinstance(w, MoreCommentsWidget) else w.comment
+        for w in walker]
+
+
 class HNGui:
     """ The Pyhn Gui object """
     SPINNER = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+    # Seconds the focus must rest on a story before its comments (and those
+    # of the next PREFETCH_NEIGHBOURS rows) are prefetched.
+    PREFETCH_DELAY = 0.3
+    PREFETCH_NEIGHBOURS = 3
+    # "More replies" rows within this many rows below the focus are expanded
+    # without waiting for Enter.
+    EXPAND_LOOKAHEAD = 5
 
     # Built lazily in _set_items()/build_interface(); declared here so the type
     # is known before those conditional assignments. urwid is treated as
@@ -217,6 +306,14 @@ class HNGui:
         # respect to a new load bumping the generation.
         self._load_gen = 0
         self._load_lock = threading.Lock()
+        # Generation of a comment load still waiting for its first batch
+        # (the view has not switched yet); unattended section reloads (live
+        # pushes, the poller) skip rather than cancel it.
+        self._comment_load: int | None = None
+        # Generation of a thread shown from the comment cache whose refetch
+        # is still running; "more replies" rows are not auto-expanded until
+        # it lands, so the fresh rows can replace the cached ones cleanly.
+        self._revalidating: int | None = None
         self._seen_ids: set = set()
         # "stories" list vs "comments" thread view.
         self._mode = "stories"
@@ -236,11 +333,22 @@ class HNGui:
         self.poller = Poller(
             self, delay=int(
                 self.config.parser.get('settings', 'refresh_interval')))
+        # Live mode streams the active section instead of polling it; the
+        # Poller only runs if live mode is off or its stream gives up.
+        self.live_mode = self.config.parser.get('settings', 'live') in TRUE_WORDS
+        self.live: LiveSection | None = None
+        # Background comment prefetch, started in build_interface.
+        self.prefetcher: CommentPrefetcher | None = None
+        self._prefetch_alarm: Any = None
+        # Submitter karma, fetched in batches after a section is shown.
+        self.users: UserService | None = None
         self.palette = self.config.get_palette()
         self.show_comments = self.config.parser.get('interface', 'show_comments') in TRUE_WORDS
         self.show_score = self.config.parser.get('interface', 'show_score') in TRUE_WORDS
         self.show_published_time = self.config.parser.get(
             'interface', 'show_published_time') in TRUE_WORDS
+        self.show_karma = self.config.parser.get(
+            'interface', 'show_karma') in TRUE_WORDS
 
     def main(self) -> None:
         """
@@ -341,6 +449,19 @@ class HNGui:
             # loop thread (drawing directly from a worker thread is unsafe and
             # can hang until the next keypress).
             self._redraw_pipe = self.loop.watch_pipe(self._loop_redraw)
+            # Warm the API connection pool while the first frame is drawn.
+            if self.config.parser.get('settings', 'preconnect') in TRUE_WORDS:
+                threading.Thread(
+                    target=self.cache_manager.api.preconnect,
+                    daemon=True).start()
+            if self.config.parser.get('settings', 'prefetch') in TRUE_WORDS:
+                self.prefetcher = CommentPrefetcher(
+                    self.cache_manager.api,
+                    self.cache_manager.comments_limit,
+                    budget=int(self.config.parser.get(
+                        'settings', 'prefetch_budget')))
+                self.prefetcher.start()
+            self.users = UserService(self.cache_manager.api)
         else:
             # Rebuild (reload_config): reuse the existing loop and redraw pipe
             # so in-flight workers keep writing to a live fd; just swap in the
@@ -396,12 +517,16 @@ class HNGui:
         if input in ('q', 'Q'):
             self.exit(must_raise=True)
 
-        # COMMENTS MODE: only navigation + back are active.
+        # COMMENTS MODE: only navigation, back and expanding are active.
         if self._mode == "comments":
             if input in self.bindings['back'].split(','):
                 self._close_comments()
+            elif (input in self.bindings['comments'].split(',')
+                    and isinstance(self.listbox.focus, MoreCommentsWidget)):
+                self._expand_more(self.listbox.focus)
             else:
                 self._handle_movement(input)
+                self._expand_near_focus()
             return
 
         # LINKS
@@ -434,6 +559,7 @@ class HNGui:
                 self.set_footer(self.listbox.focus.submitter_url)
         # MOVEMENTS
         self._handle_movement(input)
+        self._schedule_prefetch()
         # COMMENTS
         if input in self.bindings['comments'].split(','):
             self.open_comments_view()
@@ -472,7 +598,18 @@ class HNGui:
             story,
             self.show_published_time,
             self.show_score,
-            self.show_comments)
+            self.show_comments,
+            self._karma_shown(),
+            self._karma(story.submitter))
+
+    def _karma_shown(self) -> bool:
+        return self.show_karma and self.users is not None
+
+    def _karma(self, name: str | None) -> int | None:
+        """Cached karma for `name` (never fetches)."""
+        if not self.show_karma or self.users is None:
+            return None
+        return self.users.karma(name)
 
     def _set_items(self, stories: list[HackerNewsStory]) -> None:
         """Replace the list with stories (or build the walker first time)."""
@@ -525,6 +662,37 @@ class HNGui:
         if input in self.bindings['last_story'].split(','):
             self.listbox.set_focus(self.walker.positions()[-1])
 
+    def _schedule_prefetch(self) -> None:
+        """Prefetch comments around the focus once it stops moving.
+
+        Each call restarts the PREFETCH_DELAY timer, so scrolling through the
+        list queues nothing; when it fires, the prefetcher's queue is replaced
+        (cancelling work for rows the focus has left).
+        """
+        if self.prefetcher is None:
+            return
+        if self._prefetch_alarm is not None:
+            self.loop.remove_alarm(self._prefetch_alarm)
+        self._prefetch_alarm = self.loop.set_alarm_in(
+            self.PREFETCH_DELAY, self._prefetch_focus)
+
+    def _prefetch_focus(self, *args: Any) -> None:
+        self._prefetch_alarm = None
+        if self.prefetcher is None or self._mode != "stories":
+            return
+        if not self.walker.positions():
+            return
+        position = self.listbox.focus_position
+        ids: list[int] = []
+        for widget in self.walker[position:]:
+            if len(ids) > self.PREFETCH_NEIGHBOURS:
+                break
+            if (isinstance(widget, ItemWidget) and widget.story.id is not None
+                    and widget.comment_count):
+                ids.append(widget.story.id)
+        log.debug("prefetching comments for %s", ids)
+        self.prefetcher.schedule(ids)
+
     def open_comments_view(self) -> None:
         """Open the in-app comment thread for the focused story."""
         focus = self.listbox.focus
@@ -538,31 +706,78 @@ class HNGui:
         with self._load_lock:
             self._load_gen += 1
             gen = self._load_gen
+            self._comment_load = gen
         self.set_header(f"COMMENTS: {focus.title}")
         self.set_footer('Loading comments...')
         self.loop.draw_screen()
         threading.Thread(
-            target=self._load_comments,
+            target=self._run_comment_load,
             args=(story_id, gen),
             daemon=True).start()
 
+    def _run_comment_load(self, story_id: int, gen: int) -> None:
+        try:
+            self._load_comments(story_id, gen)
+        finally:
+            with self._load_lock:
+                if self._comment_load == gen:
+                    self._comment_load = None
+
+    def _comment_load_pending(self) -> bool:
+        """Whether a comment thread is loading but not shown yet."""
+        return (self._comment_load is not None
+                and self._comment_load == self._load_gen)
+
     def _load_comments(self, story_id: int, gen: int) -> None:
-        """Fetch and render a story's comments (background thread)."""
+        """Fetch and render a story's comments (background thread).
+
+        Top-level comments are shown as soon as their level arrives; replies
+        are then inserted under their parents level by level. A thread from
+        the on-disk comment cache is shown at once and then revalidated.
+        """
         log.debug("loading comments for story_id=%s", story_id)
+        comment_cache = self.cache_manager.comment_cache
+        entered = False
         try:
-            comments = self.cache_manager.api.get_comments(
-                story_id, self.cache_manager.comments_limit)
+            prefetched = None
+            if self.prefetcher is not None:
+                prefetched = self.prefetcher.get(story_id)
+            cached = None
+            if prefetched is None and comment_cache is not None:
+                cached = comment_cache.get(story_id)
+            batches: Iterable[list[tuple[int, list[CommentRow]]]]
+            if prefetched is not None:
+                batches = [[(story_id, prefetched)]] if prefetched else []
+            elif cached is not None:
+                batches = [[(story_id, cached)]] if cached else []
+            else:
+                batches = self.cache_manager.api.iter_comments(
+                    story_id, self.cache_manager.comments_limit)
+            for batch in batches:
+                with self._load_lock:
+                    if gen != self._load_gen:
+                        log.debug("comment load superseded (gen changed)")
+                        return
+                    if not entered:
+                        self._enter_comments()
+                        entered = True
+                    elif self._mode != "comments":
+                        return  # closed while replies were streaming in
+                    self._insert_replies(batch)
+                self.set_footer(
+                    f"{self._comment_count()} comments (loading...) - Esc to go back")
+                self._request_redraw()
         except Exception:
             # Worker-thread boundary: never let an error (network, or a pool
             # shutdown race on quit) escape as an uncaught traceback.
             log.exception("comment load failed for story_id=%s", story_id)
             if gen == self._load_gen:
-                self.set_header(self._story_header)
+                if not entered:
+                    self.set_header(self._story_header)
                 self.set_footer('Failed to load comments', style="error")
                 self._request_redraw()
             return
-        log.debug("fetched %d comments for story_id=%s", len(comments), story_id)
-        if not comments:
+        if not entered:
             with self._load_lock:
                 if gen != self._load_gen:
                     return
@@ -570,20 +785,198 @@ class HNGui:
             self.set_footer('No comments')
             self._request_redraw()
             return
-        rows = [CommentWidget(c) for c in comments]
         with self._load_lock:
-            if gen != self._load_gen:
-                log.debug("comment load superseded (gen changed)")
+            if gen != self._load_gen or self._mode != "comments":
+                return
+            rows = _thread_rows(self.walker)
+            if cached is not None:
+                self._revalidating = gen
+        log.debug("loaded %d rows for story_id=%s", len(rows), story_id)
+        if cached is not None:
+            self.set_footer(
+                f"{self._comment_count()} comments (cached, refreshing...)"
+                " - Esc to go back")
+            self._request_redraw()
+            try:
+                self._revalidate_comments(story_id, gen, rows)
+            finally:
+                with self._load_lock:
+                    if self._revalidating == gen:
+                        self._revalidating = None
+            if gen == self._load_gen and self._mode == "comments":
+                self._expand_near_focus()
+                self._request_redraw()
+            return
+        if comment_cache is not None:
+            self._store_comments(story_id, rows)
+        self.set_footer(f"{self._comment_count()} comments - Esc to go back")
+        self._expand_near_focus()
+        self._request_redraw()
+
+    def _revalidate_comments(
+        self, story_id: int, gen: int, cached: list[CommentRow],
+    ) -> None:
+        """Refetch a thread shown from the comment cache and swap in the
+        new rows if it changed, keeping the focused comment (worker thread).
+
+        If the user expanded replies meanwhile, the view is left alone (the
+        fresh rows would drop them) and the footer says the thread changed;
+        the fresh rows are cached either way, so reopening shows them.
+        """
+        api = self.cache_manager.api
+        try:
+            with api.background():
+                fresh = api.get_comments(
+                    story_id, self.cache_manager.comments_limit)
+        except Exception:
+            log.exception("revalidating comments failed for story_id=%s",
+                          story_id)
+            if gen == self._load_gen:
+                self.set_footer(
+                    f"{self._comment_count()} comments (cached)"
+                    " - Esc to go back")
+                self._request_redraw()
+            return
+        self._store_comments(story_id, fresh)
+        cached_rows = [r.to_dict() for r in cached]
+        changed = [r.to_dict() for r in fresh] != cached_rows
+        kept = False
+        with self._load_lock:
+            if gen != self._load_gen or self._mode != "comments":
+                return
+            expanded = (
+                [r.to_dict() for r in _thread_rows(self.walker)] != cached_rows
+                or any(isinstance(w, MoreCommentsWidget) and w.loading
+                       for w in self.walker))
+            if changed and expanded:
+                log.debug("cached thread %s changed, kept expanded view",
+                          story_id)
+                kept = True
+            elif changed:
+                log.debug("cached thread %s changed, replacing", story_id)
+                focus = self.listbox.focus
+                focus_id = (focus.comment.id
+                            if isinstance(focus, CommentWidget) else None)
+                self.walker[:] = _comment_rows(fresh)
+                for position, widget in enumerate(self.walker):
+                    if (isinstance(widget, CommentWidget)
+                            and widget.comment.id == focus_id):
+                        self.walker.set_focus(position)
+                        break
+        if kept:
+            self.set_footer(
+                f"{self._comment_count()} comments (thread updated, reopen to"
+                " see changes) - Esc to go back")
+        else:
+            self.set_footer(
+                f"{self._comment_count()} comments - Esc to go back")
+        self._request_redraw()
+
+    def _store_comments(self, story_id: int, rows: list[CommentRow]) -> None:
+        comment_cache = self.cache_manager.comment_cache
+        if comment_cache is None:
+            return
+        try:
+            comment_cache.put(story_id, rows)
+        except OSError:
+            log.exception("writing comment cache failed for story_id=%s",
+                          story_id)
+
+    def _enter_comments(self) -> None:
+        """Swap in an empty comment list (caller holds _load_lock)."""
+        self._story_listbox = self.listbox
+        self._story_walker = self.walker
+        self.walker = urwid.SimpleListWalker([])
+        self.listbox = urwid.ListBox(self.walker)
+        self.view.body = urwid.AttrMap(self.listbox, 'body')
+        self._mode = "comments"
+        self._comment_load = None
+        log.debug("entered comments mode")
+
+    def _insert_replies(self, batch: list[tuple[int, list[CommentRow]]]) -> None:
+        """Insert each reply list after its parent's subtree, keeping focus.
+
+        A parent id that is not a row (the story itself) means the end of the
+        list. Inserting from the bottom up keeps the positions found above
+        valid, and for a shared insertion point puts a descendant's rows
+        before its ancestor's, as depth-first order requires.
+        """
+        positions = {
+            w.comment.id: pos for pos, w in enumerate(self.walker)
+            if isinstance(w, CommentWidget)}
+        inserts = []
+        for parent_id, replies in batch:
+            if parent_id in positions:
+                end = self._subtree_end(positions[parent_id])
+            else:
+                end = len(self.walker)
+            inserts.append((end, replies))
+        focus = self.walker.focus if len(self.walker) else None
+        for end, replies in sorted(inserts, key=lambda i: i[0], reverse=True):
+            self.walker[end:end] = _comment_rows(replies)
+            if focus is not None and end <= focus:
+                focus += len(replies)
+        if focus is not None:
+            self.walker.set_focus(focus)
+
+    def _subtree_end(self, position: int) -> int:
+        """Index just past the rows nested under the row at `position`."""
+        depth = _row_depth(self.walker[position])
+        end = position + 1
+        while end < len(self.walker) and _row_depth(self.walker[end]) > depth:
+            end += 1
+        return end
+
+    def _comment_count(self) -> int:
+        return sum(isinstance(w, CommentWidget) for w in self.walker)
+
+    def _expand_near_focus(self) -> None:
+        """Expand "more replies" rows the focus is about to scroll onto."""
+        if not self.walker.positions() or self._revalidating == self._load_gen:
+            return
+        position = self.listbox.focus_position
+        for widget in self.walker[position:position + self.EXPAND_LOOKAHEAD + 1]:
+            if isinstance(widget, MoreCommentsWidget) and not widget.loading:
+                self._expand_more(widget)
+
+    def _expand_more(self, widget: MoreCommentsWidget) -> None:
+        if widget.loading:
+            return
+        widget.set_loading(True)
+        threading.Thread(
+            target=self._load_more,
+            args=(widget, self._load_gen),
+            daemon=True).start()
+
+    def _load_more(self, widget: MoreCommentsWidget, gen: int) -> None:
+        """Fetch a placeholder's replies and splice them in (background thread)."""
+        try:
+            comments = self.cache_manager.api.expand_comments(
+                widget.more, self.cache_manager.comments_limit)
+        except Exception:
+            log.exception("loading %d more replies failed", widget.more.count)
+            widget.set_loading(False)
+            if gen == self._load_gen:
+                self.set_footer('Failed to load replies', style="error")
+                self._request_redraw()
+            return
+        with self._load_lock:
+            if gen != self._load_gen or self._mode != "comments":
+                # Superseded: leave the placeholder expandable again.
+                widget.set_loading(False)
                 return
-            self._story_listbox = self.listbox
-            self._story_walker = self.walker
-            walker = urwid.SimpleListWalker(rows)
-            self.walker = walker
-            self.listbox = urwid.ListBox(walker)
-            self.view.body = urwid.AttrMap(self.listbox, 'body')
-            self._mode = "comments"
-        self.set_footer(f"{len(comments)} comments - Esc to go back")
-        log.debug("entered comments mode (%d rows)", len(comments))
+            try:
+                position = self.walker.index(widget)
+            except ValueError:
+                widget.set_loading(False)
+                return
+            rows = _comment_rows(comments)
+            focus = self.listbox.focus_position
+            self.walker[position:position + 1] = rows
+            # Keep the focused comment put when rows land above it.
+            if focus > position:
+                self.listbox.set_focus(focus + len(rows) - 1)
+        self.set_footer(f"{self._comment_count()} comments - Esc to go back")
         self._request_redraw()
 
     def _close_comments(self) -> None:
@@ -641,10 +1034,13 @@ class HNGui:
 
     def _spawn_load(
         self, which: str, header: str | None = None, force: bool = False,
+        background: bool = False,
     ) -> None:
         """Start (or restart) a background load, superseding any in flight.
 
         Must be called on the loop thread (prefill + animation touch urwid).
+        `background` puts its requests in the rate limit's background lane
+        (unattended refreshes), so they yield to user-driven loads.
         """
         streaming = force or self.cache_manager.is_outdated(which)
         with self._load_lock:
@@ -659,16 +1055,65 @@ class HNGui:
         log.debug(
             "spawn_load which=%s force=%s streaming=%s gen=%d",
             which, force, streaming, gen)
-        threading.Thread(
-            target=self.load_section,
-            args=(which, header, force, gen),
-            daemon=True).start()
+        if header is not None:
+            self._follow_live(which)
+
+        def run() -> None:
+            with (self.cache_manager.api.background() if background
+                  else nullcontext()):
+                self.load_section(which, header, force, gen)
+
+        threading.Thread(target=run, daemon=True).start()
 
     def refresh_current(self) -> None:
         """Force-refresh the current section (called from the poller thread)."""
+        def refresh(*_: object) -> None:
+            # Like live_update: never reload under the comment view, or
+            # cancel a thread still loading into it; the next poll will do.
+            if self._mode == "stories" and not self._comment_load_pending():
+                self._spawn_load(self.which, force=True, background=True)
         # Marshal onto the loop thread so prefill/animation are loop-safe.
-        self.loop.set_alarm_in(
-            0, lambda *_: self._spawn_load(self.which, force=True))
+        self.loop.set_alarm_in(0, refresh)
+
+    def _follow_live(self, which: str) -> None:
+        """Point the live stream at `which` (no-op unless live mode is on)."""
+        if not self.live_mode:
+            return
+        if self.live is not None:
+            if self.live.which == which:
+                return
+            self.live.stop()
+        self.live = LiveSection(self, which)
+        self.live.start()
+
+    def live_update(self, which: str, ids: list[int], changed: set[int]) -> None:
+        """Apply a pushed id list (called from the LiveSection thread).
+
+        Patches the cached section (fetching only `changed` and new ids), then
+        re-renders it from the now-fresh cache on the loop thread.
+        """
+        try:
+            stories = self.cache_manager.apply_ids(which, ids, changed)
+        except Exception:
+            log.exception("live update failed for which=%s", which)
+            return
+        if stories is None:
+            return
+
+        def show(*_: object) -> None:
+            # Don't clobber the comment view, or cancel a thread still loading
+            # into it; the cache is updated regardless.
+            if (self._mode == "stories" and self.which == which
+                    and not self._comment_load_pending()):
+                self._spawn_load(which)
+        self.loop.set_alarm_in(0, show)
+
+    def live_fallback(self) -> None:
+        """The live stream gave up: poll the current section instead."""
+        self.live_mode = False
+        self.live = None
+        if not self.poller.is_alive():
+            self.poller.start()
 
     def load_section(
         self, which: str, header: str | None = None,
@@ -698,6 +1143,7 @@ class HNGui:
                 log.debug("load_section %s warm n=%d", which, len(stories))
                 self._set_items(stories)
             self._request_redraw()
+            self._fetch_karma(stories)
             return
 
         offset = 0
@@ -733,9 +1179,30 @@ class HNGui:
                 return
             del self.walker[offset:]  # drop any leftover skeleton rows
             self._stop_anim()
+            stories = [w.story for w in self.walker if isinstance(w, ItemWidget)]
         log.debug("load_section %s stream done n=%d", which, offset)
         self.set_footer(f"{which} stories ({offset})")
         self._request_redraw()
+        self._fetch_karma(stories)
+
+    def _fetch_karma(self, stories: list[HackerNewsStory]) -> None:
+        """Fetch the submitters' karma in the background, after the paint,
+        then fill in the karma column of every story row."""
+        if not self.show_karma or self.users is None:
+            return
+
+        def done() -> None:
+            with self._load_lock:
+                walker = (self._story_walker if self._mode == "comments"
+                          else self.walker)
+                for widget in walker:
+                    if isinstance(widget, ItemWidget):
+                        widget.set_karma(self._karma(widget.submitter))
+            self.update()
+            self._request_redraw()
+
+        self.users.prefetch(
+            (s.submitter for s in stories if s.submitter), done)
 
     def open_webbrowser(self, url: str) -> None:
         """ Handle url and open sub process with web browser """
@@ -774,6 +1241,9 @@ class HNGui:
             msg = f"submitted {focus.published_time}"
         else:
             msg = f"submitted {focus.published_time} by {focus.submitter}"
+            karma = self._karma(focus.submitter)
+            if karma is not None:
+                msg += f" ({karma} karma)"
 
         self.set_footer(msg)
 
@@ -791,18 +1261,26 @@ class HNGui:
             'interface', 'show_score') in TRUE_WORDS
         self.show_published_time = self.config.parser.get(
             'interface', 'show_published_time') in TRUE_WORDS
+        self.show_karma = self.config.parser.get(
+            'interface', 'show_karma') in TRUE_WORDS
         self.build_interface()
         self.loop.draw_screen()
         self.set_footer('Configuration file reloaded!')
 
         if self.config.parser.get(
                 'settings', 'cache') != self.cache_manager.cache_path:
-            self.cache_manager.cache_path = self.config.parser.get(
-                'settings', 'cache')
+            self.cache_manager.set_cache_path(
+                self.config.parser.get('settings', 'cache'))
 
     def exit(self, must_raise: bool = False) -> None:
+        if self.live is not None:
+            self.live.stop()
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
         self.poller.stop()
-        self.poller.join()
+        if self.poller.is_alive():
+            self.poller.join()
+        self.cache_manager.api.close()
         if must_raise:
             raise urwid.ExitMainLoop()
         urwid.ExitMainLoop()
@@ -815,7 +1293,8 @@ class HNGui:
             0, lambda *a: self._spawn_load('top', 'TOP STORIES'))
 
         try:
-            self.poller.start()
+            if not self.live_mode:
+                self.poller.start()
             self.loop.run()
         except KeyboardInterrupt:
             self.exit()
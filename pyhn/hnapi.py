@@ -10,14 +10,34 @@ HackerNewsUser) is kept stable so the cache and GUI layers are unaffected.
 """
 from __future__ import annotations
 
+import functools
 import html
+import logging
+import random
+import re
+import threading
 import time
-from collections.abc import Iterator
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from html.parser import HTMLParser
-from typing import Any
+from typing import Any, TypeVar
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from pyhn import codec
+from pyhn.concurrency import AdaptiveLimit
+from pyhn.itemcache import ItemCache
+from pyhn.ratelimit import BACKGROUND, FOREGROUND, RateLimiter
+from pyhn.singleflight import SingleFlight
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 API_BASE = "https://hacker-news.firebaseio.com/v0"
 ITEM_BASE = "https://news.ycombinator.com/item?id="
@@ -26,10 +46,30 @@ USER_BASE = "https://news.ycombinator.com/user?id="
 # Stories per "page", matching the historical HN front-page size. extra_page
 # multiplies this (extra_page=2 -> 90 stories), preserving the old semantics.
 PAGE_SIZE = 30
-# Concurrency for per-item lookups (the API has no batch endpoint).
+# Starting concurrency for per-item lookups (the API has no batch endpoint).
+# Adapted at runtime between 1 and WORKER_LIMIT by pyhn.concurrency.
 MAX_WORKERS = 16
+WORKER_LIMIT = 64
+# Requests slower than this (seconds) count as congestion and shrink the limit.
+TARGET_LATENCY = 1.0
 # Per-request timeout (seconds) so a stalled connection can't hang forever.
 REQUEST_TIMEOUT = 10
+# Extra attempts per request after a failure, with jittered exponential
+# backoff starting at RETRY_BACKOFF seconds.
+RETRIES = 2
+RETRY_BACKOFF = 0.25
+# Duplicate an item request still pending after this percentile of recent
+# item latencies (0 disables hedging); needs HEDGE_MIN_SAMPLES to estimate.
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+# Item cache defaults: seconds an item stays fresh, and max items kept.
+ITEM_CACHE_TTL = 60
+ITEM_CACHE_SIZE = 2000
+# Global cap on requests per second (0 disables it) and how many may go out
+# back to back after an idle spell.
+RATE_LIMIT = 0
+RATE_BURST = 20
 
 HEADERS = {
     'User-Agent': (
@@ -76,8 +116,41 @@ def _relative_time(epoch: int, now: float | None = None) -> str:
     return "just now"
 
 
+# Relative ages are recomputed at most once per tick (seconds), however often
+# a row is rendered in between.
+DISPLAY_TICK = 1
+_UNIT_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@functools.lru_cache(maxsize=4096)
+def _relative_time_at(epoch: int, tick: int) -> str:
+    return _relative_time(epoch, now=tick * DISPLAY_TICK)
+
+
+def _display_time(epoch: int | None) -> str:
+    """_relative_time for display, memoized per DISPLAY_TICK; "" if unknown."""
+    if not epoch:
+        return ""
+    return _relative_time_at(epoch, int(time.time() // DISPLAY_TICK))
+
+
+def _parse_relative_time(text: str) -> int | None:
+    """Seconds encoded in a _relative_time string, or None if unparseable."""
+    if text == "just now":
+        return 0
+    parts = text.split()
+    if len(parts) != 3 or parts[2] != "ago" or not parts[0].isdigit():
+        return None
+    unit = _UNIT_SECONDS.get(parts[1].rstrip("s"))
+    return None if unit is None else int(parts[0]) * unit
+
+
 class _TextExtractor(HTMLParser):
-    """Collects plain text from HN comment HTML."""
+    """Collects plain text from HN comment HTML.
+
+    The general (slow) path behind _html_to_text, for markup outside the
+    small tag set the fast path handles.
+    """
 
     def __init__(self) -> None:
         super().__init__()
@@ -98,22 +171,448 @@ class _TextExtractor(HTMLParser):
         return "".join(self.parts).strip()
 
 
-def _html_to_text(raw: str) -> str:
-    """Convert HN comment HTML to readable plain text."""
-    if not raw:
-        return ""
+# Text emitted for each start tag of the markup HN generates; any other tag
+# sends the comment down the HTMLParser path.
+_TAG_TEXT = {
+    "p": "\n\n", "br": "\n", "li": "\n- ",
+    "i": "", "a": "", "pre": "", "code": "",
+}
+# A start or end tag (groups: "/" or "", name); quoted attribute values may
+# contain ">".
+_TAG_RE = re.compile(r"""<(/?)([a-zA-Z][a-zA-Z0-9]*)(?:[^>"']|"[^"]*"|'[^']*')*>""")
+# The entities HN escapes comment text with. &amp; is decoded last so that
+# "&amp;lt;" stays "&lt;".
+_ENTITIES = (
+    ("&#x27;", "'"), ("&quot;", '"'), ("&gt;", ">"), ("&lt;", "<"),
+    ("&#x2F;", "/"),
+)
+
+
+def _unescape(text: str) -> str:
+    """html.unescape, with plain str.replace for HN's usual entities."""
+    decoded = text
+    for entity, char in _ENTITIES:
+        if entity in decoded:
+            decoded = decoded.replace(entity, char)
+    if decoded.count("&") != decoded.count("&amp;"):
+        return html.unescape(text)
+    return decoded.replace("&amp;", "&")
+
+
+def _parse_html_to_text(raw: str) -> str:
     parser = _TextExtractor()
     parser.feed(raw)
+    parser.close()
     return parser.get_text()
 
 
+def _html_to_text(raw: str) -> str:
+    """Convert HN comment HTML to readable plain text.
+
+    One regex split over the tags HN emits, decoding entities per text run;
+    anything else (unknown tags, a stray "<", comments) is left to the
+    HTMLParser-based _parse_html_to_text, whose output this matches. Text
+    inside <pre><code> and link text pass through untouched.
+    """
+    if not raw:
+        return ""
+    # [text, "/" or "", tag, text, "/" or "", tag, ..., text]
+    pieces = _TAG_RE.split(raw)
+    out = []
+    for index in range(0, len(pieces), 3):
+        run = pieces[index]
+        if "<" in run:
+            return _parse_html_to_text(raw)
+        out.append(_unescape(run) if "&" in run else run)
+        if index + 2 < len(pieces):
+            text = _TAG_TEXT.get(pieces[index + 2].lower())
+            if text is None:
+                return _parse_html_to_text(raw)
+            if not pieces[index + 1]:
+                out.append(text)
+    return "".join(out).strip()
+
+
+def _list_url(which: str, base: str | None = None) -> str:
+    """Return the story-list endpoint URL for a 'which' section (under
+    `base`, API_BASE by default)."""
+    endpoint = LIST_ENDPOINTS.get(which)
+    if endpoint is None:
+        valid = ", ".join(sorted(LIST_ENDPOINTS))
+        raise ValueError(f"Bad value: one of {valid}")
+    return f"{base or API_BASE}/{endpoint}.json"
+
+
+def _build_story(item: dict | None, rank: int) -> HackerNewsStory | None:
+    """Turn an API item into a HackerNewsStory, or None to skip it."""
+    if not item or item.get('deleted') or item.get('dead'):
+        return None
+
+    story = HackerNewsStory()
+    story.id = item.get('id')
+    story.number = rank
+    story.title = html.unescape(item.get('title') or "")
+    story.score = item.get('score')
+    story.comment_count = item.get('descendants')
+    story.time = item.get('time')
+
+    story.comments_url = f"{ITEM_BASE}{story.id}"
+    # Jobs send url:"" and Ask/text posts omit it; fall back to the item page.
+    story.url = item.get('url') or story.comments_url
+    story.domain = story.url
+
+    story.submitter = item.get('by')
+    if story.submitter:
+        story.submitter_url = f"{USER_BASE}{story.submitter}"
+    else:
+        story.submitter_url = None
+    return story
+
+
+def _build_comment(item_id: int, item: dict, depth: int) -> HackerNewsComment:
+    deleted = bool(item.get('deleted') or item.get('dead'))
+    return HackerNewsComment(
+        by=item.get('by'),
+        text="[deleted]" if deleted else _html_to_text(item.get('text', '')),
+        time=item.get('time'),
+        depth=depth,
+        deleted=deleted,
+        id=item_id)
+
+
+def _flatten_comments(
+    kid_ids: list[int], items: dict[int, dict | None], depth: int = 0,
+) -> list[CommentRow]:
+    """Depth-first walk of fetched comment items into display order.
+
+    `items` maps every id the BFS got to (None if it failed or was empty).
+    Replies it did not get to are collected into one MoreComments placeholder
+    after their fetched siblings, so they can be expanded later.
+    """
+    out: list[CommentRow] = []
+
+    def walk(kid_ids: list[int], depth: int) -> None:
+        missing = []
+        for cid in kid_ids:
+            if cid not in items:
+                missing.append(cid)
+                continue
+            item = items[cid]
+            if not item:
+                continue
+            out.append(_build_comment(cid, item, depth))
+            walk(item.get('kids', []), depth + 1)
+        if missing:
+            out.append(MoreComments(missing, depth))
+
+    walk(kid_ids, depth)
+    return out
+
+
 class HackerNewsAPI:
     """Fetches stories and users from the official Hacker News API."""
 
+    def __init__(
+        self,
+        item_cache_ttl: float = ITEM_CACHE_TTL,
+        item_cache_size: int = ITEM_CACHE_SIZE,
+        retries: int = RETRIES,
+        hedge_percentile: float = HEDGE_PERCENTILE,
+        rate_limit: float = RATE_LIMIT,
+        rate_burst: int = RATE_BURST,
+        transport: Any = None,
+        api_base: str | None = None,
+    ) -> None:
+        # Root of the Firebase API; a local stand-in (pyhn.standin) or any
+        # compatible mirror can be used instead.
+        self.api_base = api_base or API_BASE
+        # One keep-alive session for every request, so item lookups reuse
+        # pooled connections instead of paying a TCP + TLS handshake each.
+        # urllib3's connection pool is thread-safe; it is sized so each fetch
+        # worker can hold a connection without blocking or discarding one.
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=WORKER_LIMIT)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Every API GET goes through the transport: the session, unless a
+        # pyhn.transport recorder or replayer is given.
+        self.transport = self.session if transport is None else transport
+        # One bounded executor shared by every caller (story chunks, comment
+        # levels, the poller), so concurrency has a global cap and worker
+        # threads are started once instead of per chunk. Threads spawn lazily,
+        # and only as many as the adaptive limit lets into flight.
+        self._pool = ThreadPoolExecutor(
+            max_workers=WORKER_LIMIT, thread_name_prefix="pyhn-fetch")
+        self.limiter = AdaptiveLimit(
+            MAX_WORKERS, maximum=WORKER_LIMIT, target_latency=TARGET_LATENCY)
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        # Items by id, shared across sections and comment threads.
+        self.items = ItemCache(item_cache_ttl, item_cache_size)
+        self.retries = retries
+        self.hedge_percentile = hedge_percentile
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.hedged = 0  # duplicate requests sent
+        # Concurrent fetches of one URL share a single request; hedges opt
+        # out per thread (a hedge joining the slow request would be useless).
+        self.flights = SingleFlight()
+        self._local = threading.local()
+        # Every request takes a token first; background work yields to
+        # foreground requests waiting for one.
+        self.rate_limiter = RateLimiter(rate_limit, rate_burst)
+
+    def close(self) -> None:
+        """Stop the fetch workers and drop pooled connections.
+
+        Queued work is cancelled; callers still waiting on it get an error,
+        which the GUI's worker threads already treat as a failed load.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def pool_stats(self) -> dict[str, int]:
+        """Snapshot of the shared executor and the current concurrency limit.
+
+        `queued` is the backlog: calls waiting for a concurrency slot plus
+        the few submitted but not yet picked up by a worker.
+        """
+        with self._stats_lock:
+            return {
+                "workers": WORKER_LIMIT,
+                "limit": self.limiter.limit,
+                "active": self._active,
+                "queued": self.limiter.waiting + self._queued,
+                "completed": self._completed,
+            }
+
+    def rate_stats(self) -> dict[str, dict[str, float]]:
+        """Per-lane token counts and time spent waiting for the rate limit."""
+        return self.rate_limiter.stats()
+
+    @contextmanager
+    def background(self) -> Iterator[None]:
+        """Requests made by this thread inside the block (including the pool
+        work they submit) use the background lane of the rate limit."""
+        previous = self._lane()
+        self._local.lane = BACKGROUND
+        try:
+            yield
+        finally:
+            self._local.lane = previous
+
+    def _lane(self) -> str:
+        return getattr(self._local, "lane", FOREGROUND)
+
+    def _waited(self) -> float:
+        """Seconds this thread has spent waiting for rate-limit tokens and
+        retry backoff (not the network)."""
+        return getattr(self._local, "waited", 0.0)
+
+    def _add_wait(self, seconds: float) -> None:
+        self._local.waited = self._waited() + seconds
+
+    def _network_time(self, start: float, waited: float) -> float:
+        """Seconds since `start` (when `_waited()` was `waited`), less the
+        time spent waiting since, so throttling and backoff are not mistaken
+        for slow responses by the adaptive limit or the hedge threshold."""
+        return max(
+            time.monotonic() - start - (self._waited() - waited), 0.0)
+
+    def _tracked(self, fn: Callable[[T], R], arg: T, lane: str) -> R:
+        """Run fn(arg) on a pool worker in the submitter's rate-limit lane,
+        keeping the counters and feeding its latency and outcome back to the
+        adaptive limit."""
+        with self._stats_lock:
+            self._queued -= 1
+            self._active += 1
+        self._local.lane = lane
+        start, waited = time.monotonic(), self._waited()
+        ok = False
+        try:
+            result = fn(arg)
+            ok = True
+            return result
+        finally:
+            self._local.lane = FOREGROUND
+            self.limiter.release(self._network_time(start, waited), ok)
+            with self._stats_lock:
+                self._active -= 1
+                self._completed += 1
+
+    def _submit(self, fn: Callable[[T], R], arg: T) -> Future[R]:
+        """Submit fn(arg) to the shared pool once the adaptive limit allows.
+
+        The slot is taken here, before submission, so at most `limiter.limit`
+        calls run at once across all callers and no worker sits blocked.
+        _tracked returns it; a call that never starts (its future cancelled
+        by hedging or close(), or refused by a shut-down pool) returns it
+        through _unstarted.
+        """
+        self.limiter.acquire()
+        with self._stats_lock:
+            self._queued += 1
+        try:
+            future = self._pool.submit(self._tracked, fn, arg, self._lane())
+        except BaseException:
+            self._unstarted()
+            raise
+        future.add_done_callback(self._release_cancelled)
+        return future
+
+    def _release_cancelled(self, future: Future[Any]) -> None:
+        if future.cancelled():
+            self._unstarted()
+
+    def _unstarted(self) -> None:
+        """Return the slot and queue count of a call that never ran."""
+        self.limiter.discard()
+        with self._stats_lock:
+            self._queued -= 1
+
+    def _run_all(
+        self,
+        fn: Callable[[T], R],
+        args: list[T],
+        hedge_after: float | None = None,
+    ) -> list[Future[R]]:
+        """Run fn over args on the pool; one finished future per arg.
+
+        With `hedge_after`, a call still running that many seconds after it
+        started gets one duplicate, and whichever of the two succeeds first
+        is kept, so a single straggler cannot hold up the whole batch.
+        """
+        racers: list[list[Future[R]]] = []
+        started: list[float] = []
+        for arg in args:
+            racers.append([self._submit(fn, arg)])
+            started.append(time.monotonic())
+        if hedge_after is None:
+            wait([fs[0] for fs in racers])
+            return [fs[0] for fs in racers]
+
+        def settled(fs: list[Future[R]]) -> bool:
+            return (all(f.done() for f in fs)
+                    or any(f.done() and f.exception() is None for f in fs))
+
+        while True:
+            unsettled = [i for i, fs in enumerate(racers) if not settled(fs)]
+            if not unsettled:
+                break
+            now = time.monotonic()
+            wake = None
+            for i in unsettled:
+                if len(racers[i]) > 1:
+                    continue
+                due = started[i] + hedge_after
+                if due <= now:
+                    self.hedged += 1
+                    log.debug("hedging %s after %.3fs", args[i], now - started[i])
+                    racers[i].append(self._submit(
+                        functools.partial(self._uncoalesced, fn), args[i]))
+                elif wake is None or due < wake:
+                    wake = due
+            running = [f for i in unsettled for f in racers[i] if not f.done()]
+            wait(running, return_when=FIRST_COMPLETED,
+                 timeout=None if wake is None else max(0.0, wake - now))
+
+        out = []
+        for fs in racers:
+            succeeded = [f for f in fs if f.done() and f.exception() is None]
+            out.append(succeeded[0] if succeeded else fs[0])
+            for f in fs:
+                f.cancel()  # no-op once running or done
+        return out
+
+    def _uncoalesced(self, fn: Callable[[T], R], arg: T) -> R:
+        """Call fn(arg) with request coalescing off for this thread."""
+        self._local.uncoalesced = True
+        try:
+            return fn(arg)
+        finally:
+            self._local.uncoalesced = False
+
+    def _map(self, fn: Callable[[T], R], args: Iterable[T]) -> list[R]:
+        """Like Executor.map on the shared pool, but returns a list."""
+        return [future.result() for future in self._run_all(fn, list(args))]
+
+    def _hedge_after(self) -> float | None:
+        """Hedging delay: the configured percentile of recent item latency."""
+        samples = sorted(self._latencies)
+        if self.hedge_percentile <= 0 or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1,
+                    int(len(samples) * self.hedge_percentile / 100))
+        return samples[index]
+
+    def _fetch_items(self, ids: list[int]) -> list[dict | None]:
+        """Fetch items concurrently, results in the order of `ids`.
+
+        Item-cache hits are answered inline, so only real round-trips take a
+        concurrency slot (and only they feed the adaptive limit). An item
+        that still fails after its retries is logged and returned as None,
+        so one bad item drops out instead of failing the whole batch.
+        """
+        found = {item_id: self.items.get(item_id) for item_id in ids}
+        missing = [item_id for item_id, item in found.items() if item is None]
+        futures = self._run_all(
+            self._download_item, missing, self._hedge_after())
+        for item_id, future in zip(missing, futures, strict=True):
+            try:
+                found[item_id] = future.result()
+            except HNException:
+                log.warning("giving up on item %s", item_id, exc_info=True)
+                found[item_id] = None
+        return [found[item_id] for item_id in ids]
+
+    def fetch_users(self, names: list[str]) -> list[dict | None]:
+        """Fetch user profiles concurrently, in the order of `names`.
+
+        A profile that still fails after its retries is logged and returned
+        as None, like a failed item in _fetch_items.
+        """
+        futures = self._run_all(self._fetch_user, names)
+        profiles: list[dict | None] = []
+        for name, future in zip(names, futures, strict=True):
+            try:
+                profiles.append(future.result())
+            except HNException:
+                log.warning("giving up on user %s", name, exc_info=True)
+                profiles.append(None)
+        return profiles
+
+    def _fetch_user(self, name: str) -> dict | None:
+        return self._fetch_with_retries(f"{self.api_base}/user/{name}.json")
+
+    def _fetch_with_retries(self, url: str) -> Any:
+        """fetch_json, retried with jittered exponential backoff."""
+        for attempt in range(self.retries + 1):
+            try:
+                return self.fetch_json(url)
+            except HNException:
+                if attempt == self.retries:
+                    raise
+                delay = random.uniform(0, RETRY_BACKOFF * 2 ** attempt)
+                log.debug("retrying %s in %.2fs", url, delay, exc_info=True)
+                time.sleep(delay)
+                self._add_wait(delay)
+
     def fetch_json(self, url: str) -> Any:
-        """GET a URL and return the decoded JSON body."""
+        """GET a URL and return the decoded JSON body.
+
+        Concurrent calls for the same URL share one request and its result.
+        """
+        if getattr(self._local, "uncoalesced", False):
+            return self._request_json(url)
+        return self.flights.do(url, lambda: self._request_json(url))
+
+    def _request_json(self, url: str) -> Any:
+        """Send the GET and decode the body (no coalescing)."""
+        self._add_wait(self.rate_limiter.acquire(self._lane()))
         try:
-            r = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+            r = self.transport.get(url, timeout=REQUEST_TIMEOUT)
         except Exception as exc:
             raise HNException(
                 "Error getting data from " + url +
@@ -122,45 +621,45 @@ class HackerNewsAPI:
         if not r:
             raise HNException(
                 f"Empty or error response ({r.status_code}) from {url}")
-        return r.json()
+        return codec.loads(r.content)
+
+    def preconnect(self, connections: int = MAX_WORKERS) -> None:
+        """Warm the connection pool with `connections` concurrent requests.
+
+        Best-effort: meant to run in the background while the first frame
+        is drawn, so the first section load finds open connections. Errors
+        are logged and otherwise ignored (the real load reports them).
+        """
+        with self.background():
+            self._map(self._warm, [f"{self.api_base}/maxitem.json"] * connections)
+
+    def _warm(self, url: str) -> None:
+        self._add_wait(self.rate_limiter.acquire(self._lane()))
+        try:
+            self.transport.get(url, timeout=REQUEST_TIMEOUT).close()
+        except Exception:
+            log.debug("preconnect to %s failed", url, exc_info=True)
 
     def _story_ids(self, which: str) -> list[int]:
         """Return the ordered story ids for a 'which' section."""
-        endpoint = LIST_ENDPOINTS.get(which)
-        if endpoint is None:
-            valid = ", ".join(sorted(LIST_ENDPOINTS))
-            raise ValueError(f"Bad value: one of {valid}")
-        ids = self.fetch_json(f"{API_BASE}/{endpoint}.json")
+        ids = self._fetch_with_retries(_list_url(which, self.api_base))
         return ids or []
 
     def _fetch_item(self, item_id: int) -> dict | None:
-        """Fetch a single item; None if it has no body."""
-        return self.fetch_json(f"{API_BASE}/item/{item_id}.json")
+        """Fetch a single item (item cache first); None if it has no body."""
+        item = self.items.get(item_id)
+        if item is None:
+            item = self._download_item(item_id)
+        return item
 
-    def _build_story(self, item: dict | None, rank: int) -> HackerNewsStory | None:
-        """Turn an API item into a HackerNewsStory, or None to skip it."""
-        if not item or item.get('deleted') or item.get('dead'):
-            return None
-
-        story = HackerNewsStory()
-        story.id = item.get('id')
-        story.number = rank
-        story.title = html.unescape(item.get('title') or "")
-        story.score = item.get('score')
-        story.comment_count = item.get('descendants')
-        story.published_time = _relative_time(item['time']) if item.get('time') else ""
-
-        story.comments_url = f"{ITEM_BASE}{story.id}"
-        # Jobs send url:"" and Ask/text posts omit it; fall back to the item page.
-        story.url = item.get('url') or story.comments_url
-        story.domain = story.url
-
-        story.submitter = item.get('by')
-        if story.submitter:
-            story.submitter_url = f"{USER_BASE}{story.submitter}"
-        else:
-            story.submitter_url = None
-        return story
+    def _download_item(self, item_id: int) -> dict | None:
+        """Fetch a single item from the API and remember it in the cache."""
+        start, waited = time.monotonic(), self._waited()
+        item = self._fetch_with_retries(f"{self.api_base}/item/{item_id}.json")
+        self._latencies.append(self._network_time(start, waited))
+        if item:
+            self.items.put(item_id, item)
+        return item
 
     def iter_stories(
         self,
@@ -177,17 +676,73 @@ class HackerNewsAPI:
         ids = self._story_ids(which)[:count]
         rank = 1
         for start in range(0, len(ids), chunk_size):
-            batch = ids[start:start + chunk_size]
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
-                items = list(pool.map(self._fetch_item, batch))
+            items = self._fetch_items(ids[start:start + chunk_size])
+            log.debug("iter_stories %s chunk at %d: pool %s items %s",
+                      which, start, self.pool_stats(), self.items.stats())
             chunk = []
             for item in items:
-                story = self._build_story(item, rank)
+                story = _build_story(item, rank)
                 if story is not None:
                     chunk.append(story)
                     rank += 1
             yield chunk
 
+    def updated_ids(self) -> set[int]:
+        """Ids of items changed recently, from the /v0/updates.json feed."""
+        updates = self._fetch_with_retries(f"{self.api_base}/updates.json") or {}
+        return set(updates.get('items') or [])
+
+    def refresh_stories(
+        self,
+        which: str,
+        cached: list[HackerNewsStory],
+        extra_page: int = 1,
+    ) -> list[HackerNewsStory]:
+        """Re-rank a cached section, refetching only what changed.
+
+        Fetches the id list and the updates feed once, then only the items
+        that are new to the list or listed as updated; every other story is
+        reused from `cached` with its new rank. The feed only spans the last
+        few minutes, so `cached` must be recent for the result to be exact.
+        """
+        count = PAGE_SIZE * (extra_page + 1)
+        ids = self._story_ids(which)[:count]
+        return self.patch_stories(ids, cached, self.updated_ids())
+
+    def patch_stories(
+        self,
+        ids: list[int],
+        cached: list[HackerNewsStory],
+        changed: set[int],
+    ) -> list[HackerNewsStory]:
+        """Build the section for `ids`, reusing `cached` stories.
+
+        Only ids missing from `cached` or present in `changed` are fetched
+        (changed ones bypass the item cache); the rest keep their cached
+        fields and just get their new rank. A changed story whose refetch
+        fails keeps its cached fields too, rather than dropping out.
+        """
+        known = {story.id: story for story in cached}
+        stale = [i for i in ids if i not in known or i in changed]
+        # Updated items must skip the item cache; new ones may use it.
+        self.items.invalidate(changed.intersection(stale))
+        fetched = dict(zip(stale, self._fetch_items(stale), strict=True))
+        log.debug("patch_stories: %d ids, %d refetched", len(ids), len(stale))
+
+        stories = []
+        rank = 1
+        for item_id in ids:
+            if item_id in fetched and (
+                    fetched[item_id] is not None or item_id not in known):
+                story = _build_story(fetched[item_id], rank)
+            else:
+                story = known[item_id]
+                story.number = rank
+            if story is not None:
+                stories.append(story)
+                rank += 1
+        return stories
+
     def _collect(self, which: str, extra_page: int) -> list[HackerNewsStory]:
         """Fetch the first N ids for 'which' and build all stories."""
         return [
@@ -217,55 +772,111 @@ class HackerNewsAPI:
         return self._collect("jobs", extra_page)
 
     def get_comments(
-        self, item_id: int, max_comments: int = 50,
-    ) -> list[HackerNewsComment]:
+        self,
+        item_id: int,
+        max_comments: int = 50,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> list[CommentRow]:
         """Fetch a story's comment tree, flattened depth-first with depth tags.
 
         Items are fetched breadth-first, one whole level at a time and fully
         concurrent, so a large thread is a handful of parallel batches rather
         than hundreds of serial round-trips. Display order is then a cheap
         depth-first walk over the items already in memory.
+
+        At most `max_comments` items are fetched, top levels first; replies
+        beyond that come back as MoreComments placeholders for
+        expand_comments(), so a huge thread opens as fast as a small one.
+
+        `should_stop` is polled between levels; once it returns True the walk
+        ends early with the partial tree (used to cancel prefetches).
         """
         root = self._fetch_item(item_id)
         if not root:
             return []
+        kids = root.get('kids', [])
+        return _flatten_comments(
+            kids, self._fetch_tree(kids, max_comments, should_stop))
 
-        items: dict[int, dict] = {}
-        frontier = list(root.get('kids', []))
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
-            while frontier and len(items) < max_comments:
-                batch = frontier[:max_comments - len(items)]
-                next_frontier: list[int] = []
-                for cid, item in zip(
-                        batch, pool.map(self._fetch_item, batch), strict=False):
-                    if not item:
-                        continue
-                    items[cid] = item
-                    next_frontier.extend(item.get('kids', []))
-                frontier = next_frontier
+    def iter_comments(
+        self,
+        item_id: int,
+        max_comments: int = 50,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> Iterator[list[tuple[int, list[CommentRow]]]]:
+        """Streaming get_comments: yield each BFS level as soon as it arrives.
 
-        out: list[HackerNewsComment] = []
+        Every batch is a list of (parent id, replies) pairs, the parent being
+        the story or a comment from an earlier batch. Inserting each reply
+        list after the last row of its parent's subtree, in yield order,
+        rebuilds exactly the depth-first order get_comments returns. The last
+        batch carries the MoreComments placeholders, if any.
+        """
+        root = self._fetch_item(item_id)
+        if not root:
+            return
+        frontier = [(item_id, 0, list(root.get('kids', [])))]
+        fetched = 0
+        while frontier and fetched < max_comments:
+            if should_stop is not None and should_stop():
+                break
+            budget = max_comments - fetched
+            batch = [cid for _, _, kids in frontier for cid in kids][:budget]
+            fetched += len(batch)
+            items = dict(zip(batch, self._fetch_items(batch), strict=True))
+            level: list[tuple[int, list[CommentRow]]] = []
+            next_frontier = []
+            deferred = []
+            for parent_id, depth, kids in frontier:
+                replies: list[CommentRow] = []
+                for cid in kids:
+                    item = items.get(cid)
+                    if item:
+                        replies.append(_build_comment(cid, item, depth))
+                        next_frontier.append(
+                            (cid, depth + 1, list(item.get('kids', []))))
+                if replies:
+                    level.append((parent_id, replies))
+                missing = [cid for cid in kids if cid not in items]
+                if missing:
+                    deferred.append((parent_id, depth, missing))
+            if level:
+                yield level
+            frontier = deferred + [group for group in next_frontier if group[2]]
+        placeholders: list[tuple[int, list[CommentRow]]] = [
+            (parent_id, [MoreComments(kids, depth)])
+            for parent_id, depth, kids in frontier if kids]
+        if placeholders:
+            yield placeholders
 
-        def walk(kid_ids: list[int], depth: int) -> None:
-            for cid in kid_ids:
-                if len(out) >= max_comments:
-                    return
-                item = items.get(cid)
-                if not item:
-                    continue
-                deleted = bool(item.get('deleted') or item.get('dead'))
-                out.append(HackerNewsComment(
-                    by=item.get('by'),
-                    text="[deleted]" if deleted else _html_to_text(
-                        item.get('text', '')),
-                    published_time=(
-                        _relative_time(item['time']) if item.get('time') else ""),
-                    depth=depth,
-                    deleted=deleted))
-                walk(item.get('kids', []), depth + 1)
-
-        walk(root.get('kids', []), 0)
-        return out
+    def expand_comments(
+        self, more: MoreComments, max_comments: int = 50,
+    ) -> list[CommentRow]:
+        """Fetch the replies behind a placeholder, lazily like get_comments."""
+        return _flatten_comments(
+            more.ids, self._fetch_tree(more.ids, max_comments), more.depth)
+
+    def _fetch_tree(
+        self,
+        kid_ids: list[int],
+        max_comments: int,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> dict[int, dict | None]:
+        """Breadth-first fetch of up to `max_comments` items under `kid_ids`."""
+        items: dict[int, dict | None] = {}
+        frontier = list(kid_ids)
+        while frontier and len(items) < max_comments:
+            if should_stop is not None and should_stop():
+                break
+            batch = frontier[:max_comments - len(items)]
+            next_frontier: list[int] = []
+            for cid, item in zip(
+                    batch, self._fetch_items(batch), strict=True):
+                items[cid] = item
+                if item:
+                    next_frontier.extend(item.get('kids', []))
+            frontier = next_frontier
+        return items
 
 
 class HackerNewsComment:
@@ -275,48 +886,141 @@ class HackerNewsComment:
         self,
         by: str | None,
         text: str,
-        published_time: str,
+        time: int | None,
         depth: int,
         deleted: bool = False,
+        id: int | None = None,
     ) -> None:
+        self.id = id
         self.by = by
         self.text = text
-        self.published_time = published_time
+        self.time = time  # Unix time the comment was posted.
         self.depth = depth
         self.deleted = deleted
 
+    @property
+    def published_time(self) -> str:
+        """Relative age ("5 minutes ago"), computed when displayed."""
+        return _display_time(self.time)
+
+    def to_dict(self) -> dict:
+        """Serialize to a plain dict for the comment cache."""
+        return {"id": self.id, "by": self.by, "text": self.text,
+                "time": self.time, "depth": self.depth,
+                "deleted": self.deleted}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> HackerNewsComment:
+        return cls(data.get("by"), data.get("text", ""), data.get("time"),
+                   data.get("depth", 0), data.get("deleted", False),
+                   data.get("id"))
+
+
+class MoreComments:
+    """Placeholder row for replies not fetched yet ("N more replies")."""
+
+    def __init__(self, ids: list[int], depth: int) -> None:
+        self.ids = ids
+        self.depth = depth
+
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+    def to_dict(self) -> dict:
+        """Serialize to a plain dict for the comment cache."""
+        return {"more": self.ids, "depth": self.depth}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> MoreComments:
+        return cls(list(data["more"]), data.get("depth", 0))
+
+
+# One row of a flattened comment thread.
+CommentRow = HackerNewsComment | MoreComments
+
 
 class HackerNewsStory:
     """
     A class representing a story on Hacker News.
+
+    Slotted (no per-instance __dict__): large sections and history snapshots
+    hold many of these, and the GUI rows reference them rather than copying.
     """
-    id: int | None = None            # The Hacker News ID of a story.
-    number: int | str | None = None  # What rank the story is on HN.
-    title: str = ""                  # The title of the story.
-    domain: str = ""                 # The website the story is from.
-    url: str = ""                    # The URL of the story.
-    score: int | str | None = None   # Current score of the story.
-    submitter: str | None = ""       # The person that submitted the story.
-    submitter_url: str | None = None  # The submitter's user page.
-    comment_count: int | None = None  # How many comments the story has.
-    comments_url: str | None = ""     # The HN link for commenting.
-    published_time: str | None = ""   # The time since story was published
+    __slots__ = (
+        "id", "number", "title", "domain", "url", "score", "submitter",
+        "submitter_url", "comment_count", "comments_url", "time", "_netloc")
+
+    id: int | None                # The Hacker News ID of a story.
+    number: int | str | None      # What rank the story is on HN.
+    title: str                    # The title of the story.
+    domain: str                   # The website the story is from.
+    url: str                      # The URL of the story.
+    score: int | str | None       # Current score of the story.
+    submitter: str | None         # The person that submitted the story.
+    submitter_url: str | None     # The submitter's user page.
+    comment_count: int | None     # How many comments the story has.
+    comments_url: str | None      # The HN link for commenting.
+    time: int | None              # Unix time the story was submitted.
+
+    def __init__(self) -> None:
+        self.id = None
+        self.number = None
+        self.title = ""
+        self.domain = ""
+        self.url = ""
+        self.score = None
+        self.submitter = ""
+        self.submitter_url = None
+        self.comment_count = None
+        self.comments_url = ""
+        self.time = None
+        self._netloc: str | None = None
 
     # Fields persisted to / restored from the JSON cache.
     _FIELDS = (
         "id", "number", "title", "domain", "url", "score", "submitter",
-        "submitter_url", "comment_count", "comments_url", "published_time")
+        "submitter_url", "comment_count", "comments_url", "time")
+
+    @property
+    def published_time(self) -> str:
+        """Relative age ("5 minutes ago"), computed when displayed."""
+        return _display_time(self.time)
+
+    @property
+    def netloc(self) -> str:
+        """Host part of `domain` for display, parsed once on first use."""
+        if self._netloc is None:
+            self._netloc = urlparse(self.domain or "").netloc
+        return self._netloc
+
+    @property
+    def rank_text(self) -> str:
+        """Rank column text: "12:", or "-" for an unranked story."""
+        return "-" if self.number is None else f"{self.number}:"
 
     def to_dict(self) -> dict:
         """Serialize to a plain dict for JSON storage."""
         return {field: getattr(self, field) for field in self._FIELDS}
 
     @classmethod
-    def from_dict(cls, data: dict) -> HackerNewsStory:
-        """Rebuild a story from a cached dict."""
+    def from_dict(
+        cls, data: dict, written_at: float | None = None,
+    ) -> HackerNewsStory:
+        """Rebuild a story from a cached dict.
+
+        Caches from before `time` was stored only hold the age string that
+        was current when they were written; given the write time
+        (`written_at`, Unix time) the epoch is recovered from it, to the
+        unit the string was rounded to.
+        """
         story = cls()
         for field in cls._FIELDS:
             setattr(story, field, data.get(field))
+        if story.time is None and written_at is not None:
+            age = _parse_relative_time(data.get('published_time') or "")
+            if age is not None:
+                story.time = int(written_at) - age
         return story
 
     def print_details(self) -> None:
@@ -345,19 +1049,32 @@ class HackerNewsUser:
     user_page_url: str = ""  # The URL of the user's 'user' page.
     threads_page_url: str = ""  # The URL of the user's 'threads' page.
 
-    def __init__(self, username: str) -> None:
+    def __init__(
+        self,
+        username: str,
+        karma: int | None = None,
+        api: HackerNewsAPI | None = None,
+    ) -> None:
         """
         Constructor for the user class.
+
+        Fetches the karma (blocking) through `api` unless it is given; for
+        many users at once use pyhn.users.UserService instead.
         """
         self.name = username
         self.user_page_url = USER_BASE + self.name
         self.threads_page_url = (
             f"https://news.ycombinator.com/threads?id={self.name}")
-        self.refresh_karma()
+        if karma is not None:
+            self.karma = karma
+        elif api is not None:
+            self.refresh_karma(api)
+        else:
+            raise TypeError("HackerNewsUser needs karma or an api to fetch it")
 
-    def refresh_karma(self) -> None:
-        """Fetch the user's karma from the API."""
-        data = HackerNewsAPI().fetch_json(f"{API_BASE}/user/{self.name}.json")
+    def refresh_karma(self, api: HackerNewsAPI) -> None:
+        """Fetch the user's karma through `api` (and its api_base)."""
+        data = api.fetch_json(f"{api.api_base}/user/{self.name}.json")
         if not data or 'karma' not in data:
             raise HNException("Error getting karma for user " + self.name)
         self.karma = int(data['karma'])
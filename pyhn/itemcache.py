@@ -0,0 +1,80 @@
+"""In-memory cache of raw API items, shared by every section.
+
+The top, best and newest lists overlap heavily, and the poller re-reads the
+same ids every few minutes. Keeping recently fetched items by id (for a short
+TTL, bounded in size with LRU eviction) turns most of those lookups into
+dictionary hits instead of round-trips.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+
+
+class ItemCache:
+    """Thread-safe LRU mapping of item id -> item dict, with a TTL.
+
+    A ttl or max_entries of 0 disables caching (every get is a miss).
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, item_id: int) -> dict | None:
+        """Return the cached item, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(item_id)
+            if entry is not None:
+                stored_at, item = entry
+                if self._clock() - stored_at < self.ttl:
+                    self._entries.move_to_end(item_id)
+                    self.hits += 1
+                    return item
+                del self._entries[item_id]
+            self.misses += 1
+            return None
+
+    def put(self, item_id: int, item: dict) -> None:
+        """Store an item, evicting the least recently used past the cap."""
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[item_id] = (self._clock(), item)
+            self._entries.move_to_end(item_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, item_ids: Iterable[int]) -> None:
+        """Drop the given ids so the next lookup refetches them."""
+        with self._lock:
+            for item_id in item_ids:
+                self._entries.pop(item_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters and current size, for measuring savings."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
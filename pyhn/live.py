@@ -0,0 +1,205 @@
+"""Live story lists over Firebase server-sent events.
+
+The API's list endpoints stream changes when requested with
+``Accept: text/event-stream``: a ``put`` of the whole list on connect, then
+``put``/``patch`` events for the indexes that change. LiveSection keeps one
+such connection open for the active section and hands the GUI only the ids
+that appeared or moved, replacing the fixed-interval Poller while it works.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import random
+from collections.abc import Iterable, Iterator
+from threading import Event, Thread
+from typing import TYPE_CHECKING, Any
+
+from pyhn import codec, hnapi
+from pyhn.hnapi import HNException
+from pyhn.ratelimit import BACKGROUND
+
+if TYPE_CHECKING:
+    from pyhn.gui import HNGui
+
+log = logging.getLogger(__name__)
+
+# Reconnect backoff (seconds): doubles per consecutive failure up to the cap.
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+# Consecutive failed connections before giving up and polling instead.
+MAX_FAILURES = 5
+# Firebase sends a keep-alive every 30s; anything much longer is a dead link.
+READ_TIMEOUT = 90
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[tuple[str, Any]]:
+    """Yield (event, decoded data) pairs from server-sent event lines."""
+    event = "message"
+    data: list[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, codec.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue
+        else:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event = value
+            elif field == "data":
+                data.append(value)
+
+
+def apply_event(ids: list[int], event: str, payload: Any) -> list[int]:
+    """Return the id list after a Firebase put/patch event."""
+    if event not in ("put", "patch") or not isinstance(payload, dict):
+        return ids
+    path = payload.get("path", "/").strip("/")
+    data = payload.get("data")
+    if event == "put" and not path:
+        if isinstance(data, dict):  # sparse arrays arrive as index maps
+            data = [data[k] for k in sorted(data, key=int)]
+        return [i for i in (data or []) if i is not None]
+
+    if event == "put":
+        updates = {path: data}
+    elif isinstance(data, dict):
+        updates = {f"{path}/{k}".strip("/"): v for k, v in data.items()}
+    else:
+        return ids
+    out: list[int | None] = list(ids)
+    for key, value in updates.items():
+        if not key.isdigit():
+            continue
+        index = int(key)
+        out.extend([None] * (index + 1 - len(out)))
+        out[index] = value
+    return [i for i in out if i is not None]
+
+
+def changed_ids(old: list[int], new: list[int]) -> set[int]:
+    """Ids in `new` that appeared or moved relative to the others in `old`.
+
+    An insertion shifts every rank below it without anything "moving", so
+    only ids outside the longest run kept in their old relative order count
+    as moved (longest increasing subsequence of old positions).
+    """
+    position = {item_id: pos for pos, item_id in enumerate(old)}
+    appeared = {i for i in new if i not in position}
+    kept = [i for i in new if i in position]
+
+    tails: list[int] = []         # smallest tail position per LIS length
+    tail_ids: list[int] = []      # index into `kept` of that tail
+    parent = [-1] * len(kept)
+    for k, item_id in enumerate(kept):
+        pos = position[item_id]
+        n = bisect.bisect_left(tails, pos)
+        if n == len(tails):
+            tails.append(pos)
+            tail_ids.append(k)
+        else:
+            tails[n] = pos
+            tail_ids[n] = k
+        parent[k] = tail_ids[n - 1] if n else -1
+
+    in_order = set()
+    k = tail_ids[-1] if tail_ids else -1
+    while k != -1:
+        in_order.add(kept[k])
+        k = parent[k]
+    return appeared | (set(kept) - in_order)
+
+
+class LiveSection(Thread):
+    """Streams one section's id list and pushes changes to the GUI.
+
+    Reconnects with jittered exponential backoff; after MAX_FAILURES
+    consecutive failed connections it calls gui.live_fallback() and exits so
+    the Poller can take over.
+    """
+
+    def __init__(
+        self,
+        gui: HNGui,
+        which: str,
+        backoff_base: float = BACKOFF_BASE,
+        max_failures: int = MAX_FAILURES,
+    ) -> None:
+        self.gui = gui
+        self.which = which
+        self.backoff_base = backoff_base
+        self.max_failures = max_failures
+        self._stop_event = Event()
+        self._response: Any = None
+        self._connected = False
+        super().__init__(daemon=True)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        response = self._response
+        if response is not None:
+            response.close()  # unblocks the pending read
+
+    def run(self) -> None:
+        failures = 0
+        while not self._stop_event.is_set():
+            self._connected = False
+            try:
+                self._stream()
+            except Exception:
+                log.debug("live %s stream error", self.which, exc_info=True)
+            if self._stop_event.is_set():
+                return
+            # A stream that delivered events before dropping is a normal
+            # reconnect, not a failure towards the fallback.
+            failures = 0 if self._connected else failures + 1
+            if failures >= self.max_failures:
+                log.warning(
+                    "live %s: %d failed connections, falling back to polling",
+                    self.which, failures)
+                self.gui.live_fallback()
+                return
+            delay = min(BACKOFF_MAX, self.backoff_base * 2 ** failures)
+            self._stop_event.wait(delay * random.uniform(0.5, 1.0))
+
+    def _stream(self) -> None:
+        """Follow the event stream until it ends or errors."""
+        api = self.gui.cache_manager.api
+        ids = [
+            s.id for s in self.gui.cache_manager.get_stories(self.which)
+            if s.id is not None]
+        # Reconnects count against the rate limit like any other request.
+        api.rate_limiter.acquire(BACKGROUND)
+        response = api.session.get(
+            hnapi._list_url(self.which, api.api_base),
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(hnapi.REQUEST_TIMEOUT, READ_TIMEOUT))
+        self._response = response
+        try:
+            if not response:
+                raise HNException(
+                    f"Error response ({response.status_code}) from live stream")
+            # chunk_size=1: a larger read would wait for that many bytes and
+            # hold back small events until more traffic arrives.
+            lines = response.iter_lines(chunk_size=1, decode_unicode=True)
+            for event, payload in parse_events(lines):
+                if self._stop_event.is_set():
+                    break
+                if event in ("cancel", "auth_revoked"):
+                    raise HNException(f"live stream closed by server: {event}")
+                self._connected = True
+                new = apply_event(ids, event, payload)
+                count = self.gui.cache_manager.expected_count()
+                if new[:count] != ids[:count]:
+                    changed = changed_ids(ids[:count], new[:count])
+                    log.debug("live %s: %d ids changed", self.which, len(changed))
+                    with api.background():
+                        self.gui.live_update(self.which, new, changed)
+                ids = new
+        finally:
+            self._response = None
+            response.close()
@@ -0,0 +1,111 @@
+"""Speculative comment prefetch for the story list.
+
+Opening a thread walks its comment tree level by level, which costs several
+round-trips. Once the focus rests on a story, CommentPrefetcher fetches the
+comment trees of that story and the next few rows in the background, one at
+a time, so Enter usually finds the thread already in memory. Moving the focus
+reschedules the queue and cancels the walk in progress at its next level.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyhn.hnapi import CommentRow, HackerNewsAPI
+
+log = logging.getLogger(__name__)
+
+# Prefetched threads kept in memory (least recently used dropped first).
+BUDGET = 20
+# Seconds a prefetched thread is served before it is considered stale.
+TTL = 120
+
+
+class CommentPrefetcher(threading.Thread):
+    """Single low-priority worker that prefetches comment trees.
+
+    One thread at a time, never more than `budget` kept, so it stays a
+    trickle next to foreground loads on the shared fetch pool.
+    """
+
+    def __init__(
+        self,
+        api: HackerNewsAPI,
+        max_comments: int,
+        budget: int = BUDGET,
+        ttl: float = TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.api = api
+        self.max_comments = max_comments
+        self.budget = budget
+        self.ttl = ttl
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queue: list[int] = []
+        self._gen = 0
+        self._stopped = False
+        self._done: OrderedDict[int, tuple[float, list[CommentRow]]] = OrderedDict()
+        super().__init__(daemon=True)
+
+    def schedule(self, story_ids: list[int]) -> None:
+        """Replace the queue with `story_ids`, cancelling work for others."""
+        with self._cond:
+            self._gen += 1
+            self._queue = [i for i in story_ids[:self.budget] if not self._fresh(i)]
+            self._cond.notify()
+
+    def get(self, story_id: int) -> list[CommentRow] | None:
+        """Return a prefetched thread if one is fresh, else None."""
+        with self._cond:
+            if not self._fresh(story_id):
+                return None
+            self._done.move_to_end(story_id)
+            return self._done[story_id][1]
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._gen += 1
+            self._cond.notify()
+
+    def _fresh(self, story_id: int) -> bool:
+        entry = self._done.get(story_id)
+        return entry is not None and self._clock() - entry[0] < self.ttl
+
+    def run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                story_id = self._queue.pop(0)
+                gen = self._gen
+
+            def cancelled(gen: int = gen) -> bool:
+                return self._gen != gen
+
+            try:
+                with self.api.background():
+                    comments = self.api.get_comments(
+                        story_id, self.max_comments, should_stop=cancelled)
+            except Exception:
+                log.debug("prefetch failed for story_id=%s", story_id,
+                          exc_info=True)
+                continue
+            with self._cond:
+                if cancelled():
+                    log.debug("prefetch of %s cancelled", story_id)
+                    continue
+                self._done[story_id] = (self._clock(), comments)
+                self._done.move_to_end(story_id)
+                while len(self._done) > self.budget:
+                    self._done.popitem(last=False)
+            log.debug("prefetched %d comments for story_id=%s",
+                      len(comments), story_id)
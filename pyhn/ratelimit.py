@@ -0,0 +1,90 @@
+"""Global token-bucket cap on the outbound request rate.
+
+The adaptive concurrency limit bounds how many requests are in flight, not
+how many are sent per second: with fast responses the poller, comment loads
+and prefetches together can still burst hard enough to get throttled on a
+shared egress IP. RateLimiter is one bucket shared by every request of a
+HackerNewsAPI, with two lanes: background work (poller refreshes,
+prefetches, live updates) only takes a token when no foreground request is
+waiting for one.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+FOREGROUND = "foreground"
+BACKGROUND = "background"
+LANES = (FOREGROUND, BACKGROUND)
+
+
+class RateLimiter:
+    """Token bucket refilled at `rate` tokens/s, holding at most `burst`.
+
+    A rate of 0 disables limiting (acquire returns at once), but waits are
+    still counted so the metrics stay comparable.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._stamp = clock()
+        self._cond = threading.Condition()
+        self._waiting = dict.fromkeys(LANES, 0)
+        self._acquired = dict.fromkeys(LANES, 0)
+        self._wait_total = dict.fromkeys(LANES, 0.0)
+        self._wait_max = dict.fromkeys(LANES, 0.0)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self, lane: str = FOREGROUND) -> float:
+        """Block until a token is free for `lane`; return the seconds waited."""
+        start = self._clock()
+        with self._cond:
+            if self.rate > 0:
+                self._waiting[lane] += 1
+                try:
+                    while True:
+                        self._refill(self._clock())
+                        blocked = (
+                            lane == BACKGROUND and self._waiting[FOREGROUND])
+                        if self._tokens >= 1 and not blocked:
+                            self._tokens -= 1
+                            break
+                        # Sleep until the next token (or until woken because
+                        # a foreground waiter left).
+                        self._cond.wait(
+                            max((1 - self._tokens) / self.rate, 0.001))
+                finally:
+                    self._waiting[lane] -= 1
+                    self._cond.notify_all()
+            waited = self._clock() - start
+            self._acquired[lane] += 1
+            self._wait_total[lane] += waited
+            self._wait_max[lane] = max(self._wait_max[lane], waited)
+        return waited
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per lane: tokens taken, total/mean/max seconds spent waiting."""
+        with self._cond:
+            return {
+                lane: {
+                    "acquired": self._acquired[lane],
+                    "wait_total": self._wait_total[lane],
+                    "wait_mean": (
+                        self._wait_total[lane] / self._acquired[lane]
+                        if self._acquired[lane] else 0.0),
+                    "wait_max": self._wait_max[lane],
+                }
+                for lane in LANES}
@@ -0,0 +1,66 @@
+"""Request coalescing: concurrent calls for one key share a single call.
+
+The poller, a manual refresh and a section switch can ask for the same list
+endpoint or item at the same moment from different threads. SingleFlight lets
+the first caller do the work while the others wait for and reuse its result
+(or its exception), instead of sending duplicate requests.
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+R = TypeVar("R")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key (e.g. a URL)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.executed = 0   # calls that actually ran
+        self.coalesced = 0  # calls answered by another caller's result
+
+    def do(self, key: str, fn: Callable[[], R]) -> R:
+        """Run fn() once for all concurrent callers with the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced}
@@ -0,0 +1,368 @@
+"""Local stand-in for the Hacker News Firebase API, with fault injection.
+
+Serves the endpoints pyhn uses (``/v0/<list>stories.json``,
+``/v0/item/<id>.json``, ``/v0/user/<id>.json``, ``/v0/maxitem.json`` and
+``/v0/updates.json``) from synthetic data or from a pyhn.transport archive,
+over plain keep-alive HTTP. Faults are injected per request: latency drawn
+from a distribution, 5xx answers, stalled connections that never answer,
+and bodies cut off mid-way. Point pyhn at it with the ``api_base`` setting.
+
+    python -m pyhn.standin [--port 8000] [--stories 500] [--archive FILE]
+        [--latency lognormal:0.05,0.5] [--error-rate 0.02]
+        [--stall-rate 0.01] [--disconnect-rate 0.01] [--seed 1]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+from pyhn import codec
+
+# Seconds a stalled request holds its connection before it is dropped
+# (longer than the client's REQUEST_TIMEOUT, so the client gives up first).
+STALL = 30.0
+ERROR_STATUSES = (500, 502, 503)
+LIST_NAMES = ("top", "new", "best", "ask", "show", "job")
+
+Latency = Callable[[random.Random], float]
+
+
+def parse_latency(spec: str) -> Latency:
+    """Build a latency sampler (seconds) from a ``kind:params`` spec.
+
+    ``constant:S``, ``uniform:LOW,HIGH``, ``normal:MEAN,STDDEV``,
+    ``lognormal:MEDIAN,SIGMA`` or ``exponential:MEAN``; negative samples
+    are clamped to 0. Raises ValueError for anything else.
+    """
+    kind, _, params = spec.partition(":")
+    try:
+        args = [float(p) for p in params.split(",")] if params else []
+    except ValueError:
+        raise ValueError(f"Bad latency spec {spec!r}") from None
+    samplers: dict[str, tuple[int, Latency]] = {
+        "constant": (1, lambda rng: args[0]),
+        "uniform": (2, lambda rng: rng.uniform(args[0], args[1])),
+        "normal": (2, lambda rng: rng.gauss(args[0], args[1])),
+        "lognormal": (2, lambda rng: rng.lognormvariate(
+            math.log(args[0]), args[1]) if args[0] > 0 else 0.0),
+        "exponential": (1, lambda rng: rng.expovariate(1 / args[0])
+                        if args[0] > 0 else 0.0),
+    }
+    if kind not in samplers or len(args) != samplers[kind][0]:
+        raise ValueError(
+            f"Bad latency spec {spec!r}: one of constant:S, uniform:LOW,HIGH, "
+            "normal:MEAN,STDDEV, lognormal:MEDIAN,SIGMA, exponential:MEAN")
+    sample = samplers[kind][1]
+    return lambda rng: max(sample(rng), 0.0)
+
+
+class Dataset:
+    """Request path -> encoded JSON body, for everything the stand-in serves.
+
+    Any other path under /v0 answers ``null``, as Firebase does for an id
+    that does not exist.
+    """
+
+    def __init__(self, payloads: dict[str, Any]) -> None:
+        self._bodies = {path: codec.dumps(p) for path, p in payloads.items()}
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def get(self, path: str) -> bytes | None:
+        path = urlsplit(path).path
+        body = self._bodies.get(path)
+        if body is None and path.startswith("/v0/"):
+            return b"null"
+        return body
+
+    @classmethod
+    def synthetic(
+        cls,
+        stories: int = 500,
+        comments: int = 40,
+        seed: int = 0,
+        now: float | None = None,
+    ) -> Dataset:
+        """A front page of `stories` stories with up to `comments` comments
+        each (in nested threads), their authors, the lists and updates."""
+        rng = random.Random(seed)
+        now = time.time() if now is None else now
+        payloads: dict[str, Any] = {}
+        users: set[str] = set()
+        next_id = stories + 1
+        items: list[dict] = []
+        for story_id in range(1, stories + 1):
+            kind = rng.choices(("story", "ask", "show", "job"), (16, 2, 2, 1))[0]
+            by = f"user{rng.randrange(stories // 4 + 1)}"
+            users.add(by)
+            story: dict[str, Any] = {
+                "id": story_id, "type": "job" if kind == "job" else "story",
+                "by": by, "time": int(now - rng.uniform(60, 86400)),
+                "title": f"{kind.title()} HN: synthetic story {story_id}"
+                if kind in ("ask", "show") else f"Synthetic story {story_id}",
+                "score": rng.randrange(1, 1000), "_kind": kind,
+            }
+            if kind != "ask":
+                story["url"] = f"https://example.com/{story_id}"
+            if kind != "job":
+                # Random tree: each new comment replies to the story or to
+                # an earlier comment of the same thread.
+                parents: list[dict] = [story]
+                for _ in range(rng.randrange(comments + 1)):
+                    parent = rng.choice(parents)
+                    author = f"user{rng.randrange(stories // 4 + 1)}"
+                    users.add(author)
+                    comment = {
+                        "id": next_id, "type": "comment", "by": author,
+                        "parent": parent["id"],
+                        "time": story["time"] + rng.randrange(60, 7200),
+                        "text": f"Comment {next_id} &amp; <i>reply</i>"
+                                "<p>Second paragraph.",
+                    }
+                    next_id += 1
+                    parent.setdefault("kids", []).append(comment["id"])
+                    parents.append(comment)
+                    items.append(comment)
+                story["descendants"] = len(parents) - 1
+            items.append(story)
+        stories_only = [i for i in items if "_kind" in i]
+        lists = {
+            "top": sorted(stories_only, key=lambda s: -s["score"] / (
+                (now - s["time"]) / 3600 + 2) ** 1.8),
+            "new": sorted(stories_only, key=lambda s: -s["time"]),
+            "best": sorted(stories_only, key=lambda s: -s["score"]),
+        }
+        for name in ("ask", "show", "job"):
+            lists[name] = [s for s in lists["new"] if s["_kind"] == name]
+        for name in LIST_NAMES:
+            payloads[f"/v0/{name}stories.json"] = [s["id"] for s in lists[name]]
+        for item in items:
+            item.pop("_kind", None)
+            payloads[f"/v0/item/{item['id']}.json"] = item
+        for name in users:
+            payloads[f"/v0/user/{name}.json"] = {
+                "id": name, "karma": rng.randrange(1, 50000),
+                "created": int(now - rng.uniform(86400, 86400 * 3650))}
+        payloads["/v0/maxitem.json"] = next_id - 1
+        payloads["/v0/updates.json"] = {
+            "items": rng.sample(range(1, next_id), min(30, next_id - 1)),
+            "profiles": rng.sample(sorted(users), min(10, len(users)))}
+        return cls(payloads)
+
+    @classmethod
+    def from_archive(cls, path: str) -> Dataset:
+        """The responses of a pyhn.transport archive, by URL path (the last
+        recording of a path wins)."""
+        with open(path, "rb") as f:
+            archive = codec.loads(f.read())
+        payloads = {}
+        for entry in archive["entries"]:
+            if entry["status"] < 400:
+                payloads[urlsplit(entry["url"]).path] = codec.loads(entry["body"])
+        return cls(payloads)
+
+
+class Faults:
+    """What can go wrong with a request, and how often.
+
+    Each request first waits a `latency` sample, then fails with probability
+    `error_rate` (a 5xx), `stall_rate` (no answer for `stall` seconds, then
+    the connection is dropped) or `disconnect_rate` (the body is cut off
+    half-way). `seed` makes the sequence of faults repeatable.
+    """
+
+    def __init__(
+        self,
+        latency: str = "constant:0",
+        error_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        disconnect_rate: float = 0.0,
+        stall: float = STALL,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.disconnect_rate = disconnect_rate
+        self.stall = stall
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[float, str | None, int]:
+        """(delay, fault, error status) for the next request; fault is None,
+        "error", "stall" or "disconnect"."""
+        with self._lock:
+            delay = self.latency(self._random)
+            roll = self._random.random()
+            status = self._random.choice(ERROR_STATUSES)
+        fault = None
+        for name, rate in (("error", self.error_rate),
+                           ("stall", self.stall_rate),
+                           ("disconnect", self.disconnect_rate)):
+            if roll < rate:
+                fault = name
+                break
+            roll -= rate
+        return delay, fault, status
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # pyhn opens up to WORKER_LIMIT connections at once; with the default
+    # backlog of 5 the kernel drops SYNs and each retry adds ~1s that was
+    # never injected.
+    request_queue_size = 128
+    standin: StandIn
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+    # Headers and body are separate writes; with Nagle on, a reused
+    # connection would wait out the client's delayed ACK between them.
+    disable_nagle_algorithm = True
+    server: _Server
+
+    def do_GET(self) -> None:
+        standin = self.server.standin
+        delay, fault, status = standin.faults.draw()
+        standin._count("requests")
+        if delay and standin._stopped.wait(delay):
+            return
+        if fault == "stall":
+            standin._count("stalls")
+            standin._stopped.wait(standin.faults.stall)
+            self.close_connection = True
+            return
+        if fault == "error":
+            standin._count("errors")
+            self._send(status, codec.dumps(
+                {"error": "injected failure"}))
+            return
+        body = standin.dataset.get(self.path)
+        if body is None:
+            self._send(404, codec.dumps({"error": "Not found"}))
+            return
+        if fault == "disconnect":
+            standin._count("disconnects")
+            self._send(200, body, cut=True)
+            return
+        self._send(200, body)
+
+    def _send(self, status: int, body: bytes, cut: bool = False) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if cut:
+            # Promise the full length, send half, hang up.
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class StandIn:
+    """The stand-in server, run on a background thread.
+
+    Use as ``with StandIn(dataset, faults) as api_base:`` or call
+    ``start()`` / ``stop()``; ``port=0`` picks a free port.
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset | None = None,
+        faults: Faults | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.dataset = Dataset.synthetic() if dataset is None else dataset
+        self.faults = Faults() if faults is None else faults
+        self._server = _Server((host, port), _Handler)
+        self._server.standin = self
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            ("requests", "errors", "stalls", "disconnects"), 0)
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/v0"
+
+    def start(self) -> str:
+        threading.Thread(
+            target=self._server.serve_forever, name="pyhn-standin",
+            daemon=True).start()
+        return self.api_base
+
+    def stop(self) -> None:
+        self._stopped.set()  # wakes stalled and delayed requests
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        """Requests served and faults injected so far."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--archive", help="serve a pyhn.transport archive")
+    parser.add_argument("--stories", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=40,
+                        help="most comments per synthetic story")
+    parser.add_argument("--latency", default="constant:0")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall", type=float, default=STALL)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.archive:
+        dataset = Dataset.from_archive(args.archive)
+    else:
+        dataset = Dataset.synthetic(
+            args.stories, args.comments, seed=args.seed or 0)
+    faults = Faults(
+        args.latency, args.error_rate, args.stall_rate, args.disconnect_rate,
+        args.stall, args.seed)
+    standin = StandIn(dataset, faults, args.host, args.port)
+    print(f"Serving {len(dataset)} paths; set api_base = {standin.start()}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.stop()
+        print(standin.stats())
+
+
+if __name__ == "__main__":
+    main()
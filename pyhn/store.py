@@ -0,0 +1,447 @@
+"""Section storage behind CacheManager.
+
+A store keeps, per section ("top", "ask", ...), the cached stories as
+HackerNewsStory.to_dict() rows in rank order plus the time it was written
+(an ISO date string). Three backends:
+
+- ShardedJSONStore (the default): one JSON file per section plus an index
+  of write times, each read lazily;
+- JSONStore: every section in one JSON file, the historical format;
+- SQLiteStore: a WAL-mode database with tables for sections, ranks and
+  items, so a freshness check is one indexed lookup and a refresh writes
+  only the rows that changed.
+
+The sharded and SQLite stores import an existing cache on first use.
+"""
+from __future__ import annotations
+
+import contextlib
+import datetime
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from pyhn import codec
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, just unlocked
+    fcntl = None  # type: ignore[assignment]
+
+log = logging.getLogger(__name__)
+
+BACKENDS = ("sharded", "json", "sqlite")
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive advisory lock on `path` (created if missing).
+
+    Serializes read-modify-write cycles across pyhn processes sharing a
+    cache (and across threads, each taking its own open file).
+    """
+    with open(path, "ab") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def write_atomic(path: str, value: Any) -> None:
+    """Write `value` as JSON to `path` atomically: temp file in the same
+    directory, fsync, rename, so a reader never sees a truncated file and a
+    crash mid-write keeps the previous one."""
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=".pyhn-cache-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(codec.dumps(value))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def _newer(date: str, than: str) -> bool:
+    return datetime.datetime.fromisoformat(date) > datetime.datetime.fromisoformat(than)
+
+
+class _JSONFile:
+    """One JSON file, parsed once and cached while it is unchanged.
+
+    The parsed value is only read again when the file's mtime, size or
+    inode changed (another process wrote it), so repeated reads cost one
+    stat() each. Writes replace the file atomically (see write_atomic).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._value: dict = {}
+        self._stamp: tuple[int, int, int] | None = None
+        self.parses = 0  # full reads of the file, for tests and benchmarks
+
+    def _file_stamp(self) -> tuple[int, int, int] | None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self) -> dict:
+        """The parsed file ({} if missing or unreadable); shared, so callers
+        must not modify it."""
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp != self._stamp:
+                self._stamp = stamp
+                self._value = self._parse() if stamp is not None else {}
+            return self._value
+
+    def _parse(self) -> dict:
+        self.parses += 1
+        try:
+            with open(self.path, "rb") as f:
+                value = codec.loads(f.read())
+        except (OSError, ValueError, UnicodeDecodeError):
+            return {}
+        return value if isinstance(value, dict) else {}
+
+    def write(self, value: dict) -> None:
+        write_atomic(self.path, value)
+        with self._lock:
+            self._value = value
+            self._stamp = self._file_stamp()
+
+
+class JSONStore:
+    """All sections in one JSON file (rewritten whole), the format before
+    the sharded store.
+
+    An unreadable file includes a legacy pickle cache from older versions;
+    it is simply treated as empty and rebuilt on refresh. Writes are safe
+    with several pyhn processes on one cache (a shared HOME): each is a
+    read-merge-write under an advisory lock on ``<path>.lock``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = _JSONFile(path)
+
+    @property
+    def parses(self) -> int:
+        return self._file.parses
+
+    def sections(self) -> dict[str, dict]:
+        """Every cached section: name -> {'stories': [...], 'date': ...}."""
+        return self._file.load()
+
+    def get(self, which: str) -> dict | None:
+        """A section's {'stories': [...], 'date': ...}, or None."""
+        return self._file.load().get(which) or None
+
+    def written_at(self, which: str) -> str | None:
+        """When a section was last written (ISO date), or None."""
+        entry = self.get(which)
+        return entry['date'] if entry else None
+
+    def put(self, which: str, stories: list[dict], date: str) -> None:
+        """Write one section, keeping the others.
+
+        The file is re-read under the lock, so sections other processes
+        wrote meanwhile are kept; if one of them already wrote a newer copy
+        of this section, that copy wins and nothing is written.
+        """
+        with _file_lock(self.path + ".lock"):
+            cache = dict(self._file.load())
+            current = cache.get(which)
+            if current and _newer(current['date'], date):
+                log.debug("kept newer %s section written by another process",
+                          which)
+                return
+            cache[which] = {'stories': stories, 'date': date}
+            self._file.write(cache)
+
+    def close(self) -> None:
+        pass
+
+
+class ShardedJSONStore:
+    """One JSON file per section plus an index of write times, in the
+    directory ``<path>.d``.
+
+    Files are read lazily and cached like JSONStore's: a freshness check
+    reads only the (small) index, showing a section reads only its shard,
+    and a refresh rewrites only its shard and the index. Writes take the
+    same advisory lock and atomic replace as JSONStore. A single-file cache
+    at `path` is split into shards the first time the store is used.
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.directory = f"{path}.d"
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_path = os.path.join(self.directory, ".lock")
+        self._index = _JSONFile(os.path.join(self.directory, self.INDEX))
+        self._shards: dict[str, _JSONFile] = {}
+        self._shards_lock = threading.Lock()
+        if not os.path.exists(self._index.path) and os.path.exists(path):
+            self._import(path)
+
+    def _import(self, json_path: str) -> None:
+        with _file_lock(self._lock_path):
+            if os.path.exists(self._index.path):
+                return  # another process got there first
+            sections = JSONStore(json_path).sections()
+            for which, entry in sections.items():
+                if entry and 'date' in entry:
+                    self._shard(which).write(entry)
+            self._index.write({
+                which: entry['date'] for which, entry in sections.items()
+                if entry and 'date' in entry})
+        log.info("split %d sections from %s into %s",
+                 len(sections), json_path, self.directory)
+
+    def _shard(self, which: str) -> _JSONFile:
+        with self._shards_lock:
+            shard = self._shards.get(which)
+            if shard is None:
+                name = re.sub(r"[^A-Za-z0-9_-]", "_", which) + ".json"
+                shard = _JSONFile(os.path.join(self.directory, name))
+                self._shards[which] = shard
+            return shard
+
+    @property
+    def parses(self) -> int:
+        with self._shards_lock:
+            shards = list(self._shards.values())
+        return self._index.parses + sum(s.parses for s in shards)
+
+    def sections(self) -> dict[str, dict]:
+        return {which: entry for which in self._index.load()
+                if (entry := self.get(which)) is not None}
+
+    def written_at(self, which: str) -> str | None:
+        return self._index.load().get(which)
+
+    def get(self, which: str) -> dict | None:
+        if which not in self._index.load():
+            return None
+        entry = self._shard(which).load()
+        return entry if 'date' in entry else None
+
+    def put(self, which: str, stories: list[dict], date: str) -> None:
+        """Write one section's shard and its index entry, keeping a newer
+        copy another process wrote meanwhile (as JSONStore.put)."""
+        with _file_lock(self._lock_path):
+            index = dict(self._index.load())
+            current = index.get(which)
+            if current and _newer(current, date):
+                log.debug("kept newer %s section written by another process",
+                          which)
+                return
+            self._shard(which).write({'stories': stories, 'date': date})
+            index[which] = date
+            self._index.write(index)
+
+    def close(self) -> None:
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    name TEXT PRIMARY KEY,
+    written_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ranks (
+    section TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    item_id INTEGER,
+    number,
+    data BLOB,
+    PRIMARY KEY (section, rank)
+);
+CREATE INDEX IF NOT EXISTS ranks_item ON ranks (item_id);
+"""
+
+
+class SQLiteStore:
+    """Sections in SQLite: `sections` (write times), `items` (one row per
+    story id, shared by every section listing it) and `ranks` (a section's
+    order, with its per-section rank number).
+
+    One connection guarded by a lock serves every thread; WAL mode lets
+    another pyhn process read while this one writes. `import_from` names a
+    JSON cache to import when the database has no sections yet.
+    """
+
+    def __init__(self, path: str, import_from: str | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        if import_from is not None:
+            self._import(import_from)
+
+    def _import(self, json_path: str) -> None:
+        """Import the JSON cache at `json_path` (sharded or single-file)."""
+        (count,) = self._db.execute("SELECT COUNT(*) FROM sections").fetchone()
+        if count:
+            return
+        if os.path.isdir(f"{json_path}.d"):
+            sections = ShardedJSONStore(json_path).sections()
+        elif os.path.exists(json_path):
+            sections = JSONStore(json_path).sections()
+        else:
+            return
+        for which, entry in sections.items():
+            if entry and 'date' in entry:
+                self.put(which, entry.get('stories', []), entry['date'])
+        log.info("imported %d sections from %s", len(sections), json_path)
+
+    def sections(self) -> dict[str, dict]:
+        with self._lock:
+            names = [row[0] for row in self._db.execute(
+                "SELECT name FROM sections ORDER BY name")]
+        return {name: entry for name in names
+                if (entry := self.get(name)) is not None}
+
+    def written_at(self, which: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT written_at FROM sections WHERE name = ?",
+                (which,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, which: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT written_at FROM sections WHERE name = ?",
+                (which,)).fetchone()
+            if row is None:
+                return None
+            rows = self._db.execute(
+                "SELECT ranks.number, ranks.data, items.data FROM ranks "
+                "LEFT JOIN items ON items.id = ranks.item_id "
+                "WHERE ranks.section = ? ORDER BY ranks.rank",
+                (which,)).fetchall()
+        stories = []
+        for number, inline, shared in rows:
+            story = codec.loads(shared if inline is None else inline)
+            story['number'] = number
+            stories.append(story)
+        return {'stories': stories, 'date': row[0]}
+
+    def put(self, which: str, stories: list[dict], date: str) -> None:
+        """Write one section in a transaction, touching only changed rows."""
+        new_ranks: list[tuple[Any, Any, bytes | None]] = []
+        blobs: dict[int, bytes] = {}
+        for story in stories:
+            item = {k: v for k, v in story.items() if k != 'number'}
+            blob = codec.dumps(item)
+            if story.get('id') is None:
+                # No id to share the row under (never from the API).
+                new_ranks.append((None, story.get('number'), blob))
+            else:
+                blobs[story['id']] = blob
+                new_ranks.append((story['id'], story.get('number'), None))
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_items(blobs)
+                self._write_ranks(which, new_ranks)
+                self._db.execute(
+                    "INSERT INTO sections (name, written_at) VALUES (?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET written_at = excluded.written_at",
+                    (which, date))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _write_items(self, blobs: dict[int, bytes]) -> None:
+        current: dict[int, bytes] = {}
+        ids = list(blobs)
+        for start in range(0, len(ids), 500):  # SQLite parameter limit
+            chunk = ids[start:start + 500]
+            current.update(self._db.execute(
+                f"SELECT id, data FROM items WHERE id IN "
+                f"({','.join('?' * len(chunk))})", chunk).fetchall())
+        changed = [(item_id, blob) for item_id, blob in blobs.items()
+                   if current.get(item_id) != blob]
+        if changed:
+            self._db.executemany(
+                "INSERT INTO items (id, data) VALUES (?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET data = excluded.data", changed)
+
+    def _write_ranks(
+        self, which: str, new_ranks: list[tuple[Any, Any, bytes | None]],
+    ) -> None:
+        current = self._db.execute(
+            "SELECT rank, item_id, number, data FROM ranks WHERE section = ?",
+            (which,)).fetchall()
+        old = {rank: (item_id, number, data)
+               for rank, item_id, number, data in current}
+        changed = [(which, rank, *row) for rank, row in enumerate(new_ranks)
+                   if old.get(rank) != row]
+        if changed:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO ranks "
+                "(section, rank, item_id, number, data) VALUES (?, ?, ?, ?, ?)",
+                changed)
+        if len(old) > len(new_ranks):
+            self._db.execute(
+                "DELETE FROM ranks WHERE section = ? AND rank >= ?",
+                (which, len(new_ranks)))
+        # Items this section dropped that no other section lists.
+        dropped = ({row[0] for row in old.values()}
+                   - {row[0] for row in new_ranks} - {None})
+        if dropped:
+            self._db.executemany(
+                "DELETE FROM items WHERE id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM ranks WHERE ranks.item_id = items.id)",
+                [(item_id,) for item_id in dropped])
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+Store = ShardedJSONStore | JSONStore | SQLiteStore
+
+
+def open_store(backend: str, path: str) -> Store:
+    """The store for the `cache_backend` setting, at the `cache` path.
+
+    The shards live in ``<path>.d`` and the SQLite database in
+    ``<path>.db``; both import the existing cache the first time they are
+    opened.
+    """
+    if backend == "sharded":
+        return ShardedJSONStore(path)
+    if backend == "json":
+        return JSONStore(path)
+    if backend == "sqlite":
+        return SQLiteStore(f"{path}.db", import_from=path)
+    raise ValueError(
+        f"Unknown cache backend {backend!r}: one of {', '.join(BACKENDS)}")
@@ -0,0 +1,141 @@
+"""Record and replay of API traffic, for offline, repeatable benchmarks.
+
+HackerNewsAPI sends every GET through its ``transport``: any object with a
+``requests.Session``-style ``get(url, timeout=...)`` whose response has
+``status_code``, ``content``, truthiness and ``close()``. By default that is
+the session itself. RecordingTransport wraps it and keeps each URL, status,
+body and latency, and ``save`` writes them to a JSON archive. ReplayTransport
+serves such an archive with no network, optionally adding latency and
+jitter (or replaying the recorded latencies).
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pyhn import codec
+
+ARCHIVE_VERSION = 1
+
+
+class Recorded:
+    """A response read back from an archive (the parts pyhn uses)."""
+
+    __slots__ = ("url", "status_code", "content", "elapsed")
+
+    def __init__(
+        self, url: str, status_code: int, content: bytes, elapsed: float,
+    ) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.elapsed = elapsed
+
+    def __bool__(self) -> bool:
+        return self.status_code < 400
+
+    def close(self) -> None:
+        pass
+
+
+class RecordingTransport:
+    """Pass requests through to `transport` and keep what came back."""
+
+    def __init__(
+        self, transport: Any, clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.transport = transport
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.entries: list[Recorded] = []
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        start = self._clock()
+        response = self.transport.get(url, **kwargs)
+        entry = Recorded(url, response.status_code, response.content,
+                         self._clock() - start)
+        with self._lock:
+            self.entries.append(entry)
+        return response
+
+    def save(self, path: str) -> None:
+        """Write the archive: every exchange so far, in arrival order."""
+        with self._lock:
+            entries = [
+                {"url": e.url, "status": e.status_code,
+                 "body": e.content.decode("utf-8", "replace"),
+                 "elapsed": round(e.elapsed, 6)}
+                for e in self.entries]
+        with open(path, "wb") as f:
+            f.write(codec.dumps({"version": ARCHIVE_VERSION, "entries": entries}))
+
+
+class ReplayTransport:
+    """Serve recorded responses by URL, never touching the network.
+
+    A URL recorded several times (e.g. a list fetched again by a refresh) is
+    answered with its recordings in order, the last one repeating. Each
+    answer is delayed by `latency` seconds, or by its recorded latency with
+    `recorded_latency`, plus a uniform +-`jitter`; `seed` makes the jitter
+    repeatable. A URL missing from the archive raises LookupError, which the
+    API reports like any failed request.
+    """
+
+    def __init__(
+        self,
+        entries: list[Recorded],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        recorded_latency: bool = False,
+        seed: int | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.recorded_latency = recorded_latency
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._responses: dict[str, list[Recorded]] = {}
+        for entry in entries:
+            self._responses.setdefault(entry.url, []).append(entry)
+        self._served: dict[str, int] = {}
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> ReplayTransport:
+        """Read an archive written by RecordingTransport.save."""
+        with open(path, "rb") as f:
+            archive = codec.loads(f.read())
+        if archive.get("version") != ARCHIVE_VERSION:
+            raise ValueError(
+                f"Unsupported archive version {archive.get('version')!r} "
+                f"in {path}")
+        entries = [
+            Recorded(e["url"], e["status"], e["body"].encode(), e["elapsed"])
+            for e in archive["entries"]]
+        return cls(entries, **kwargs)
+
+    def urls(self) -> list[str]:
+        return list(self._responses)
+
+    def get(self, url: str, **kwargs: Any) -> Recorded:
+        with self._lock:
+            responses = self._responses.get(url)
+            if not responses:
+                raise LookupError(f"{url} is not in the replay archive")
+            served = self._served.get(url, 0)
+            self._served[url] = served + 1
+            response = responses[min(served, len(responses) - 1)]
+            delay = self._delay(response)
+        if delay > 0:
+            self._sleep(delay)
+        return response
+
+    def _delay(self, response: Recorded) -> float:
+        base = response.elapsed if self.recorded_latency else self.latency
+        if self.jitter:
+            base += self._random.uniform(-self.jitter, self.jitter)
+        return max(base, 0.0)
@@ -0,0 +1,100 @@
+"""Batched, cached user profile lookups.
+
+The API has one endpoint per user, so showing karma for a section's
+submitters is one request per name. UserService fetches a batch of names
+concurrently on the shared fetch pool and keeps the profiles for a TTL, so
+the story list can show karma once it is known without ever waiting on it.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+from pyhn.hnapi import HackerNewsAPI, HackerNewsUser
+
+log = logging.getLogger(__name__)
+
+# Seconds a fetched profile is reused; karma moves slowly.
+USER_CACHE_TTL = 30 * 60
+
+
+class UserService:
+    """Thread-safe name -> HackerNewsUser cache filled in batches."""
+
+    def __init__(
+        self,
+        api: HackerNewsAPI,
+        ttl: float = USER_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.api = api
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._users: dict[str, tuple[float, HackerNewsUser]] = {}
+
+    def cached(self, name: str) -> HackerNewsUser | None:
+        """The cached profile if still fresh; never fetches."""
+        with self._lock:
+            entry = self._users.get(name)
+        if entry is None or self._clock() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def karma(self, name: str | None) -> int | None:
+        """Cached karma for `name`, or None if unknown (never blocks)."""
+        user = self.cached(name) if name else None
+        return None if user is None else user.karma
+
+    def get_many(self, names: Iterable[str]) -> dict[str, HackerNewsUser]:
+        """Profiles for `names`, fetching the uncached ones concurrently.
+
+        Names that fail to load are left out of the result (and retried on
+        the next call).
+        """
+        wanted = list(dict.fromkeys(name for name in names if name))
+        found = {}
+        missing = []
+        for name in wanted:
+            user = self.cached(name)
+            if user is None:
+                missing.append(name)
+            else:
+                found[name] = user
+        if missing:
+            log.debug("fetching %d user profiles", len(missing))
+            now = self._clock()
+            for name, data in zip(
+                    missing, self.api.fetch_users(missing), strict=True):
+                if not data or 'karma' not in data:
+                    continue
+                user = HackerNewsUser(name, karma=int(data['karma']))
+                found[name] = user
+                with self._lock:
+                    self._users[name] = (now, user)
+        return found
+
+    def prefetch(
+        self,
+        names: Iterable[str],
+        done: Callable[[], None] | None = None,
+    ) -> threading.Thread:
+        """get_many in a background thread, then call `done` (if given)."""
+        names = list(names)
+
+        def run() -> None:
+            try:
+                with self.api.background():
+                    self.get_many(names)
+            except Exception:
+                # Worker-thread boundary (e.g. the pool shut down on quit).
+                log.debug("user prefetch failed", exc_info=True)
+                return
+            if done is not None:
+                done()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,93 @@
+"""AsyncHackerNewsAPI tests: the same canned items as test_hnapi, no network.
+
+_request (the raw GET) is monkeypatched with a coroutine, so httpx is never
+imported and the semaphore in fetch_json stays in the path.
+"""
+import asyncio
+
+from pyhn.aiohnapi import AsyncHackerNewsAPI
+
+ITEMS = {
+    1: {"id": 1, "type": "story", "by": "alice", "time": 1175714200,
+        "title": "First &amp; foremost", "url": "https://example.com/a",
+        "score": 100, "descendants": 12},
+    2: {"id": 2, "type": "story", "by": "bob", "time": 1175714200,
+        "title": "Ask HN: no url here", "score": 5, "descendants": 3},
+    3: {"id": 3, "type": "job", "by": "corp", "time": 1175714200,
+        "title": "We are hiring", "url": "", "score": 1},
+    4: {"id": 4, "type": "story", "deleted": True},  # filtered
+    5: {"id": 5, "type": "story", "dead": True, "title": "spam"},  # filtered
+}
+TOP_IDS = [1, 2, 3, 4, 5]
+
+COMMENT_ITEMS = {
+    100: {"id": 100, "type": "story", "kids": [200, 201]},
+    200: {"id": 200, "type": "comment", "by": "alice", "time": 1175714200,
+          "text": "top &amp; level", "kids": [300]},
+    300: {"id": 300, "type": "comment", "by": "bob", "time": 1175714200,
+          "text": "<p>reply"},
+    201: {"id": 201, "type": "comment", "deleted": True, "time": 1175714200},
+}
+
+
+def _api(monkeypatch, ids=TOP_IDS, items=ITEMS, **kwargs):
+    api = AsyncHackerNewsAPI(**kwargs)
+
+    async def fake_request(url):
+        await asyncio.sleep(0)
+        if url.endswith("topstories.json"):
+            return ids
+        item_id = int(url.split("/item/")[1].split(".json")[0])
+        return items.get(item_id)
+
+    monkeypatch.setattr(api, "_request", fake_request)
+    return api
+
+
+def test_get_stories_matches_sync_client(monkeypatch):
+    stories = asyncio.run(_api(monkeypatch).get_stories("top", extra_page=0))
+    assert [s.id for s in stories] == [1, 2, 3]
+    assert [s.number for s in stories] == [1, 2, 3]
+    assert stories[0].title == "First & foremost"
+
+
+def test_iter_stories_chunks(monkeypatch):
+    ids = list(range(1, 101))
+    items = {i: {"id": i, "title": "t", "time": 1175714200} for i in ids}
+
+    async def collect():
+        api = _api(monkeypatch, ids=ids, items=items)
+        return [c async for c in api.iter_stories("top", extra_page=3)]
+
+    chunks = asyncio.run(collect())
+    assert [len(c) for c in chunks] == [30, 30, 30, 10]
+    assert [s.number for c in chunks for s in c] == list(range(1, 101))
+
+
+def test_get_comments_depth_and_order(monkeypatch):
+    api = _api(monkeypatch, items=COMMENT_ITEMS)
+    comments = asyncio.run(api.get_comments(100))
+    assert [(c.by, c.depth) for c in comments] == [
+        ("alice", 0), ("bob", 1), (None, 0)]
+    assert comments[2].text == "[deleted]"
+
+
+def test_semaphore_caps_in_flight(monkeypatch):
+    ids = list(range(1, 201))
+    in_flight = peak = 0
+
+    async def slow_request(url):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        if url.endswith("topstories.json"):
+            return ids
+        return {"id": 1, "title": "t"}
+
+    api = AsyncHackerNewsAPI(max_concurrency=25)
+    monkeypatch.setattr(api, "_request", slow_request)
+    stories = asyncio.run(api.get_stories("top", extra_page=5))
+    assert len(stories) == 180
+    assert peak == 25
@@ -7,7 +7,8 @@ import datetime
 import json
 
 import pyhn.hnapi as hnapi
-from pyhn.cachemanager import CacheManager
+from pyhn.cachemanager import INCREMENTAL_MAX_AGE, CacheManager
+from pyhn.config import Config
 
 
 def _fake_stories(start=1000, n=3):
@@ -59,7 +60,7 @@ def test_init_does_not_fetch(monkeypatch):
 def test_refresh_stream_yields_chunks_and_writes_cache(monkeypatch):
     chunks = [_fake_stories(1000, 2), _fake_stories(2000, 2)]
     _patch_iter(monkeypatch, chunks)
-    manager = CacheManager()
+    manager = CacheManager(backend="json")  # inspects the file
 
     seen = list(manager.refresh_stream("top"))
     assert [len(c) for c in seen] == [2, 2]
@@ -73,7 +74,7 @@ def test_is_outdated_multiday_age(monkeypatch):
     # Regression: timedelta.seconds (vs total_seconds) ignored the days part,
     # so a cache aged just over a day looked fresh.
     _patch_iter(monkeypatch, [_fake_stories()])
-    manager = CacheManager()
+    manager = CacheManager(backend="json")  # inspects the file
     manager.refresh("top")
     with open(manager.cache_path, encoding="utf-8") as f:
         cache = json.load(f)
@@ -100,7 +101,7 @@ def test_get_stories_unknown_section_empty(monkeypatch):
 
 def test_cache_file_is_valid_json(monkeypatch):
     _patch_iter(monkeypatch, [_fake_stories()])
-    manager = CacheManager()
+    manager = CacheManager(backend="json")  # inspects the file
     manager.refresh("top")
     with open(manager.cache_path, encoding="utf-8") as f:
         raw = json.load(f)
@@ -120,9 +121,145 @@ def test_stories_roundtrip_preserves_fields(monkeypatch):
 
 def test_legacy_or_corrupt_cache_treated_as_empty(monkeypatch):
     _patch_iter(monkeypatch, [_fake_stories()])
-    manager = CacheManager()
+    manager = CacheManager(backend="json")  # inspects the file
     manager.refresh("top")
     with open(manager.cache_path, "wb") as f:
         f.write(b"\x80\x04\x95not-json-pickle-bytes")
     assert manager.get_stories("top") == []
     assert manager.is_outdated("top") is True
+
+
+def _patch_refresh_stories(monkeypatch, calls):
+    def fake_refresh(self, which, cached, extra_page=1):
+        calls.append([s.id for s in cached])
+        return list(reversed(cached))
+    monkeypatch.setattr(hnapi.HackerNewsAPI, "refresh_stories", fake_refresh)
+
+
+def test_incremental_refresh_patches_cached_section(monkeypatch):
+    _patch_iter(monkeypatch, [_fake_stories()])
+    calls = []
+    _patch_refresh_stories(monkeypatch, calls)
+    manager = CacheManager()
+    manager.refresh("top")                      # nothing cached: full fetch
+    assert calls == []
+    chunks = list(manager.refresh_stream("top"))
+    assert calls == [[1000, 1001, 1002]]        # patched from the cache
+    assert len(chunks) == 1
+    assert [s.id for s in manager.get_stories("top")] == [1002, 1001, 1000]
+
+
+def test_incremental_refresh_falls_back_when_cache_too_old(monkeypatch):
+    _patch_iter(monkeypatch, [_fake_stories()])
+    calls = []
+    _patch_refresh_stories(monkeypatch, calls)
+    manager = CacheManager(backend="json")  # inspects the file
+    manager.refresh("top")
+    with open(manager.cache_path, encoding="utf-8") as f:
+        cache = json.load(f)
+    old = datetime.datetime.today() - datetime.timedelta(hours=1)
+    cache["top"]["date"] = old.isoformat()
+    with open(manager.cache_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    manager.refresh("top")
+    assert calls == []
+
+
+def test_incremental_refresh_failure_falls_back_to_full(monkeypatch):
+    _patch_iter(monkeypatch, [_fake_stories()])
+    manager = CacheManager()
+    manager.refresh("top")
+
+    def failing_refresh(self, which, cached, extra_page=1):
+        raise hnapi.HNException("updates.json down")
+    monkeypatch.setattr(
+        hnapi.HackerNewsAPI, "refresh_stories", failing_refresh)
+    _patch_iter(monkeypatch, [_fake_stories(start=2000)])
+    chunks = list(manager.refresh_stream("top"))
+    assert [s.id for s in chunks[0]] == [2000, 2001, 2002]
+    assert [s.id for s in manager.get_stories("top")] == [2000, 2001, 2002]
+
+
+def test_incremental_refreshes_fall_back_to_full_once_old(monkeypatch):
+    _patch_iter(monkeypatch, [_fake_stories()])
+    calls = []
+    _patch_refresh_stories(monkeypatch, calls)
+    manager = CacheManager()
+    manager.refresh("top")
+    date = manager.store.written_at("top")
+    for _ in range(3):
+        manager.refresh("top")
+    assert len(calls) == 3                      # patched from the feed...
+    assert manager.store.written_at("top") == date   # ...but not re-dated
+
+    monkeypatch.setattr(
+        CacheManager, "_age",
+        staticmethod(lambda date: INCREMENTAL_MAX_AGE + 1))
+    manager.refresh("top")
+    assert len(calls) == 3                      # full refetch this time
+    assert manager.store.written_at("top") != date
+
+
+def test_full_refresh_mode(monkeypatch):
+    _patch_iter(monkeypatch, [_fake_stories()])
+    calls = []
+    _patch_refresh_stories(monkeypatch, calls)
+    manager = CacheManager()
+    manager.refresh("top")
+    manager.refresh("top", incremental=False)
+    manager.refresh_mode = "full"
+    manager.refresh("top")
+    assert calls == []
+
+
+def test_legacy_cache_without_epochs_migrates(monkeypatch):
+    manager = CacheManager(backend="json")  # inspects the file
+    written = datetime.datetime.today() - datetime.timedelta(hours=3)
+    legacy = {"top": {
+        "date": written.isoformat(),
+        "stories": [{"id": 1, "number": 1, "title": "Old",
+                     "published_time": "2 hours ago"}]}}
+    with open(manager.cache_path, "w", encoding="utf-8") as f:
+        json.dump(legacy, f)
+
+    story, = manager.get_stories("top")
+    assert story.time == int(written.timestamp()) - 7200
+    assert story.published_time == "5 hours ago"   # aged since it was cached
+
+
+def test_sqlite_backend(monkeypatch):
+    _patch_iter(monkeypatch, [_fake_stories()])
+    manager = CacheManager(backend="sqlite")
+    assert manager.is_outdated("top") is True
+    manager.refresh("top")
+    assert manager.is_outdated("top") is False
+    assert [s.id for s in manager.get_stories("top")] == [1000, 1001, 1002]
+
+
+def test_apply_ids_keeps_the_section_date(monkeypatch):
+    _patch_iter(monkeypatch, [_fake_stories()])
+    manager = CacheManager()
+    manager.refresh("top")
+    date = manager.store.written_at("top")
+    monkeypatch.setattr(
+        hnapi.HackerNewsAPI, "patch_stories",
+        lambda self, ids, cached, changed: list(reversed(cached)))
+    stories = manager.apply_ids("top", [1002, 1001, 1000], set())
+    assert [s.id for s in stories] == [1002, 1001, 1000]
+    assert [s.id for s in manager.get_stories("top")] == [1002, 1001, 1000]
+    assert manager.store.written_at("top") == date
+
+
+def test_comment_cache_follows_cache_path(tmp_path):
+    manager = CacheManager(str(tmp_path / "cache"))
+    assert manager.comment_cache.directory == str(tmp_path / "cache.comments")
+    manager.set_cache_path(str(tmp_path / "other"))
+    assert manager.comment_cache.directory == str(tmp_path / "other.comments")
+
+
+def test_comment_cache_disabled_by_zero_ttl():
+    config = Config()
+    config.parser.set("settings", "comment_cache_ttl", "0")
+    with open(config.config_path, "w") as f:
+        config.parser.write(f)
+    assert CacheManager().comment_cache is None
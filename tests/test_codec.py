@@ -0,0 +1,40 @@
+"""pyhn.codec: every installed backend must behave like the stdlib."""
+import json
+
+import pytest
+
+from pyhn import codec
+
+DATA = {"top": {"stories": [{"id": 1, "title": "Café “quoted”", "score": None,
+                             "time": 1175714200}], "date": "2024-01-01T00:00:00"}}
+
+
+@pytest.mark.parametrize("name", codec.available())
+def test_roundtrip_matches_stdlib(name):
+    backend = codec.get_codec(name)
+    encoded = backend.dumps(DATA)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded.decode("utf-8")) == DATA
+    assert backend.loads(encoded) == DATA
+    assert backend.loads(encoded.decode("utf-8")) == DATA
+
+
+@pytest.mark.parametrize("name", codec.available())
+def test_malformed_input_raises_value_error(name):
+    with pytest.raises(ValueError):
+        codec.get_codec(name).loads(b'{"truncated": ')
+
+
+def test_auto_falls_back_to_stdlib(monkeypatch):
+    def missing():
+        raise ImportError("not installed")
+
+    monkeypatch.setitem(codec._FACTORIES, "orjson", missing)
+    monkeypatch.setitem(codec._FACTORIES, "msgspec", missing)
+    assert codec.get_codec().name == "json"
+    assert codec.available() == ["json"]
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        codec.get_codec("yaml")
@@ -0,0 +1,61 @@
+"""On-disk comment thread cache: roundtrip, TTL, size cap, bad files."""
+import os
+
+from pyhn.commentcache import CommentCache
+from pyhn.hnapi import HackerNewsComment, MoreComments
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _thread():
+    return [
+        HackerNewsComment("alice", "<p>hi</p>", 1700000000, 0, id=10),
+        HackerNewsComment(None, "", None, 1, deleted=True, id=11),
+        MoreComments([20, 21, 22], depth=1)]
+
+
+def test_roundtrip(tmp_path):
+    cache = CommentCache(str(tmp_path / "comments"), ttl=60, size=10)
+    assert cache.get(1) is None
+    cache.put(1, _thread())
+    rows = cache.get(1)
+    assert [r.to_dict() for r in rows] == [r.to_dict() for r in _thread()]
+    assert isinstance(rows[2], MoreComments) and rows[2].count == 3
+    assert rows[1].deleted and rows[1].depth == 1
+
+
+def test_expired_thread_is_dropped(tmp_path):
+    clock = Clock()
+    cache = CommentCache(str(tmp_path), ttl=60, size=10, clock=clock)
+    cache.put(1, _thread())
+    clock.now += 59
+    assert cache.get(1) is not None
+    clock.now += 1
+    assert cache.get(1) is None
+    assert not os.path.exists(tmp_path / "1.json")
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = CommentCache(str(tmp_path), ttl=60, size=2)
+    cache.put(1, _thread())
+    cache.put(2, _thread())
+    os.utime(tmp_path / "1.json", ns=(1, 1))
+    os.utime(tmp_path / "2.json", ns=(2, 2))
+    assert cache.get(1) is not None        # reading 1 makes 2 the oldest
+    cache.put(3, _thread())
+    assert sorted(os.listdir(tmp_path)) == ["1.json", "3.json"]
+
+
+def test_unreadable_file_is_a_miss(tmp_path):
+    cache = CommentCache(str(tmp_path), ttl=60, size=10)
+    (tmp_path / "1.json").write_text("{not json")
+    (tmp_path / "2.json").write_text('{"rows": []}')
+    assert cache.get(1) is None
+    assert cache.get(2) is None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,165 @@
+"""AdaptiveLimit tests: AIMD growth/backoff, clamping and blocking acquire,
+plus HackerNewsAPI driving it through a latency-injecting stand-in fetch and
+over real HTTP against pyhn.standin."""
+import threading
+import time
+
+from pyhn.concurrency import AdaptiveLimit
+from pyhn.hnapi import HackerNewsAPI
+from pyhn.standin import Dataset, Faults, StandIn, parse_latency
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cycle(limit, latency, ok=True):
+    limit.acquire()
+    limit.release(latency, ok)
+
+
+def test_additive_increase_about_one_per_round():
+    limit = AdaptiveLimit(4, maximum=10)
+    for _ in range(4):
+        _cycle(limit, 0.01)
+    assert limit.limit == 4   # 4 + 1/4 + ... just short of 5
+    _cycle(limit, 0.01)
+    assert limit.limit == 5
+
+
+def test_multiplicative_decrease_on_error_once_per_window():
+    clock = _Clock()
+    limit = AdaptiveLimit(16, target_latency=1.0, clock=clock)
+    _cycle(limit, 0.01, ok=False)
+    assert limit.limit == 8
+    _cycle(limit, 0.01, ok=False)   # same window: no second cut
+    assert limit.limit == 8
+    clock.now = 2.0
+    _cycle(limit, 5.0)              # slow success counts as congestion
+    assert limit.limit == 4
+
+
+def test_limit_clamped():
+    clock = _Clock()
+    limit = AdaptiveLimit(2, minimum=2, maximum=3, clock=clock)
+    for i in range(10):
+        clock.now = 10.0 * i
+        _cycle(limit, 0.0, ok=False)
+    assert limit.limit == 2
+    for _ in range(50):
+        _cycle(limit, 0.0)
+    assert limit.limit == 3
+
+
+def test_acquire_blocks_at_limit():
+    limit = AdaptiveLimit(1)
+    limit.acquire()
+    acquired = threading.Event()
+
+    def second():
+        limit.acquire()
+        acquired.set()
+
+    threading.Thread(target=second, daemon=True).start()
+    assert not acquired.wait(0.05)
+    limit.release(0.01)
+    assert acquired.wait(1)
+
+
+def _latency_api(monkeypatch, delay):
+    """An API whose every request takes `delay` seconds."""
+    api = HackerNewsAPI()
+    peak = 0
+    lock = threading.Lock()
+
+    def fake(url):
+        nonlocal peak
+        with lock:
+            peak = max(peak, api.limiter.in_flight)
+        time.sleep(delay)
+        if url.endswith("topstories.json"):
+            return list(range(1, 121))
+        return {"id": 1, "title": "t", "time": 1175714200}
+
+    monkeypatch.setattr(api, "fetch_json", fake)
+    return api, lambda: peak
+
+
+def test_fast_link_raises_limit(monkeypatch):
+    api, peak = _latency_api(monkeypatch, delay=0.001)
+    api.get_top_stories(extra_page=3)
+    assert api.limiter.limit > 16
+    assert peak() <= api.limiter.maximum
+
+
+def test_slow_link_lowers_limit(monkeypatch):
+    api, _ = _latency_api(monkeypatch, delay=0.02)
+    api.limiter.target_latency = 0.005
+    api.get_top_stories(extra_page=0)
+    assert api.limiter.limit < 16
+
+
+def test_limit_tracks_injected_latency_over_http():
+    faults = Faults(latency="constant:0.1")
+    with StandIn(Dataset.synthetic(200, 0, seed=1), faults) as api_base:
+        # No item cache (every load is real requests), no hedging.
+        api = HackerNewsAPI(api_base=api_base, item_cache_ttl=0,
+                            hedge_percentile=0)
+        api.limiter.target_latency = 0.05
+        api.get_top_stories(extra_page=0)
+        backed_off = api.limiter.limit
+        assert backed_off < 16
+
+        faults.latency = parse_latency("constant:0")
+        for _ in range(3):
+            api.get_top_stories(extra_page=0)
+        assert api.limiter.limit > backed_off
+        api.close()
+
+
+def test_cancelled_submissions_return_their_slot():
+    from concurrent.futures import ThreadPoolExecutor
+
+    api = HackerNewsAPI()
+    api._pool.shutdown()
+    api._pool = ThreadPoolExecutor(max_workers=1)
+    gate = threading.Event()
+    running = api._submit(lambda _: gate.wait(5), None)
+    queued = api._submit(lambda _: None, None)   # waits for the one worker
+    assert queued.cancel()
+    gate.set()
+    running.result(5)
+    assert api.limiter.in_flight == 0
+    assert api.pool_stats()["queued"] == 0
+
+    gate.clear()
+    api._submit(lambda _: gate.wait(5), None)
+    api._submit(lambda _: None, None)
+    api.close()                                  # cancels the queued call
+    gate.set()
+    api._pool.shutdown(wait=True)
+    assert api.limiter.in_flight == 0
+    assert api.pool_stats()["queued"] == 0
+
+
+def test_queued_counts_callers_waiting_for_a_slot():
+    api = HackerNewsAPI()
+    api.limiter = AdaptiveLimit(1)
+    gate = threading.Event()
+    api._submit(lambda _: gate.wait(5), None)
+    waiters = [threading.Thread(target=api._submit, args=(lambda _: None, None),
+                                daemon=True) for _ in range(3)]
+    for t in waiters:
+        t.start()
+    deadline = time.monotonic() + 5
+    while api.limiter.waiting < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert api.pool_stats()["queued"] == 3
+    gate.set()
+    for t in waiters:
+        t.join(5)
+    api.close()
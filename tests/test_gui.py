@@ -3,12 +3,23 @@
 HOME is redirected to tmp by the autouse conftest fixture, so Config() writes
 under tmp_path/.pyhn.
 """
+import contextlib
+import threading
+import time
 import types
 
 import urwid
 
 import pyhn.hnapi as hnapi
-from pyhn.gui import CommentWidget, HNGui, ItemWidget, SkeletonWidget
+from pyhn.commentcache import CommentCache
+from pyhn.gui import (
+    CommentWidget,
+    HNGui,
+    ItemWidget,
+    MoreCommentsWidget,
+    SkeletonWidget,
+    _thread_rows,
+)
 
 
 def _story(**kw):
@@ -24,7 +35,7 @@ def _story(**kw):
     s.comment_count = kw.get("comment_count", 7)
     s.comments_url = kw.get(
         "comments_url", "https://news.ycombinator.com/item?id=1")
-    s.published_time = kw.get("published_time", "1 hour ago")
+    s.time = kw.get("time", int(time.time()) - 3600)
     s.id = kw.get("id", 1)
     return s
 
@@ -57,6 +68,25 @@ def test_itemwidget_hides_hn_self_domain():
     assert "(" not in plain
 
 
+def test_itemwidget_reads_through_story():
+    story = _story(comment_count=None, submitter=None)
+    widget = ItemWidget(story, True, True, True)
+    assert widget.story is story
+    assert widget.comments_url is None        # no count -> no comments link
+    assert widget.submitter_url is None
+    assert "title" not in vars(widget)
+
+
+def test_itemwidget_karma_column():
+    widget = ItemWidget(_story(), False, False, False, True, 4242)
+    assert widget.item[2][2].original_widget.original_widget.text == "4242"
+    widget.set_karma(None)
+    assert widget.item[2][2].original_widget.original_widget.text == ""
+    plain = ItemWidget(_story(), False, False, False)
+    assert len(plain.item) == 2
+    plain.set_karma(7)                          # no column: no-op
+
+
 def test_itemwidget_handles_none_fields():
     widget = ItemWidget(
         _story(number=None, submitter=None, score=None, comment_count=None),
@@ -186,10 +216,10 @@ def test_stale_load_aborts_midstream():
 
 # --- comments view ----------------------------------------------------------
 
-def _comment(by="alice", text="hello", depth=0, deleted=False):
+def _comment(by="alice", text="hello", depth=0, deleted=False, id=None):
     return hnapi.HackerNewsComment(
-        by=by, text=text, published_time="1 hour ago", depth=depth,
-        deleted=deleted)
+        by=by, text=text, time=int(time.time()) - 3600, depth=depth,
+        deleted=deleted, id=id)
 
 
 def test_comment_widget():
@@ -239,12 +269,14 @@ def test_open_comments_view_non_story_focus_noop():
 
 def test_load_comments_switches_mode_and_back():
     class API:
-        def get_comments(self, story_id, max_comments=200):
-            return [_comment(by="a", depth=0), _comment(by="b", depth=1)]
+        def iter_comments(self, story_id, max_comments=200):
+            yield [(story_id, [_comment(by="a", depth=0, id=10)])]
+            yield [(10, [_comment(by="b", depth=1, id=11)])]
 
     class Cache:
         api = API()
         comments_limit = 50
+        comment_cache = None
 
     gui = _prep_gui_with_view(Cache())
     gui._set_items([_story(id=1)])     # one real story focused
@@ -260,12 +292,13 @@ def test_load_comments_switches_mode_and_back():
 
 def test_load_comments_empty_stays_in_stories():
     class API:
-        def get_comments(self, story_id, max_comments=200):
-            return []
+        def iter_comments(self, story_id, max_comments=200):
+            return iter([])
 
     class Cache:
         api = API()
         comments_limit = 50
+        comment_cache = None
 
     gui = _prep_gui_with_view(Cache())
     gui._set_items([_story(id=1)])
@@ -275,12 +308,13 @@ def test_load_comments_empty_stays_in_stories():
 
 def test_stale_comment_load_aborts():
     class API:
-        def get_comments(self, story_id, max_comments=200):
-            return [_comment()]
+        def iter_comments(self, story_id, max_comments=200):
+            yield [(story_id, [_comment()])]
 
     class Cache:
         api = API()
         comments_limit = 50
+        comment_cache = None
 
     gui = _prep_gui_with_view(Cache())
     gui._set_items([_story(id=1)])
@@ -332,3 +366,324 @@ def test_help_overlay_swallows_keys_until_closed():
     gui.keystroke("t")
     assert spawned == []
     assert gui._help_open is True
+
+
+# --- live mode --------------------------------------------------------------
+
+def test_live_update_rerenders_current_section():
+    applied = []
+
+    class Cache:
+        def apply_ids(self, which, ids, changed):
+            applied.append((which, ids, changed))
+            return [_story(id=i) for i in ids]
+
+    gui = _prep_gui(Cache())
+    alarms = []
+    gui.loop.set_alarm_in = lambda secs, cb: alarms.append(cb)
+    spawned = []
+    gui._spawn_load = lambda which, *a, **k: spawned.append(which)
+    gui.live_update("top", [2, 1], {2})
+    for cb in alarms:
+        cb()
+    assert applied == [("top", [2, 1], {2})]
+    assert spawned == ["top"]
+
+    gui._mode = "comments"          # never clobber the comment view
+    gui.live_update("top", [1, 2], {1})
+    for cb in alarms[1:]:
+        cb()
+    assert spawned == ["top"]
+
+
+def test_unattended_reloads_wait_for_a_pending_comment_load():
+    class Cache:
+        def apply_ids(self, which, ids, changed):
+            return [_story(id=i) for i in ids]
+
+    gui = _prep_gui(Cache())
+    alarms = []
+    gui.loop.set_alarm_in = lambda secs, cb: alarms.append(cb)
+    spawned = []
+    gui._spawn_load = lambda which, *a, **k: spawned.append(which)
+    gui._load_gen += 1                  # open_comments_view, first batch pending
+    gui._comment_load = gui._load_gen
+    gui.live_update("top", [2, 1], {2})
+    gui.refresh_current()
+    for cb in alarms:
+        cb()
+    assert spawned == []                # the comment load was not cancelled
+
+    gui._comment_load = None            # the thread is shown (or gave up)
+    gui.live_update("top", [2, 1], {2})
+    gui.refresh_current()
+    for cb in alarms[2:]:
+        cb()
+    assert spawned == ["top", "top"]
+
+
+def test_poll_skips_while_a_comment_thread_is_open():
+    gui = _prep_gui(_DummyCache())
+    alarms = []
+    gui.loop.set_alarm_in = lambda secs, cb: alarms.append(cb)
+    spawned = []
+    gui._spawn_load = lambda which, *a, **k: spawned.append(which)
+    gui._mode = "comments"
+    gui.refresh_current()
+    for cb in alarms:
+        cb()
+    assert spawned == []
+
+
+def test_superseded_reply_load_resets_placeholder():
+    class API:
+        def expand_comments(self, more, max_comments=50):
+            return [_comment(by="c", depth=1)]
+
+    class Cache:
+        api = API()
+        comments_limit = 50
+        comment_cache = None
+
+    gui = _prep_gui_with_view(Cache())
+    gui._mode = "comments"
+    widget = MoreCommentsWidget(hnapi.MoreComments([300], depth=1))
+    gui.walker[:] = [widget]
+    widget.set_loading(True)
+    gui._load_more(widget, gui._load_gen - 1)    # a newer load bumped gen
+    assert not widget.loading
+    assert gui.walker[0] is widget
+
+
+def test_live_fallback_starts_poller():
+    gui = _prep_gui(_DummyCache())
+    gui.live_mode = True
+    started = []
+    gui.poller.start = lambda: started.append(True)
+    gui.live_fallback()
+    assert gui.live_mode is False
+    assert started == [True]
+
+
+def test_focus_settle_prefetches_focused_and_next_rows():
+    gui = _prep_gui(_DummyCache())
+    gui._set_items([
+        _story(id=i, comment_count=0 if i == 2 else 5) for i in range(1, 8)])
+    alarms = []
+    gui.loop.set_alarm_in = lambda secs, cb: alarms.append(cb) or len(alarms)
+    removed = []
+    gui.loop.remove_alarm = removed.append
+    scheduled = []
+    gui.prefetcher = types.SimpleNamespace(schedule=scheduled.append)
+
+    gui._schedule_prefetch()
+    gui._schedule_prefetch()            # still moving: restart the timer
+    assert removed == [1]
+    alarms[-1]()
+    # Focused row plus the next 3 that have comments (2 has none).
+    assert scheduled == [[1, 3, 4, 5]]
+
+
+def test_load_comments_uses_prefetched_thread():
+    class API:
+        def iter_comments(self, story_id, max_comments=200):
+            raise AssertionError("should have used the prefetched thread")
+
+    class Cache:
+        api = API()
+        comments_limit = 50
+        comment_cache = None
+
+    gui = _prep_gui_with_view(Cache())
+    gui._set_items([_story(id=1)])
+    gui.prefetcher = types.SimpleNamespace(
+        get=lambda story_id: [_comment()] if story_id == 1 else None)
+    gui._load_comments(1, gui._load_gen)
+    assert gui._mode == "comments"
+
+
+def test_load_comments_renders_cached_thread_then_revalidates(tmp_path):
+    fetched = []
+
+    class API:
+        def iter_comments(self, story_id, max_comments=200):
+            raise AssertionError("should have used the cached thread")
+
+        @contextlib.contextmanager
+        def background(self):
+            yield
+
+        def get_comments(self, story_id, max_comments=200):
+            fetched.append(story_id)
+            return [_comment(by="a", id=10), _comment(by="c", id=12)]
+
+    class Cache:
+        api = API()
+        comments_limit = 50
+        comment_cache = CommentCache(str(tmp_path), ttl=60, size=10)
+
+    Cache.comment_cache.put(1, [
+        _comment(by="a", id=10), _comment(by="b", id=11),
+        hnapi.MoreComments([20, 21], depth=0)])
+    gui = _prep_gui_with_view(Cache())
+    gui._set_items([_story(id=1)])
+    shown = []
+    gui._revalidate_comments = lambda story_id, gen, rows: shown.append(
+        [_row_key(w) for w in gui.walker])
+    gui._load_comments(1, gui._load_gen)
+    assert gui._mode == "comments"
+    assert shown == [["a", "b", "more"]]        # rendered from disk, no fetch
+    assert fetched == []
+
+    gui.listbox.set_focus(0)                    # on "a"
+    del gui._revalidate_comments
+    gui._revalidate_comments(1, gui._load_gen, _thread_rows(gui.walker))
+    assert fetched == [1]
+    assert [_row_key(w) for w in gui.walker] == ["a", "c"]
+    assert gui.listbox.focus.comment.id == 10
+    assert [c.by for c in Cache.comment_cache.get(1)] == ["a", "c"]
+
+
+def test_revalidation_keeps_replies_expanded_meanwhile(tmp_path):
+    class API:
+        @contextlib.contextmanager
+        def background(self):
+            yield
+
+        def get_comments(self, story_id, max_comments=200):
+            return [_comment(by="a", id=10), _comment(by="c", id=12)]
+
+        def expand_comments(self, more, max_comments=50):
+            raise AssertionError("no auto-expansion while revalidating")
+
+    class Cache:
+        api = API()
+        comments_limit = 50
+        comment_cache = CommentCache(str(tmp_path), ttl=60, size=10)
+
+    gui = _prep_gui_with_view(Cache())
+    gui._mode = "comments"
+    more = hnapi.MoreComments([20, 21], depth=1)
+    gui.walker[:] = [CommentWidget(_comment(by="a", id=10)),
+                     MoreCommentsWidget(more)]
+    cached = _thread_rows(gui.walker)
+    gui._revalidating = gui._load_gen
+    gui._expand_near_focus()                    # deferred: no fetch
+    gui.walker[1:2] = [CommentWidget(_comment(by="r", depth=1, id=20))]
+    footers = []
+    gui.set_footer = lambda text, **k: footers.append(text)
+    gui._revalidate_comments(1, gui._load_gen, cached)
+    assert [_row_key(w) for w in gui.walker] == ["a", "r"]   # kept
+    assert "thread updated" in footers[-1]
+    assert [c.by for c in Cache.comment_cache.get(1)] == ["a", "c"]
+
+
+def test_load_comments_stores_streamed_thread(tmp_path):
+    class API:
+        def iter_comments(self, story_id, max_comments=200):
+            yield [(story_id, [_comment(by="a", id=10)])]
+            yield [(10, [_comment(by="b", depth=1, id=11)])]
+
+    class Cache:
+        api = API()
+        comments_limit = 50
+        comment_cache = CommentCache(str(tmp_path), ttl=60, size=10)
+
+    gui = _prep_gui_with_view(Cache())
+    gui._set_items([_story(id=1)])
+    gui._load_comments(1, gui._load_gen)
+    rows = Cache.comment_cache.get(1)
+    assert [(c.by, c.depth) for c in rows] == [("a", 0), ("b", 1)]
+
+
+def _row_key(widget):
+    if isinstance(widget, MoreCommentsWidget):
+        return "more"
+    return widget.comment.by
+
+
+def test_more_replies_expand_in_place_keeping_focus():
+    expanded = threading.Event()
+
+    class API:
+        def expand_comments(self, more, max_comments=50):
+            return [_comment(by="c", depth=1), _comment(by="d", depth=1)]
+
+    class Cache:
+        api = API()
+        comments_limit = 50
+        comment_cache = None
+
+    gui = _prep_gui_with_view(Cache())
+    gui._mode = "comments"
+    more = hnapi.MoreComments([300, 301], depth=1)
+    gui.walker[:] = [
+        CommentWidget(_comment(by="a")), MoreCommentsWidget(more),
+        CommentWidget(_comment(by="b"))]
+    gui.listbox.set_focus(2)
+    gui._request_redraw = expanded.set
+    gui._expand_near_focus()            # placeholder is above the focus: no-op
+    assert not expanded.is_set()
+
+    gui._expand_more(gui.walker[1])
+    assert expanded.wait(5)
+    assert [type(w) for w in gui.walker] == [CommentWidget] * 4
+    assert gui.listbox.focus_position == 3      # still on "b"
+
+
+def test_streamed_replies_land_under_parents_keeping_focus():
+    gui = _prep_gui_with_view(_DummyCache())
+    gui._enter_comments()
+    gui._insert_replies([(1, [_comment(by="a", id=10), _comment(by="b", id=20)])])
+    gui.listbox.set_focus(1)                     # on "b"
+    gui._insert_replies([
+        (10, [_comment(by="a1", depth=1, id=11)]),
+        (20, [_comment(by="b1", depth=1, id=21)]),
+    ])
+    gui._insert_replies([
+        (10, [hnapi.MoreComments([12], depth=1)]),
+        (11, [hnapi.MoreComments([111], depth=2)]),
+        (1, [hnapi.MoreComments([30], depth=0)]),
+    ])
+    labels = [
+        w.comment.by if isinstance(w, CommentWidget) else f"+{w.more.ids[0]}"
+        for w in gui.walker]
+    assert labels == ["a", "a1", "+111", "+12", "b", "b1", "+30"]
+    assert gui.walker[gui.listbox.focus_position].comment.by == "b"
+
+
+def test_footer_shows_cached_submitter_karma():
+    gui = _prep_gui(_DummyCache())
+    footers = []
+    gui.set_footer = lambda msg, **k: footers.append(msg)
+    gui._set_items([_story(submitter="alice")])
+    gui.users = types.SimpleNamespace(karma={"alice": 4242}.get)
+    gui.update()
+    assert footers[-1].endswith("by alice (4242 karma)")
+
+    gui.show_karma = False
+    gui.update()
+    assert footers[-1].endswith("by alice")
+
+
+def test_story_rows_fill_in_karma_once_fetched():
+    gui = _prep_gui(_DummyCache())
+    karma = {}
+    fetched = []
+
+    def prefetch(names, done):
+        fetched.append(list(names))
+        karma.update(alice=10, bob=20)
+        done()
+
+    gui.users = types.SimpleNamespace(karma=karma.get, prefetch=prefetch)
+    stories = [_story(id=1, submitter="alice"), _story(id=2, submitter="bob")]
+    gui._set_items(stories)
+
+    def shown():
+        return [w.item[2][2].original_widget.original_widget.text
+                for w in gui.walker]
+    assert shown() == ["", ""]                  # first paint: not known yet
+    gui._fetch_karma(stories)
+    assert fetched == [["alice", "bob"]]
+    assert shown() == ["10", "20"]
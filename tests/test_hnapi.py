@@ -2,14 +2,21 @@
 
 No network: fetch_json is monkeypatched to serve canned items by URL.
 """
+import json
+from pathlib import Path
+
 import pytest
 
 from pyhn.hnapi import (
     HackerNewsAPI,
+    HackerNewsComment,
     HackerNewsStory,
     HackerNewsUser,
     HNException,
+    MoreComments,
     _html_to_text,
+    _parse_html_to_text,
+    _parse_relative_time,
     _relative_time,
 )
 
@@ -97,14 +104,33 @@ def test_unknown_section_raises(monkeypatch):
 
 
 def test_fetch_json_wraps_errors(monkeypatch):
-    import pyhn.hnapi as hnapi
-
     def boom(*args, **kwargs):
         raise OSError("no network")
 
-    monkeypatch.setattr(hnapi.requests, "get", boom)
+    api = HackerNewsAPI()
+    monkeypatch.setattr(api.session, "get", boom)
     with pytest.raises(HNException):
-        HackerNewsAPI().fetch_json("https://hacker-news.firebaseio.com/v0/topstories.json")
+        api.fetch_json("https://hacker-news.firebaseio.com/v0/topstories.json")
+
+
+def test_session_pool_sized_to_workers():
+    import pyhn.hnapi as hnapi
+    adapter = HackerNewsAPI().session.get_adapter(hnapi.API_BASE)
+    assert adapter._pool_maxsize == hnapi.WORKER_LIMIT
+
+
+def test_preconnect_swallows_errors(monkeypatch):
+    calls = []
+
+    def boom(url, **kwargs):
+        calls.append(url)
+        raise OSError("no network")
+
+    api = HackerNewsAPI()
+    monkeypatch.setattr(api.session, "get", boom)
+    api.preconnect(connections=3)  # must not raise
+    assert len(calls) == 3
+    assert calls[0].endswith("/maxitem.json")
 
 
 @pytest.mark.parametrize("delta_seconds,expected", [
@@ -124,20 +150,33 @@ def test_relative_time(delta_seconds, expected):
 
 
 def test_refresh_karma(monkeypatch):
-    import pyhn.hnapi as hnapi
+    api = HackerNewsAPI()
     monkeypatch.setattr(
-        hnapi.HackerNewsAPI, "fetch_json",
-        lambda self, url: {"id": "alice", "karma": 4242})
-    user = HackerNewsUser("alice")
+        api, "fetch_json", lambda url: {"id": "alice", "karma": 4242})
+    user = HackerNewsUser("alice", api=api)
     assert user.karma == 4242
 
 
-def test_refresh_karma_missing_raises(monkeypatch):
-    import pyhn.hnapi as hnapi
+def test_refresh_karma_uses_the_given_api_base(monkeypatch):
+    api = HackerNewsAPI(api_base="http://127.0.0.1:9/v0")
+    urls = []
     monkeypatch.setattr(
-        hnapi.HackerNewsAPI, "fetch_json", lambda self, url: None)
+        api, "fetch_json", lambda url: urls.append(url) or {"karma": 7})
+    assert HackerNewsUser("alice", api=api).karma == 7
+    assert urls == ["http://127.0.0.1:9/v0/user/alice.json"]
+
+
+def test_user_needs_karma_or_api():
+    assert HackerNewsUser("alice", karma=3).karma == 3
+    with pytest.raises(TypeError):
+        HackerNewsUser("alice")
+
+
+def test_refresh_karma_missing_raises(monkeypatch):
+    api = HackerNewsAPI()
+    monkeypatch.setattr(api, "fetch_json", lambda url: None)
     with pytest.raises(HNException):
-        HackerNewsUser("ghost")
+        HackerNewsUser("ghost", api=api)
 
 
 def test_story_dict_roundtrip(monkeypatch):
@@ -146,6 +185,42 @@ def test_story_dict_roundtrip(monkeypatch):
     assert restored.to_dict() == story.to_dict()
 
 
+def test_story_is_slotted_with_derived_display_fields():
+    story = HackerNewsStory()
+    assert not hasattr(story, "__dict__")
+    with pytest.raises(AttributeError):
+        story.unknown = 1
+    story.domain = "https://sub.example.com/path"
+    assert story.netloc == "sub.example.com"
+    assert story.rank_text == "-"
+    story.number = 7
+    assert story.rank_text == "7:"
+
+
+def test_story_keeps_epoch_and_formats_age_on_read(monkeypatch):
+    story = _api(monkeypatch).get_top_stories(extra_page=0)[0]
+    assert story.time == 1175714200
+    assert story.to_dict()["time"] == 1175714200
+    assert "published_time" not in story.to_dict()
+    assert story.published_time == _relative_time(1175714200)
+
+
+@pytest.mark.parametrize("age", [0, 45, 300, 7200, 3 * 86400])
+def test_parse_relative_time_inverts_format(age):
+    now = 2_000_000_000
+    text = _relative_time(now - age, now=now)
+    assert _parse_relative_time(text) == age
+    assert _parse_relative_time("yesterday") is None
+
+
+def test_from_dict_migrates_legacy_age_string():
+    written_at = 2_000_000_000
+    legacy = {"id": 1, "title": "t", "published_time": "2 hours ago"}
+    story = HackerNewsStory.from_dict(legacy, written_at)
+    assert story.time == written_at - 7200
+    assert HackerNewsStory.from_dict(legacy).time is None
+
+
 def test_iter_stories_chunks(monkeypatch):
     # 100 valid ids, chunk_size 30 -> 30,30,30,10.
     ids = list(range(1, 101))
@@ -180,6 +255,28 @@ def test_html_to_text():
     assert _html_to_text("") == ""
 
 
+def test_html_to_text_matches_htmlparser_on_corpus():
+    bodies = json.loads(
+        (Path(__file__).parent / "data" / "comment_bodies.json").read_text("utf-8"))
+    for body in bodies:
+        assert _html_to_text(body) == _parse_html_to_text(body), body
+
+
+@pytest.mark.parametrize("raw", [
+    "<pre><code>  x = 1\n    y &lt;= 2\n</code></pre>",
+    '<a href="https:&#x2F;&#x2F;e.com?a=1&amp;b=2" rel="nofollow">https:&#x2F;&#x2F;e.com</a>',
+    '<a href="x>y">l</a>',
+    "&amp;lt; stays escaped once",
+    "&gt without semicolon &copy;",
+    "unknown <b>tag</b> and <!-- comment -->",
+    "stray < sign",
+    "<P>upper<BR/>case",
+    "AT&T",
+])
+def test_html_to_text_edge_cases_match_htmlparser(raw):
+    assert _html_to_text(raw) == _parse_html_to_text(raw)
+
+
 # A small comment tree: story 100 has kids 200 (with child 300) and 201.
 COMMENT_ITEMS = {
     100: {"id": 100, "type": "story", "kids": [200, 201]},
@@ -211,6 +308,300 @@ def test_get_comments_depth_and_order(monkeypatch):
     assert comments[2].text == "[deleted]"
 
 
+def _rebuild(batches):
+    """Apply iter_comments batches the way the GUI does (by parent subtree)."""
+    rows = []
+    for batch in batches:
+        for parent_id, replies in reversed(batch):
+            at = next((i for i, r in enumerate(rows) if getattr(r, "id", None) == parent_id),
+                      None)
+            if at is None:
+                end = len(rows)
+            else:
+                end = at + 1
+                while end < len(rows) and rows[end].depth > rows[at].depth:
+                    end += 1
+            rows[end:end] = replies
+    return rows
+
+
+@pytest.mark.parametrize("cap", [1, 2, 3, 50])
+def test_iter_comments_matches_get_comments_order(monkeypatch, cap):
+    api = _comment_api(monkeypatch)
+    batches = list(api.iter_comments(100, max_comments=cap))
+    assert batches[0][0][0] == 100              # top level first, under the story
+
+    def key(rows):
+        return [(type(r).__name__, getattr(r, "by", None), r.depth,
+                 getattr(r, "ids", None)) for r in rows]
+
+    assert key(_rebuild(batches)) == key(api.get_comments(100, max_comments=cap))
+
+
 def test_get_comments_respects_cap(monkeypatch):
     comments = _comment_api(monkeypatch).get_comments(100, max_comments=1)
-    assert len(comments) == 1
+    assert [c.by for c in comments if isinstance(c, HackerNewsComment)] == ["alice"]
+
+
+def test_get_comments_leaves_placeholders_beyond_cap(monkeypatch):
+    api = _comment_api(monkeypatch)
+    rows = api.get_comments(100, max_comments=1)
+    # alice fetched; her reply and the second top-level comment are deferred.
+    assert isinstance(rows[0], HackerNewsComment)
+    assert all(isinstance(r, MoreComments) for r in rows[1:])
+    assert [(r.ids, r.depth) for r in rows[1:]] == [([300], 1), ([201], 0)]
+
+    expanded = api.expand_comments(rows[1])
+    assert [(c.by, c.depth) for c in expanded] == [("bob", 1)]
+
+
+def test_shared_pool_reused_across_calls(monkeypatch):
+    import threading
+
+    threads = set()
+    api = _comment_api(monkeypatch)
+    real = api.fetch_json
+
+    def tracking(url):
+        threads.add(threading.current_thread().name)
+        return real(url)
+
+    monkeypatch.setattr(api, "fetch_json", tracking)
+    pool = api._pool
+    api.get_comments(100)
+    api.get_comments(100)
+    assert api._pool is pool
+    assert all(name.startswith("pyhn-fetch") for name in threads - {"MainThread"})
+    stats = api.pool_stats()
+    assert stats["queued"] == stats["active"] == 0
+    # 3 kids fetched on the pool (root is inline); the repeat call is served
+    # from the item cache without taking a worker.
+    assert stats["completed"] == 3
+    assert stats["workers"] == 64
+
+
+def test_close_shuts_down_pool(monkeypatch):
+    api = _comment_api(monkeypatch)
+    api.close()
+    with pytest.raises(RuntimeError):
+        api.get_comments(100)
+
+
+def test_item_cache_shared_across_sections(monkeypatch):
+    requested = []
+    api = HackerNewsAPI()
+
+    def fake(url):
+        if url.endswith("stories.json"):
+            return [1, 2, 3]
+        item_id = int(url.split("/item/")[1].split(".json")[0])
+        requested.append(item_id)
+        return {"id": item_id, "title": "t", "time": 1175714200}
+
+    monkeypatch.setattr(api, "fetch_json", fake)
+    api.get_top_stories(extra_page=0)
+    api.get_best_stories(extra_page=0)  # same ids: served from the cache
+    assert sorted(requested) == [1, 2, 3]
+    assert api.items.stats()["hits"] == 3
+
+
+def test_item_cache_disabled(monkeypatch):
+    api = _api(monkeypatch)
+    api.items.ttl = 0
+    api.get_top_stories(extra_page=0)
+    api.get_top_stories(extra_page=0)
+    assert api.items.stats()["hits"] == 0
+
+
+def test_refresh_stories_fetches_only_changed_and_new(monkeypatch):
+    requested = []
+    items = {i: {"id": i, "title": f"v2 {i}", "time": 1175714200}
+             for i in range(1, 6)}
+
+    def fake(url):
+        if url.endswith("topstories.json"):
+            return [4, 1, 2, 3]  # 4 is new to the list
+        if url.endswith("updates.json"):
+            return {"items": [2, 999], "profiles": ["alice"]}
+        item_id = int(url.split("/item/")[1].split(".json")[0])
+        requested.append(item_id)
+        return items[item_id]
+
+    api = HackerNewsAPI()
+    monkeypatch.setattr(api, "fetch_json", fake)
+    cached = []
+    for i in (1, 2, 3):
+        story = HackerNewsStory()
+        story.id, story.number, story.title = i, i, f"v1 {i}"
+        cached.append(story)
+
+    stories = api.refresh_stories("top", cached, extra_page=0)
+    assert sorted(requested) == [2, 4]  # updated + new only
+    assert [s.id for s in stories] == [4, 1, 2, 3]
+    assert [s.number for s in stories] == [1, 2, 3, 4]
+    assert [s.title for s in stories] == ["v2 4", "v1 1", "v2 2", "v1 3"]
+
+
+def test_refresh_stories_bypasses_item_cache_for_updates(monkeypatch):
+    api = HackerNewsAPI()
+    api.items.put(2, {"id": 2, "title": "stale", "time": 1175714200})
+
+    def fake(url):
+        if url.endswith("topstories.json"):
+            return [2]
+        if url.endswith("updates.json"):
+            return {"items": [2]}
+        return {"id": 2, "title": "fresh", "time": 1175714200}
+
+    monkeypatch.setattr(api, "fetch_json", fake)
+    story = HackerNewsStory()
+    story.id, story.title = 2, "old"
+    assert api.refresh_stories("top", [story], extra_page=0)[0].title == "fresh"
+
+
+def test_refresh_stories_keeps_cached_story_when_refetch_fails(monkeypatch):
+    def fake(url):
+        if url.endswith("topstories.json"):
+            return [1, 2, 3]
+        if url.endswith("updates.json"):
+            return {"items": [2]}
+        raise HNException("item down")
+
+    api = HackerNewsAPI(retries=0)
+    monkeypatch.setattr(api, "fetch_json", fake)
+    cached = []
+    for i in (1, 2, 3):
+        story = HackerNewsStory()
+        story.id, story.number, story.title = i, i, f"v1 {i}"
+        cached.append(story)
+    stories = api.refresh_stories("top", cached, extra_page=0)
+    assert [s.id for s in stories] == [1, 2, 3]
+    assert stories[1].title == "v1 2"
+
+
+def _flaky_api(monkeypatch, fetch):
+    import pyhn.hnapi as hnapi
+    monkeypatch.setattr(hnapi, "RETRY_BACKOFF", 0)
+    api = HackerNewsAPI()
+    monkeypatch.setattr(api, "fetch_json", fetch)
+    return api
+
+
+def test_updated_ids_retries(monkeypatch):
+    attempts = []
+
+    def fake(url):
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise HNException("blip")
+        return {"items": [7]}
+
+    api = _flaky_api(monkeypatch, fake)
+    assert api.updated_ids() == {7}
+    assert len(attempts) == 2
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    failures = {"topstories": 1, 2: 2}
+
+    def fake(url):
+        key = "topstories" if url.endswith("topstories.json") else int(
+            url.split("/item/")[1].split(".json")[0])
+        if failures.get(key):
+            failures[key] -= 1
+            raise HNException("flaky")
+        if key == "topstories":
+            return [1, 2]
+        return {"id": key, "title": "t", "time": 1175714200}
+
+    stories = _flaky_api(monkeypatch, fake).get_top_stories(extra_page=0)
+    assert [s.id for s in stories] == [1, 2]
+    assert failures == {"topstories": 0, 2: 0}
+
+
+def test_failing_item_is_skipped_not_fatal(monkeypatch):
+    def fake(url):
+        if url.endswith("topstories.json"):
+            return [1, 2, 3]
+        item_id = int(url.split("/item/")[1].split(".json")[0])
+        if item_id == 2:
+            raise HNException("always down")
+        return {"id": item_id, "title": "t", "time": 1175714200}
+
+    stories = _flaky_api(monkeypatch, fake).get_top_stories(extra_page=0)
+    assert [s.id for s in stories] == [1, 3]
+    assert [s.number for s in stories] == [1, 2]
+
+
+def test_slow_item_is_hedged(monkeypatch):
+    import threading
+    import time
+
+    calls = {}
+    lock = threading.Lock()
+
+    def fake(url):
+        if url.endswith("topstories.json"):
+            return list(range(1, 6))
+        item_id = int(url.split("/item/")[1].split(".json")[0])
+        with lock:
+            calls[item_id] = calls.get(item_id, 0) + 1
+            first = calls[item_id] == 1
+        if item_id == 3 and first:
+            time.sleep(2)  # the straggler; its hedge answers at once
+        return {"id": item_id, "title": "t", "time": 1175714200}
+
+    api = _flaky_api(monkeypatch, fake)
+    api._latencies.extend([0.01] * 20)
+    start = time.monotonic()
+    stories = api.get_top_stories(extra_page=0)
+    assert time.monotonic() - start < 1
+    assert [s.id for s in stories] == [1, 2, 3, 4, 5]
+    assert api.hedged == 1
+    assert calls[3] == 2
+
+
+def test_background_lane_follows_work_onto_pool(monkeypatch):
+    class Ok:
+        content = b"1"
+
+    base = "https://hacker-news.firebaseio.com/v0"
+    api = HackerNewsAPI(rate_limit=1000, rate_burst=100)
+    monkeypatch.setattr(api.session, "get", lambda url, **kwargs: Ok())
+    api.fetch_json(f"{base}/maxitem.json")
+    with api.background():
+        api._map(api.fetch_json, [f"{base}/item/{i}.json" for i in range(5)])
+    api._map(api.fetch_json, [f"{base}/item/9.json"])
+    api.preconnect(connections=2)
+    stats = api.rate_stats()
+    assert stats["foreground"]["acquired"] == 2
+    assert stats["background"]["acquired"] == 7
+
+
+def test_rate_limit_waits_are_not_latency_samples(monkeypatch):
+    import time
+
+    class Ok:
+        content = b'{"id": 1, "title": "t", "time": 1175714200}'
+
+    api = HackerNewsAPI(rate_limit=50, rate_burst=1)
+    monkeypatch.setattr(api.session, "get", lambda url, **kwargs: Ok())
+    samples = []
+    release = api.limiter.release
+    monkeypatch.setattr(api.limiter, "release", lambda latency, ok: (
+        samples.append(latency), release(latency, ok)))
+    start = time.monotonic()
+    api._fetch_items(list(range(1, 11)))        # ~0.2s of token waits
+    assert time.monotonic() - start > 0.15
+    assert len(samples) == 10
+    assert max(samples) < 0.05
+    assert max(api._latencies) < 0.05
+
+
+def test_hedging_needs_samples_and_can_be_disabled():
+    api = HackerNewsAPI()
+    assert api._hedge_after() is None          # too few samples yet
+    api._latencies.extend(float(i) for i in range(100))
+    assert api._hedge_after() == 95.0
+    api.hedge_percentile = 0
+    assert api._hedge_after() is None
@@ -5,10 +5,23 @@ import pytest
 
 MODULES = [
     "pyhn",
+    "pyhn.codec",
+    "pyhn.commentcache",
     "pyhn.config",
+    "pyhn.concurrency",
+    "pyhn.itemcache",
+    "pyhn.ratelimit",
+    "pyhn.singleflight",
+    "pyhn.store",
+    "pyhn.standin",
+    "pyhn.transport",
     "pyhn.hnapi",
+    "pyhn.aiohnapi",
     "pyhn.cachemanager",
+    "pyhn.live",
     "pyhn.poller",
+    "pyhn.prefetch",
+    "pyhn.users",
     "pyhn.popup",
     "pyhn.gui",
     "pyhn.cli",
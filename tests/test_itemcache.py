@@ -0,0 +1,55 @@
+"""ItemCache tests: TTL expiry, LRU eviction and hit/miss counters."""
+from pyhn.itemcache import ItemCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_miss_counters():
+    cache = ItemCache(ttl=60, max_entries=10)
+    assert cache.get(1) is None
+    cache.put(1, {"id": 1})
+    assert cache.get(1) == {"id": 1}
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_entries_expire_after_ttl():
+    clock = _Clock()
+    cache = ItemCache(ttl=60, max_entries=10, clock=clock)
+    cache.put(1, {"id": 1})
+    clock.now = 59
+    assert cache.get(1) is not None
+    clock.now = 61
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = ItemCache(ttl=60, max_entries=2)
+    cache.put(1, {"id": 1})
+    cache.put(2, {"id": 2})
+    cache.get(1)              # 1 is now most recently used
+    cache.put(3, {"id": 3})   # evicts 2
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.get(3) is not None
+
+
+def test_zero_ttl_disables():
+    cache = ItemCache(ttl=0, max_entries=10)
+    cache.put(1, {"id": 1})
+    assert cache.get(1) is None
+
+
+def test_invalidate():
+    cache = ItemCache(ttl=60, max_entries=10)
+    cache.put(1, {"id": 1})
+    cache.put(2, {"id": 2})
+    cache.invalidate([1, 99])
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
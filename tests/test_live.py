@@ -0,0 +1,124 @@
+"""Live-mode tests: SSE parsing, id-list patching, and a LiveSection run
+against a local server-sent-events stand-in for the Firebase endpoint."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import pyhn.hnapi as hnapi
+from pyhn.live import LiveSection, apply_event, changed_ids, parse_events
+
+
+def test_parse_events():
+    lines = [
+        "event: put", 'data: {"path": "/", "data": [1, 2]}', "",
+        ": comment", "event: keep-alive", "data: null", "",
+        "event: patch", 'data: {"path": "/",', 'data: "data": {"1": 3}}', "",
+    ]
+    assert list(parse_events(lines)) == [
+        ("put", {"path": "/", "data": [1, 2]}),
+        ("keep-alive", None),
+        ("patch", {"path": "/", "data": {"1": 3}}),
+    ]
+
+
+def test_apply_event():
+    ids = apply_event([], "put", {"path": "/", "data": [1, 2, 3]})
+    assert ids == [1, 2, 3]
+    assert apply_event(ids, "put", {"path": "/1", "data": 9}) == [1, 9, 3]
+    assert apply_event(ids, "patch", {"path": "/", "data": {"0": 7, "3": 8}}) == [7, 2, 3, 8]
+    assert apply_event(ids, "keep-alive", None) == ids
+
+
+@pytest.mark.parametrize("old,new,expected", [
+    ([1, 2, 3], [1, 2, 3], set()),
+    ([1, 2, 3], [9, 1, 2, 3], {9}),        # insertion: nothing else moved
+    ([1, 2, 3, 4], [3, 1, 2, 4], {3}),     # 3 rose above 1 and 2
+    ([1, 2, 3], [1, 3], set()),            # a drop moves nothing
+])
+def test_changed_ids(old, new, expected):
+    assert changed_ids(old, new) == expected
+
+
+class _SSEStandIn(BaseHTTPRequestHandler):
+    """Streams the queued events for /v0/topstories.json, then hangs up."""
+    events: list = []
+    status = 200
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        assert self.headers["Accept"] == "text/event-stream"
+        if self.status != 200:
+            self.send_error(self.status)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for event, data in self.events:
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+            self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    handler = type("Handler", (_SSEStandIn,), {"events": [], "requests": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(hnapi, "API_BASE", f"http://127.0.0.1:{server.server_port}/v0")
+    yield handler
+    server.shutdown()
+
+
+class _GuiStub:
+    def __init__(self, cached_ids):
+        story_list = []
+        for i in cached_ids:
+            story = hnapi.HackerNewsStory()
+            story.id = i
+            story_list.append(story)
+        self.cache_manager = type("Cache", (), {
+            "api": hnapi.HackerNewsAPI(),
+            "get_stories": lambda _self, which: story_list,
+            "expected_count": lambda _self: 120,
+        })()
+        self.updates = []
+        self.fell_back = threading.Event()
+        self.updated = threading.Event()
+
+    def live_update(self, which, ids, changed):
+        self.updates.append((which, ids, changed))
+        self.updated.set()
+
+    def live_fallback(self):
+        self.fell_back.set()
+
+
+def test_live_section_pushes_changes(standin):
+    standin.events = [
+        ("put", {"path": "/", "data": [1, 2, 3]}),   # same as the cache
+        ("keep-alive", None),
+        ("put", {"path": "/0", "data": 4}),           # 4 replaces 1 at the top
+    ]
+    gui = _GuiStub([1, 2, 3])
+    live = LiveSection(gui, "top", backoff_base=60)
+    live.start()
+    assert gui.updated.wait(5)
+    live.stop()
+    live.join(timeout=5)
+    assert not live.is_alive()
+    assert gui.updates == [("top", [4, 2, 3], {4})]
+
+
+def test_live_section_falls_back_to_polling(standin):
+    standin.status = 503
+    gui = _GuiStub([])
+    live = LiveSection(gui, "top", backoff_base=0.001, max_failures=3)
+    live.start()
+    assert gui.fell_back.wait(5)
+    live.join(timeout=5)
+    assert standin.requests == 3
@@ -0,0 +1,109 @@
+"""CommentPrefetcher: queueing, cancellation and the in-memory budget."""
+import contextlib
+import threading
+
+from pyhn.prefetch import CommentPrefetcher
+
+
+class _API:
+    """get_comments stub that records calls and can block on a gate."""
+
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+        self.started = threading.Event()
+        self.stopped_early = []
+        self.in_background = False
+        self.lanes = []
+
+    @contextlib.contextmanager
+    def background(self):
+        self.in_background = True
+        try:
+            yield
+        finally:
+            self.in_background = False
+
+    def get_comments(self, item_id, max_comments=50, should_stop=None):
+        self.calls.append(item_id)
+        self.lanes.append(self.in_background)
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+            self.stopped_early.append(should_stop())
+        return [f"comment of {item_id}"]
+
+
+def _drain(prefetcher, api, count):
+    for _ in range(500):
+        if len(prefetcher._done) >= count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"prefetched {list(prefetcher._done)}, calls {api.calls}")
+
+
+def test_prefetches_scheduled_ids_in_order():
+    api = _API()
+    prefetcher = CommentPrefetcher(api, 50)
+    prefetcher.start()
+    try:
+        prefetcher.schedule([1, 2, 3])
+        _drain(prefetcher, api, 3)
+    finally:
+        prefetcher.stop()
+    assert api.calls == [1, 2, 3]
+    assert api.lanes == [True, True, True]  # background rate-limit lane
+    assert prefetcher.get(2) == ["comment of 2"]
+    assert prefetcher.get(4) is None
+
+
+def test_reschedule_cancels_in_flight_walk():
+    gate = threading.Event()
+    api = _API(gate)
+    prefetcher = CommentPrefetcher(api, 50)
+    prefetcher.start()
+    try:
+        prefetcher.schedule([1])
+        assert api.started.wait(5)
+        prefetcher.schedule([2])        # focus moved away from story 1
+        gate.set()
+        _drain(prefetcher, api, 1)
+    finally:
+        prefetcher.stop()
+    assert api.stopped_early[0] is True
+    assert prefetcher.get(1) is None    # partial tree discarded
+    assert prefetcher.get(2) == ["comment of 2"]
+
+
+def test_budget_evicts_least_recently_used():
+    now = [0.0]
+    prefetcher = CommentPrefetcher(_API(), 50, budget=2, clock=lambda: now[0])
+    api = prefetcher.api
+    prefetcher.start()
+    try:
+        prefetcher.schedule([1, 2])
+        _drain(prefetcher, api, 2)
+        prefetcher.get(1)               # 2 is now least recently used
+        prefetcher.schedule([3])
+        for _ in range(500):
+            if 3 in prefetcher._done:
+                break
+            threading.Event().wait(0.01)
+    finally:
+        prefetcher.stop()
+    assert list(prefetcher._done) == [1, 3]
+
+
+def test_entries_expire_after_ttl():
+    now = [0.0]
+    api = _API()
+    prefetcher = CommentPrefetcher(api, 50, ttl=10, clock=lambda: now[0])
+    prefetcher.start()
+    try:
+        prefetcher.schedule([1])
+        _drain(prefetcher, api, 1)
+    finally:
+        prefetcher.stop()
+    assert prefetcher.get(1) is not None
+    now[0] = 11
+    assert prefetcher.get(1) is None
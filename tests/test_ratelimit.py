@@ -0,0 +1,56 @@
+"""RateLimiter: token accounting, lanes and wait metrics."""
+import threading
+import time
+
+from pyhn.ratelimit import BACKGROUND, FOREGROUND, RateLimiter
+
+
+def test_disabled_limit_never_waits_but_counts():
+    limiter = RateLimiter(0, 1)
+    for _ in range(50):
+        assert limiter.acquire() < 0.05
+    limiter.acquire(BACKGROUND)
+    stats = limiter.stats()
+    assert stats[FOREGROUND]["acquired"] == 50
+    assert stats[BACKGROUND]["acquired"] == 1
+
+
+def test_burst_then_refill_with_clock():
+    now = [0.0]
+    limiter = RateLimiter(1, 2, clock=lambda: now[0])
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    now[0] = 1.0  # one token refilled, the bucket never exceeds the burst
+    assert limiter.acquire() == 0
+    assert limiter._tokens < 1
+
+
+def test_waits_for_next_token_and_records_it():
+    limiter = RateLimiter(50, 1)
+    limiter.acquire()
+    waited = limiter.acquire()
+    assert 0.005 < waited < 0.5
+    stats = limiter.stats()[FOREGROUND]
+    assert stats["acquired"] == 2
+    assert stats["wait_max"] == waited
+    assert stats["wait_mean"] == stats["wait_total"] / 2
+
+
+def test_background_yields_to_waiting_foreground():
+    limiter = RateLimiter(10, 1)
+    limiter.acquire()  # drain the bucket
+    order = []
+
+    def take(lane):
+        limiter.acquire(lane)
+        order.append(lane)
+
+    background = threading.Thread(target=take, args=(BACKGROUND,))
+    background.start()
+    time.sleep(0.02)  # the background request is queued first...
+    foreground = threading.Thread(target=take, args=(FOREGROUND,))
+    foreground.start()
+    background.join(5)
+    foreground.join(5)
+    assert order == [FOREGROUND, BACKGROUND]  # ...but served second
+    assert limiter.stats()[BACKGROUND]["wait_max"] > 0.1
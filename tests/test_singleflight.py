@@ -0,0 +1,80 @@
+"""SingleFlight tests: concurrent same-key calls share one execution."""
+import threading
+
+import pytest
+
+from pyhn.hnapi import HackerNewsAPI
+from pyhn.singleflight import SingleFlight
+
+
+def _concurrently(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    runs = []
+    results = []
+
+    def work():
+        runs.append(1)
+        release.wait(5)
+        return {"id": 1}
+
+    threads = _concurrently(5, lambda: results.append(flights.do("k", work)))
+    while flights.coalesced < 4:
+        threading.Event().wait(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(runs) == 1
+    assert results == [{"id": 1}] * 5
+    assert flights.stats() == {"executed": 1, "coalesced": 4}
+
+
+def test_errors_are_shared_and_not_cached():
+    flights = SingleFlight()
+
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flights.do("k", boom)
+    assert flights.do("k", lambda: 2) == 2  # a finished call is not reused
+    assert flights.stats()["executed"] == 2
+
+
+def test_fetch_json_coalesces_identical_urls(monkeypatch):
+    api = HackerNewsAPI()
+    release = threading.Event()
+    sent = []
+
+    def slow_request(url):
+        sent.append(url)
+        release.wait(5)
+        return [1, 2, 3]
+
+    monkeypatch.setattr(api, "_request_json", slow_request)
+    url = "https://hacker-news.firebaseio.com/v0/topstories.json"
+    threads = _concurrently(3, lambda: api.fetch_json(url))
+    while api.flights.coalesced < 2:
+        threading.Event().wait(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert sent == [url]
+
+
+def test_hedges_bypass_coalescing(monkeypatch):
+    api = HackerNewsAPI()
+    sent = []
+    monkeypatch.setattr(api, "_request_json", lambda url: sent.append(url))
+    api._uncoalesced(api.fetch_json, "u")
+    api.fetch_json("u")
+    assert sent == ["u", "u"]
+    assert api.flights.stats() == {"executed": 1, "coalesced": 0}
+
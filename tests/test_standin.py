@@ -0,0 +1,117 @@
+"""Stand-in API server: endpoints, archives and injected faults."""
+import json
+
+import pytest
+
+import pyhn.hnapi as hnapi
+from pyhn.hnapi import HackerNewsAPI, HNException
+from pyhn.standin import Dataset, Faults, StandIn, parse_latency
+from pyhn.transport import RecordingTransport
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(dataset=None, **faults):
+        standin = StandIn(dataset or Dataset.synthetic(60, 10, seed=3),
+                          Faults(seed=1, **faults))
+        servers.append(standin)
+        return standin, standin.start()
+
+    yield start
+    for standin in servers:
+        standin.stop()
+
+
+def test_client_loads_sections_comments_and_users(serve):
+    standin, api_base = serve()
+    api = HackerNewsAPI(api_base=api_base)
+    for which in ("top", "newest", "best", "ask", "show", "jobs"):
+        assert api._story_ids(which)
+    top = api.get_top_stories()
+    assert len(top) == 2 * hnapi.PAGE_SIZE  # extra_page=1: two pages
+    story = max(top, key=lambda s: s.comment_count or 0)
+    comments = api.get_comments(story.id, max_comments=500)
+    assert len(comments) == story.comment_count
+    assert comments[0].text.startswith("Comment ")
+    assert api.fetch_users([story.submitter])[0]["karma"] > 0
+    assert api.fetch_json(f"{api_base}/maxitem.json") > 60
+    assert api.updated_ids()
+    assert api.fetch_json(f"{api_base}/item/999999.json") is None
+    assert standin.stats()["requests"] > 30
+
+
+def test_backlog_fits_a_full_burst_of_connections(serve):
+    standin, _api_base = serve()
+    assert standin._server.request_queue_size >= hnapi.WORKER_LIMIT
+
+
+def test_serves_recorded_archive(serve, tmp_path):
+    _standin, api_base = serve()
+    recorder = RecordingTransport(HackerNewsAPI().session)
+    stories = HackerNewsAPI(
+        api_base=api_base, transport=recorder).get_top_stories()
+    path = str(tmp_path / "session.json")
+    recorder.save(path)
+    _standin, archive_base = serve(Dataset.from_archive(path))
+    replayed = HackerNewsAPI(api_base=archive_base).get_top_stories()
+    assert [s.title for s in replayed] == [s.title for s in stories]
+
+
+@pytest.mark.parametrize("fault", ["error_rate", "disconnect_rate"])
+def test_injected_failures_surface_as_errors(serve, fault):
+    standin, api_base = serve(**{fault: 1.0})
+    api = HackerNewsAPI(api_base=api_base, retries=0)
+    with pytest.raises(HNException):
+        api.fetch_json(f"{api_base}/maxitem.json")
+    key = "errors" if fault == "error_rate" else "disconnects"
+    assert standin.stats()[key] == 1
+
+
+def test_stalled_request_times_out(serve, monkeypatch):
+    monkeypatch.setattr(hnapi, "REQUEST_TIMEOUT", 0.2)
+    standin, api_base = serve(stall_rate=1.0, stall=5)
+    api = HackerNewsAPI(api_base=api_base, retries=0)
+    with pytest.raises(HNException):
+        api.fetch_json(f"{api_base}/maxitem.json")
+    assert standin.stats()["stalls"] == 1
+
+
+def test_faults_are_mixed_at_their_rates():
+    faults = Faults(error_rate=0.2, stall_rate=0.1, disconnect_rate=0.1, seed=5)
+    drawn = [faults.draw()[1] for _ in range(2000)]
+    assert drawn.count("error") == pytest.approx(400, rel=0.2)
+    assert drawn.count("stall") == pytest.approx(200, rel=0.25)
+    assert drawn.count("disconnect") == pytest.approx(200, rel=0.25)
+
+
+@pytest.mark.parametrize("spec, low, high", [
+    ("constant:0.05", 0.05, 0.05),
+    ("uniform:0.01,0.02", 0.01, 0.02),
+    ("normal:0.05,0.5", 0.0, 10),
+    ("lognormal:0.05,0.5", 0.0, 10),
+    ("exponential:0.05", 0.0, 10),
+])
+def test_latency_specs(spec, low, high):
+    import random
+    sample = parse_latency(spec)
+    rng = random.Random(0)
+    assert all(low <= sample(rng) <= high for _ in range(200))
+
+
+@pytest.mark.parametrize("spec", ["gamma:1", "uniform:1", "constant:x", ""])
+def test_bad_latency_spec(spec):
+    with pytest.raises(ValueError):
+        parse_latency(spec)
+
+
+def test_synthetic_dataset_is_consistent():
+    dataset = Dataset.synthetic(40, 8, seed=2, now=1_700_000_000)
+    top = json.loads(dataset.get("/v0/topstories.json"))
+    assert sorted(top) == list(range(1, 41))
+    for story_id in top:
+        story = json.loads(dataset.get(f"/v0/item/{story_id}.json"))
+        for kid in story.get("kids", []):
+            assert json.loads(dataset.get(f"/v0/item/{kid}.json"))["parent"] == story_id
+    assert dataset.get("/elsewhere") is None
@@ -0,0 +1,203 @@
+"""Section stores: JSON file and SQLite, same behaviour, SQLite diffs writes."""
+import json
+import os
+import threading
+
+import pytest
+
+from pyhn.store import JSONStore, ShardedJSONStore, SQLiteStore, open_store
+
+DATE = "2026-01-02T03:04:05"
+
+
+def _rows(ids, title="Story"):
+    return [{"id": i, "number": n, "title": f"{title} {i}", "score": i}
+            for n, i in enumerate(ids, 1)]
+
+
+@pytest.fixture(params=["sharded", "json", "sqlite"])
+def store(request, tmp_path):
+    store = open_store(request.param, str(tmp_path / "cache"))
+    yield store
+    store.close()
+
+
+def test_roundtrip_and_written_at(store):
+    assert store.get("top") is None
+    assert store.written_at("top") is None
+    store.put("top", _rows([3, 1, 2]), DATE)
+    store.put("ask", _rows([1]), DATE)
+    assert store.get("top") == {"stories": _rows([3, 1, 2]), "date": DATE}
+    assert store.written_at("top") == DATE
+    assert sorted(store.sections()) == ["ask", "top"]
+
+
+def test_rewrite_reorders_and_shrinks(store):
+    store.put("top", _rows([1, 2, 3, 4]), DATE)
+    store.put("top", _rows([4, 2], title="New"), "2026-01-03T00:00:00")
+    entry = store.get("top")
+    assert entry["stories"] == _rows([4, 2], title="New")
+    assert entry["date"] == "2026-01-03T00:00:00"
+
+
+def test_story_without_id_is_kept(store):
+    rows = [{"id": None, "number": 1, "title": "no id"}] + _rows([7])
+    rows[1]["number"] = 2
+    store.put("top", rows, DATE)
+    assert store.get("top")["stories"] == rows
+
+
+def test_sqlite_shares_items_across_sections(tmp_path):
+    store = SQLiteStore(str(tmp_path / "cache.db"))
+    store.put("top", _rows([1, 2]), DATE)
+    store.put("best", _rows([2, 1]), DATE)
+    assert [s["number"] for s in store.get("best")["stories"]] == [1, 2]
+    assert store._db.execute("SELECT COUNT(*) FROM items").fetchone() == (2,)
+    store.put("top", _rows([3]), DATE)      # 1 and 2 still listed by best
+    store.put("best", _rows([3]), DATE)     # now they are orphans
+    assert store._db.execute("SELECT id FROM items").fetchall() == [(3,)]
+
+
+def test_sqlite_refresh_writes_only_changed_rows(tmp_path):
+    store = SQLiteStore(str(tmp_path / "cache.db"))
+    rows = _rows(range(1, 501))
+    store.put("top", rows, DATE)
+    statements = []
+    store._db.set_trace_callback(statements.append)
+    rows[10]["score"] = 9999
+    store.put("top", rows, DATE)
+    writes = [s for s in statements
+              if s.startswith(("INSERT", "DELETE", "UPDATE"))]
+    # One changed item, no rank rows, plus the section's write time.
+    assert len(writes) == 2
+    assert store.get("top")["stories"][10]["score"] == 9999
+
+
+def test_sqlite_uses_wal(tmp_path):
+    store = SQLiteStore(str(tmp_path / "cache.db"))
+    assert store._db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_sqlite_imports_json_cache_once(tmp_path):
+    path = tmp_path / "cache"
+    path.write_text(json.dumps({"top": {"stories": _rows([5, 6]), "date": DATE}}))
+    store = open_store("sqlite", str(path))
+    assert store.get("top") == {"stories": _rows([5, 6]), "date": DATE}
+    store.put("top", _rows([7]), DATE)
+    store.close()
+    reopened = open_store("sqlite", str(path))   # not imported again
+    assert reopened.get("top")["stories"] == _rows([7])
+    reopened.close()
+
+
+def test_json_store_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "cache"
+    path.write_bytes(b"\x80\x04not json")
+    assert JSONStore(str(path)).get("top") is None
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError, match="cache backend"):
+        open_store("redis", str(tmp_path / "cache"))
+
+
+def test_json_store_parses_only_when_file_changes(tmp_path):
+    path = str(tmp_path / "cache")
+    store = JSONStore(path)
+    store.put("top", _rows([1, 2]), DATE)
+    for _ in range(10):
+        assert store.written_at("top") == DATE
+        assert store.get("top")["stories"] == _rows([1, 2])
+    assert store.parses == 0            # our own write needs no re-read
+
+    other = JSONStore(path)             # e.g. another pyhn process
+    other.put("ask", _rows([3]), DATE)
+    assert store.get("ask")["stories"] == _rows([3])
+    store.get("top")
+    assert store.parses == 1
+
+
+@pytest.mark.parametrize("store_class", [JSONStore, ShardedJSONStore])
+def test_concurrent_writers_merge_sections(tmp_path, store_class):
+    # One store per "process", each refreshing its own section repeatedly;
+    # without the lock, read-modify-write cycles drop each other's sections.
+    path = str(tmp_path / "cache")
+    names = ["top", "new", "best", "ask", "show", "job"]
+
+    def refresh(which):
+        store = store_class(path)
+        for i in range(20):
+            store.put(which, _rows([i]), f"2026-01-01T00:00:{i:02d}")
+
+    threads = [threading.Thread(target=refresh, args=(n,)) for n in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache = store_class(path).sections()
+    assert sorted(cache) == sorted(names)
+    assert all(entry["stories"] == _rows([19]) for entry in cache.values())
+
+
+def test_interrupted_write_keeps_previous_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache")
+    store = JSONStore(path)
+    store.put("top", _rows([1]), DATE)
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        store.put("top", _rows([2]), "2026-01-03T00:00:00")
+    monkeypatch.undo()
+    assert JSONStore(path).get("top")["stories"] == _rows([1])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cache", "cache.lock"]
+
+
+def test_newer_section_from_another_process_wins(tmp_path):
+    path = str(tmp_path / "cache")
+    slow, fast = JSONStore(path), JSONStore(path)
+    fast.put("top", _rows([2]), "2026-01-02T00:00:00")
+    slow.put("top", _rows([1]), "2026-01-01T00:00:00")   # started earlier
+    assert JSONStore(path).get("top")["stories"] == _rows([2])
+
+
+def test_sharded_reads_and_writes_only_what_it_needs(tmp_path):
+    path = str(tmp_path / "cache")
+    writer = ShardedJSONStore(path)
+    for which in ("top", "new", "best"):
+        writer.put(which, _rows([1, 2]), DATE)
+    shards = tmp_path / "cache.d"
+    before = {p.name: p.stat().st_mtime_ns for p in shards.iterdir()}
+
+    reader = ShardedJSONStore(path)        # a fresh process
+    assert reader.written_at("best") == DATE
+    assert reader.parses == 1              # the index only
+    assert reader.get("top")["stories"] == _rows([1, 2])
+    assert reader.parses == 2              # + the top shard
+
+    writer.put("new", _rows([3]), "2026-01-03T00:00:00")
+    after = {p.name: p.stat().st_mtime_ns for p in shards.iterdir()}
+    assert sorted(name for name in before if after[name] != before[name]) == [
+        "index.json", "new.json"]
+    assert reader.written_at("new") == "2026-01-03T00:00:00"
+
+
+def test_sharded_splits_single_file_cache(tmp_path):
+    path = tmp_path / "cache"
+    path.write_text(json.dumps({
+        "top": {"stories": _rows([5]), "date": DATE},
+        "ask": {"stories": _rows([6]), "date": DATE}}))
+    store = ShardedJSONStore(str(path))
+    assert store.get("ask") == {"stories": _rows([6]), "date": DATE}
+    assert sorted(p.name for p in (tmp_path / "cache.d").glob("*.json")) == [
+        "ask.json", "index.json", "top.json"]
+
+
+def test_sqlite_imports_sharded_cache(tmp_path):
+    path = str(tmp_path / "cache")
+    ShardedJSONStore(path).put("top", _rows([8]), DATE)
+    store = open_store("sqlite", path)
+    assert store.get("top")["stories"] == _rows([8])
+    store.close()
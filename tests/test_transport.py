@@ -0,0 +1,109 @@
+"""Record/replay transport: archives round-trip and replay offline."""
+import json
+
+import pytest
+
+import pyhn.hnapi as hnapi
+from pyhn.hnapi import HackerNewsAPI, HNException
+from pyhn.transport import Recorded, RecordingTransport, ReplayTransport
+
+ITEMS = {
+    1: {"id": 1, "type": "story", "by": "alice", "time": 1175714200,
+        "title": "First", "url": "https://example.com/a", "score": 3,
+        "descendants": 1, "kids": [10]},
+    10: {"id": 10, "type": "comment", "by": "bob", "time": 1175714300,
+         "text": "hi &amp; bye"},
+}
+
+
+class _Response:
+    def __init__(self, payload, status_code=200):
+        self.content = json.dumps(payload).encode()
+        self.status_code = status_code
+
+    def __bool__(self):
+        return self.status_code < 400
+
+
+class _Upstream:
+    """Session stand-in serving ITEMS and a one-story top list."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        if url.endswith("topstories.json"):
+            return _Response([1])
+        return _Response(ITEMS.get(int(url.rsplit("/", 1)[1].split(".")[0])))
+
+
+def _record(tmp_path):
+    recorder = RecordingTransport(_Upstream())
+    api = HackerNewsAPI(transport=recorder)
+    stories = api.get_top_stories()
+    comments = api.get_comments(1)
+    path = str(tmp_path / "session.json")
+    recorder.save(path)
+    return path, stories, comments
+
+
+def test_replay_reproduces_recorded_session(tmp_path):
+    path, stories, comments = _record(tmp_path)
+    replay = ReplayTransport.load(path)
+    assert sorted(replay.urls()) == sorted([
+        f"{hnapi.API_BASE}/topstories.json",
+        f"{hnapi.API_BASE}/item/1.json",
+        f"{hnapi.API_BASE}/item/10.json"])
+    api = HackerNewsAPI(transport=replay)
+    assert [s.to_dict() for s in api.get_top_stories()] == [
+        s.to_dict() for s in stories]
+    assert [c.text for c in api.get_comments(1)] == [c.text for c in comments]
+
+
+def test_unrecorded_url_fails_like_a_network_error(tmp_path):
+    path, _stories, _comments = _record(tmp_path)
+    api = HackerNewsAPI(transport=ReplayTransport.load(path))
+    with pytest.raises(HNException):
+        api.fetch_json(f"{hnapi.API_BASE}/item/2.json")
+
+
+def test_repeated_url_replays_recordings_in_order():
+    url = "http://hn.test/v0/topstories.json"
+    replay = ReplayTransport([
+        Recorded(url, 200, b"[1]", 0.0), Recorded(url, 200, b"[2, 1]", 0.0)])
+    assert [replay.get(url).content for _ in range(3)] == [
+        b"[1]", b"[2, 1]", b"[2, 1]"]
+
+
+def test_latency_and_jitter_are_seeded():
+    url = "http://hn.test/v0/maxitem.json"
+    entries = [Recorded(url, 200, b"1", 0.5)]
+
+    def delays(**kwargs):
+        slept = []
+        replay = ReplayTransport(entries, sleep=slept.append, **kwargs)
+        for _ in range(5):
+            replay.get(url)
+        return slept
+
+    fixed = delays(latency=0.1, jitter=0.05, seed=7)
+    assert fixed == delays(latency=0.1, jitter=0.05, seed=7)
+    assert all(0.05 <= d <= 0.15 for d in fixed) and len(set(fixed)) > 1
+    assert delays(recorded_latency=True) == [0.5] * 5
+    assert delays() == []
+
+
+def test_error_status_is_replayed_as_error(tmp_path):
+    url = f"{hnapi.API_BASE}/item/3.json"
+    api = HackerNewsAPI(
+        retries=0, transport=ReplayTransport([Recorded(url, 503, b"", 0.0)]))
+    with pytest.raises(HNException, match="503"):
+        api.fetch_json(url)
+
+
+def test_unknown_archive_version(tmp_path):
+    path = tmp_path / "old.json"
+    path.write_text(json.dumps({"version": 99, "entries": []}))
+    with pytest.raises(ValueError, match="version"):
+        ReplayTransport.load(str(path))
@@ -0,0 +1,63 @@
+"""UserService: batched profile fetches with a TTL cache. No network."""
+import threading
+
+from pyhn.hnapi import HackerNewsAPI
+from pyhn.users import UserService
+
+PROFILES = {"alice": {"id": "alice", "karma": 4242},
+            "bob": {"id": "bob", "karma": 7}}
+
+
+def _service(monkeypatch, requested, clock=None, barrier=None):
+    api = HackerNewsAPI()
+
+    def fake(url):
+        name = url.rsplit("/", 1)[1].removesuffix(".json")
+        requested.append(name)
+        if barrier is not None:
+            barrier.wait(5)
+        return PROFILES.get(name)
+
+    monkeypatch.setattr(api, "fetch_json", fake)
+    if clock is None:
+        return UserService(api)
+    return UserService(api, ttl=60, clock=clock)
+
+
+def test_batch_is_fetched_concurrently_and_deduplicated(monkeypatch):
+    requested = []
+    # Both lookups must be in flight at once to get past the barrier.
+    service = _service(monkeypatch, requested, barrier=threading.Barrier(2))
+    users = service.get_many(["alice", "bob", "alice", ""])
+    assert sorted(requested) == ["alice", "bob"]
+    assert {name: u.karma for name, u in users.items()} == {
+        "alice": 4242, "bob": 7}
+
+
+def test_profiles_cached_until_ttl(monkeypatch):
+    requested = []
+    now = [0.0]
+    service = _service(monkeypatch, requested, clock=lambda: now[0])
+    assert service.karma("alice") is None          # never blocks on a miss
+    service.get_many(["alice"])
+    service.get_many(["alice"])
+    assert requested == ["alice"]
+    assert service.karma("alice") == 4242
+    now[0] = 61
+    assert service.karma("alice") is None
+    service.get_many(["alice"])
+    assert requested == ["alice", "alice"]
+
+
+def test_unknown_user_is_skipped(monkeypatch):
+    requested = []
+    service = _service(monkeypatch, requested)
+    assert service.get_many(["ghost", "bob"]).keys() == {"bob"}
+
+
+def test_prefetch_runs_in_background_and_reports(monkeypatch):
+    done = threading.Event()
+    service = _service(monkeypatch, [])
+    service.prefetch(["bob"], done.set).join(5)
+    assert done.is_set()
+    assert service.karma("bob") == 7